@@ -25,3 +25,10 @@ PASSWORD_COMPLEXITY_ERROR = (
     "one lowercase letter and one number. The length should be "
     "at least 8 characters."
 )
+
+# A failed registration is carried to the next render in a signed cookie
+REGISTER_FORM_COOKIE = "register_form"
+REGISTER_FORM_COOKIE_SALT = "authors.register_form"
+REGISTER_FORM_COOKIE_MAX_AGE = 60 * 30
+# Longest value kept, the User fields are at most 254 characters
+REGISTER_FORM_VALUE_MAX_LENGTH = 254
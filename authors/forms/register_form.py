@@ -1,17 +1,24 @@
 
+from typing import Any, Self
+
 from django import forms
 from django.contrib.auth.models import User
-from django.core.exceptions import ValidationError
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.forms.utils import ErrorDict
 
 from authors.constants import (
     COMMON_LENGTH_ERRORS,
     EMAIL_HELP_TEXT,
     PLACEHOLDERS,
+    REGISTER_FORM_VALUE_MAX_LENGTH,
 )
 from utils.django_forms import add_placeholder, strong_password
 
 
 class RegisterForm(forms.ModelForm):
+    # Never leave the request, not even in a signed cookie
+    SECRET_FIELDS = ("password", "password2")
+
     def __init__(self, *args, **kwargs) -> None:  # noqa: ANN002, ANN003
         super().__init__(*args, **kwargs)
         for field, placeholder in PLACEHOLDERS.items():
@@ -76,3 +83,28 @@ class RegisterForm(forms.ModelForm):
                     password_confirmation_error,
                 ],
             })
+
+    def to_state(self) -> dict[str, Any]:
+        """The submitted non-secret values and the errors, JSON serializable."""
+        return {
+            "data": {
+                name: value[:REGISTER_FORM_VALUE_MAX_LENGTH]
+                for name in self.fields
+                if name not in self.SECRET_FIELDS
+                and (value := str(self.data.get(name, "")))
+            },
+            "errors": self.errors.get_json_data(),
+        }
+
+    @classmethod
+    def from_state(cls, state: dict[str, Any]) -> Self:
+        """A bound form showing ``state`` as it was, without validating again."""
+        form = cls(state.get("data", {}))
+        form._errors = ErrorDict(renderer=form.renderer)
+        form.cleaned_data = {}
+        for field, errors in state.get("errors", {}).items():
+            form.add_error(
+                None if field == NON_FIELD_ERRORS else field,
+                [ValidationError(e["message"], code=e["code"]) for e in errors],
+            )
+        return form
@@ -1,12 +1,19 @@
 from unittest import TestCase
 
 from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core import signing
 from django.http import HttpResponse
 from django.test import TestCase as DjangoTestCase
 from django.urls import reverse
 from parameterized import parameterized
 
-from authors.constants import EMAIL_HELP_TEXT, PASSWORD_COMPLEXITY_ERROR
+from authors.constants import (
+    EMAIL_HELP_TEXT,
+    PASSWORD_COMPLEXITY_ERROR,
+    REGISTER_FORM_COOKIE,
+    REGISTER_FORM_COOKIE_SALT,
+)
 from authors.forms import RegisterForm
 
 
@@ -107,27 +114,60 @@ class AuthorRegisterFormIntegrationTest(DjangoTestCase):
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, 404)
 
-    def test_register_create_with_valid_form_creates_user_and_clears_session(
+    def test_register_create_with_valid_form_creates_user_and_clears_form_state(
         self,
     ) -> None:
+        self.form_data["username"] = ""
+        self.client.post(self.url, self.form_data)
+        self.form_data["username"] = "user"
         response = self.post_data()
         self.assertTrue(User.objects.filter(username="user").exists())
-        # Check if the session was cleared
-        self.assertNotIn("register_form_data", self.client.session)
+        # The cookie carrying the failed attempt is removed
+        self.assertEqual(self.client.cookies[REGISTER_FORM_COOKIE].value, "")
         # Check if the success message exists
         messages = list(response.context["messages"])
         self.assertTrue(any("Your user is created" in str(m) for m in messages))
 
-    def test_register_create_with_invalid_form_keeps_session_data(self) -> None:
+    def test_register_create_with_invalid_form_keeps_form_state_in_a_cookie(
+        self,
+    ) -> None:
         self.form_data["username"] = ""
         self.form_data["password"] = ""
         response = self.client.post(self.url, self.form_data)
         self.assertFalse(User.objects.exists())
-        # Keeps data in the session
-        self.assertIn("register_form_data", self.client.session)
+        # Nothing is written server side for a failed attempt
+        self.assertFalse(Session.objects.exists())
+        self.assertIn(REGISTER_FORM_COOKIE, response.cookies)
         # Redirects correctly
         self.assertRedirects(response, reverse("authors:register"))
 
+    def test_form_state_keeps_non_secret_values_and_errors_only(self) -> None:
+        self.form_data["password2"] = "Other_pass1"
+        response = self.client.post(self.url, self.form_data)
+        state = signing.loads(
+            response.cookies[REGISTER_FORM_COOKIE].value,
+            salt=REGISTER_FORM_COOKIE_SALT,
+        )
+        self.assertEqual(state["data"], {
+            "first_name": "first", "last_name": "last", "username": "user",
+            "email": "email@anyemail.com",
+        })
+        self.assertNotIn("Str0ngP@ssword1", str(state))
+        self.assertEqual(set(state["errors"]), {"password", "password2"})
+
+    def test_register_page_shows_the_failed_attempt(self) -> None:
+        self.form_data["username"] = ""
+        response = self.post_data()
+        form = response.context["form"]
+        self.assertEqual(form["email"].value(), "email@anyemail.com")
+        self.assertEqual(form["password"].value(), None)
+        self.assertIn("This field must not be empty", form.errors["username"])
+
+    def test_register_page_ignores_a_tampered_cookie(self) -> None:
+        self.client.cookies[REGISTER_FORM_COOKIE] = "forged"
+        response = self.client.get(reverse("authors:register"))
+        self.assertFalse(response.context["form"].is_bound)
+
     def test_email_field_must_be_unique_when_submitting_form(self) -> None:
         # First submission to create the user
         self.post_data()
@@ -1,13 +1,20 @@
+import contextlib
 from typing import TYPE_CHECKING, cast
 
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
+from django.core import signing
 from django.http.request import HttpRequest
 from django.http.response import Http404, HttpResponse, HttpResponseRedirect
 from django.shortcuts import redirect, render
 from django.urls import reverse
 
+from authors.constants import (
+    REGISTER_FORM_COOKIE,
+    REGISTER_FORM_COOKIE_MAX_AGE,
+    REGISTER_FORM_COOKIE_SALT,
+)
 from authors.forms import LoginForm, RegisterForm
 from recipes.models import Recipe
 
@@ -16,8 +23,14 @@ if TYPE_CHECKING:
 
 
 def register_view(request: HttpRequest) -> HttpResponse:
-    register_form_data = request.session.get("register_form_data", None)
-    form = RegisterForm(register_form_data)
+    form = RegisterForm()
+    cookie = request.COOKIES.get(REGISTER_FORM_COOKIE)
+    if cookie:
+        with contextlib.suppress(signing.BadSignature):
+            form = RegisterForm.from_state(signing.loads(
+                cookie, salt=REGISTER_FORM_COOKIE_SALT,
+                max_age=REGISTER_FORM_COOKIE_MAX_AGE,
+            ))
     return render(request, "authors/pages/register_view.html", {
         "form": form, "form_action": reverse("authors:register_create"),
     })
@@ -26,18 +39,24 @@ def register_view(request: HttpRequest) -> HttpResponse:
 def register_create(request: HttpRequest) -> HttpResponseRedirect:
     if not request.POST:
         raise Http404
-    post_data = request.POST
-    request.session["register_form_data"] = post_data
-    form = RegisterForm(post_data)
+    form = RegisterForm(request.POST)
     if form.is_valid():
         user: User = form.save(commit=False)
         raw_password: str = form.cleaned_data["password"]
         user.set_password(raw_password)
         user.save()
         messages.success(request, "Your user is created, please log in.")
-        del request.session["register_form_data"]
-        return redirect(reverse("authors:login"))
-    return redirect(reverse("authors:register"))
+        response = redirect(reverse("authors:login"))
+        response.delete_cookie(REGISTER_FORM_COOKIE)
+        return response
+    # Failed attempts live in the client, no session is created or written
+    response = redirect(reverse("authors:register"))
+    response.set_cookie(
+        REGISTER_FORM_COOKIE,
+        signing.dumps(form.to_state(), salt=REGISTER_FORM_COOKIE_SALT, compress=True),
+        max_age=REGISTER_FORM_COOKIE_MAX_AGE, httponly=True, samesite="Lax",
+    )
+    return response
 
 
 def login_view(request: HttpRequest) -> HttpResponse:
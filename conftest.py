@@ -0,0 +1 @@
+pytest_plugins = ["utils.pytest_budgets"]
@@ -2,6 +2,8 @@
 ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Set ``ASYNC_VIEWS=True`` to serve the public pages from ``recipes.async_views``,
+every middleware runs async so requests don't hop through threads.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -14,3 +16,11 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
 application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.WARM_TEMPLATES_AT_BOOT:
+    # Parse templates now, with gunicorn --preload once for all workers
+    from utils.templates import warm_templates
+
+    warm_templates()
@@ -11,7 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 from pathlib import Path
 
-from decouple import config
+from decouple import Csv, config
 from django.contrib.messages import constants as messages
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,10 +41,14 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "recipes",
     "authors",
+    "tasks",
 ]
 
 MIDDLEWARE = [
+    "utils.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "utils.staticfiles.StaticFilesMiddleware",
+    "utils.db.ReplicaPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -57,7 +61,9 @@ ROOT_URLCONF = "core.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "utils.templates.InstrumentedDjangoTemplates",
+        # The alias of the stock backend, templates.engines["django"]
+        "NAME": "django",
         "DIRS": [
             BASE_DIR / "base_templates",
         ],
@@ -72,20 +78,184 @@ TEMPLATES = [
     },
 ]
 
+# Compile every project template when a worker boots, see utils.templates
+WARM_TEMPLATES_AT_BOOT = config("WARM_TEMPLATES_AT_BOOT", default=False, cast=bool)
+
 WSGI_APPLICATION = "core.wsgi.application"
+ASGI_APPLICATION = "core.asgi.application"
+
+# Serve the public recipe pages from recipes.async_views, for ASGI servers
+ASYNC_VIEWS = config("ASYNC_VIEWS", default=False, cast=bool)
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+DATABASE_ENGINE = config("DATABASE_ENGINE", default="sqlite3")
+
+if DATABASE_ENGINE == "postgresql":
+    DATABASE_POOL = config("DATABASE_POOL", default=False, cast=bool)
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": config("DATABASE_NAME", default="recipes"),
+            "USER": config("DATABASE_USER", default=""),
+            "PASSWORD": config("DATABASE_PASSWORD", default=""),
+            "HOST": config("DATABASE_HOST", default=""),
+            "PORT": config("DATABASE_PORT", default=""),
+            # Pooled connections go back to the pool after every request,
+            # persistent ones (CONN_MAX_AGE) are not allowed alongside it
+            "CONN_MAX_AGE": 0 if DATABASE_POOL else config(
+                "DATABASE_CONN_MAX_AGE", default=0, cast=int,
+            ),
+            "CONN_HEALTH_CHECKS": config(
+                "DATABASE_CONN_HEALTH_CHECKS", default=True, cast=bool,
+            ),
+            "OPTIONS": {
+                "pool": {
+                    "min_size": config("DATABASE_POOL_MIN_SIZE", default=2, cast=int),
+                    "max_size": config("DATABASE_POOL_MAX_SIZE", default=10, cast=int),
+                    "timeout": config("DATABASE_POOL_TIMEOUT", default=10, cast=float),
+                },
+            } if DATABASE_POOL else {},
+        },
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": config("DATABASE_NAME", default=str(BASE_DIR / "db.sqlite3")),
+            "CONN_MAX_AGE": config("DATABASE_CONN_MAX_AGE", default=0, cast=int),
+            "OPTIONS": {
+                # IMMEDIATE takes the write lock when a transaction starts, so
+                # busy_timeout applies instead of failing on lock upgrades
+                "transaction_mode": config(
+                    "SQLITE_TRANSACTION_MODE", default="DEFERRED",
+                ),
+            },
+        },
+    }
+
+# Read replicas of the default database: SQLite files or PostgreSQL hosts. The
+# public pages read from them, see utils.db.PrimaryReplicaRouter. Try it
+# locally with a copy of db.sqlite3, e.g. DATABASE_REPLICAS=replica.sqlite3
+DATABASE_REPLICAS: list[str] = []
+for number, location in enumerate(
+    config("DATABASE_REPLICAS", default="", cast=Csv()), start=1,
+):
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "HOST" if DATABASE_ENGINE == "postgresql" else "NAME": location,
+        "OPTIONS": {**DATABASES["default"]["OPTIONS"]},
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{number}")
+
+DATABASE_ROUTERS = ["utils.db.PrimaryReplicaRouter"]
+# How long a client that wrote keeps reading from the primary
+DATABASE_REPLICA_PIN_SECONDS = config(
+    "DATABASE_REPLICA_PIN_SECONDS", default=5, cast=int,
+)
+
+# Applied to every new SQLite connection by utils.db.configure_connection
+SQLITE_PRAGMAS = {
+    "journal_mode": config("SQLITE_JOURNAL_MODE", default="WAL"),
+    "synchronous": config("SQLITE_SYNCHRONOUS", default="NORMAL"),
+    "mmap_size": config("SQLITE_MMAP_SIZE", default=128 * 1024 * 1024, cast=int),
+    "busy_timeout": config("SQLITE_BUSY_TIMEOUT", default=5000, cast=int),
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="recipes"),
+    },
+    # Kept apart so evicting cached pages never logs anyone out. Local memory
+    # is per process, use the file cache (or Redis/Memcached) with several
+    # workers and the cache session engine
+    "sessions": {
+        "BACKEND": config(
+            "SESSION_CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": config("SESSION_CACHE_LOCATION", default="sessions"),
     },
 }
 
 
+# Request instrumentation, see utils.instrumentation
+
+# Server-Timing tells anyone what a page costs, keep it to development
+SERVER_TIMING_HEADER = config("SERVER_TIMING_HEADER", default=DEBUG, cast=bool)
+INSTRUMENTATION_BUFFER_SIZE = config(
+    "INSTRUMENTATION_BUFFER_SIZE", default=1000, cast=int,
+)
+# Limits per URL name on queries, total_ms, db_ms and template_ms. Going over
+# logs a warning and fails the test that made the request, times only with
+# pytest --time-budgets. Logged in requests add the session and user lookups.
+PERFORMANCE_BUDGETS: dict[str, dict[str, float]] = {
+    "recipes:home": {"queries": 4, "total_ms": 500},
+    "recipes:category": {"queries": 4, "total_ms": 500},
+    "recipes:search": {"queries": 4, "total_ms": 500},
+    "recipes:categories": {"queries": 3, "total_ms": 500},
+    "recipes:recipe": {"queries": 3, "total_ms": 500},
+    "authors:dashboard": {"queries": 4, "total_ms": 500},
+    "recipes:api_list": {"queries": 2, "total_ms": 300},
+    "recipes:api_category": {"queries": 3, "total_ms": 300},
+    "recipes:api_search": {"queries": 2, "total_ms": 300},
+    "recipes:api_detail": {"queries": 2, "total_ms": 300},
+    "recipes:feed": {"queries": 2, "total_ms": 300},
+    "recipes:category_feed": {"queries": 3, "total_ms": 300},
+    "recipes:author_feed": {"queries": 3, "total_ms": 300},
+}
+
+
+# Sessions
+# https://docs.djangoproject.com/en/5.2/topics/http/sessions/
+
+# cached_db reads through the cache and only writes the table when a session
+# changes, the cache engine never touches the database
+SESSION_ENGINE = config(
+    "SESSION_ENGINE", default="django.contrib.sessions.backends.cached_db",
+)
+SESSION_CACHE_ALIAS = "sessions"
+
+# Seconds a rendered public page is served from the cache to anonymous users
+PAGE_CACHE_TIMEOUT = config("PAGE_CACHE_TIMEOUT", default=600, cast=int)
+# Seconds a rendered recipe card is kept, cards are keyed by their contents
+CARD_CACHE_TIMEOUT = config("CARD_CACHE_TIMEOUT", default=3600, cast=int)
+# URLs per sitemap file, 50,000 at most by the protocol, see recipes.sitemaps
+SITEMAP_PAGE_SIZE = config("SITEMAP_PAGE_SIZE", default=50_000, cast=int)
+SITEMAP_CACHE_TIMEOUT = config("SITEMAP_CACHE_TIMEOUT", default=3600, cast=int)
+# Recipes per RSS/Atom feed, see recipes.feeds
+FEED_ITEMS = config("FEED_ITEMS", default=20, cast=int)
+# Seconds a paginated listing's total count is reused before a new COUNT(*)
+PAGINATION_COUNT_CACHE_TIMEOUT = config(
+    "PAGINATION_COUNT_CACHE_TIMEOUT", default=300, cast=int,
+)
+# Use the planner's row estimate instead of COUNT(*) once it reaches this many
+# rows (PostgreSQL only). 0 always counts exactly.
+PAGINATION_APPROXIMATE_COUNT_THRESHOLD = config(
+    "PAGINATION_APPROXIMATE_COUNT_THRESHOLD", default=0, cast=int,
+)
+# Background tasks (see tasks.queue): seconds before the first retry, doubled
+# after every failure up to the max
+TASKS_RETRY_BACKOFF = config("TASKS_RETRY_BACKOFF", default=5, cast=float)
+TASKS_RETRY_BACKOFF_MAX = config("TASKS_RETRY_BACKOFF_MAX", default=3600, cast=float)
+# Seconds a running task may take before it counts as abandoned by its worker
+TASKS_LOCK_TIMEOUT = config("TASKS_LOCK_TIMEOUT", default=600, cast=float)
+# Seconds an idle worker waits before polling the queue again
+TASKS_POLL_INTERVAL = config("TASKS_POLL_INTERVAL", default=1, cast=float)
+# Seconds succeeded tasks are kept for the metrics
+TASKS_KEEP_SUCCEEDED = config("TASKS_KEEP_SUCCEEDED", default=86400, cast=float)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -128,6 +298,33 @@ STATICFILES_DIRS = [
     BASE_DIR / "base_static",
 ]
 
+# Whether manage.py vendor_assets has stored the third party stylesheets and
+# fonts in base_static/vendor. Until its output is committed, the pages load
+# them from their CDNs and the bundle holds the project's own files only.
+VENDOR_ASSETS = (BASE_DIR / "base_static" / "vendor").is_dir()
+
+# Minified concatenations built by collectstatic with the storage of
+# core.settings_production, see utils.staticfiles. Elsewhere, the
+# {% static_bundle %} tag links the sources one by one.
+STATIC_BUNDLES = {
+    "global/css/site.css": [
+        *([
+            "vendor/fontawesome/css/fontawesome.min.css",
+            "vendor/fontawesome/css/brands.min.css",
+            "vendor/fontawesome/css/solid.min.css",
+            "vendor/fonts/roboto-slab.css",
+        ] if VENDOR_ASSETS else []),
+        "global/css/style.css",
+        "global/css/global-style.css",
+    ],
+    "global/js/site.js": [
+        "global/js/script.js",
+    ],
+}
+
+# Serve STATIC_ROOT, with its precompressed variants, from the app itself
+SERVE_STATIC = config("SERVE_STATIC", default=False, cast=bool)
+
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
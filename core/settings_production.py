@@ -0,0 +1,70 @@
+"""
+Production profile, select it with
+``DJANGO_SETTINGS_MODULE=core.settings_production``.
+
+Everything not set here comes from ``core.settings`` and the environment.
+"""
+import os
+from typing import Any, cast
+
+from decouple import Csv, config
+from django.core.exceptions import ImproperlyConfigured
+
+# The base settings insist on DEBUG being set, production never wants it on
+os.environ.setdefault("DEBUG", "False")
+
+from core.settings import *  # noqa: F403
+from core.settings import CACHES as BASE_CACHES
+from core.settings import TEMPLATES as BASE_TEMPLATES
+
+DEBUG = False
+ALLOWED_HOSTS = config("ALLOWED_HOSTS", default="", cast=Csv())
+
+# Always cache compiled templates, whatever DEBUG says, and compile them all
+# when a worker boots instead of on its first requests
+TEMPLATES = [
+    {
+        **BASE_TEMPLATES[0],
+        "APP_DIRS": False,
+        "OPTIONS": {
+            **cast("dict[str, Any]", BASE_TEMPLATES[0]["OPTIONS"]),
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
+        },
+    },
+]
+WARM_TEMPLATES_AT_BOOT = config("WARM_TEMPLATES_AT_BOOT", default=True, cast=bool)
+
+# The cached pages and the recipes versions that invalidate them must be
+# shared by every worker, run_workers and the management commands, or a
+# write in one process leaves the others serving stale pages. The file cache
+# covers one host, use Redis or Memcached across several.
+CACHES = {
+    **BASE_CACHES,
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND",
+            default="django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=str(BASE_DIR / "cache")),  # noqa: F405
+    },
+}
+if CACHES["default"]["BACKEND"] == "django.core.cache.backends.locmem.LocMemCache":
+    msg = "CACHE_BACKEND must be shared by all processes, not LocMemCache."
+    raise ImproperlyConfigured(msg)
+
+# Hashed names cached for a year, bundled and precompressed, see utils.staticfiles
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "utils.staticfiles.CompressedManifestStaticFilesStorage",
+    },
+}
+SERVE_STATIC = config("SERVE_STATIC", default=True, cast=bool)
@@ -19,10 +19,13 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from utils.instrumentation import metrics_view
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("", include("recipes.urls")),
-    path("authors/", include("authors.urls"))
+    path("authors/", include("authors.urls")),
+    path("metrics/", metrics_view, name="metrics"),
 ]
 
 if settings.DEBUG:  # pragma: no cover
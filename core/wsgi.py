@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
 
 application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.WARM_TEMPLATES_AT_BOOT:
+    # Parse templates now, with gunicorn --preload once for all workers
+    from utils.templates import warm_templates
+
+    warm_templates()
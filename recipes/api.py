@@ -0,0 +1,188 @@
+"""
+Read-only JSON endpoints for the published recipes.
+
+Each endpoint is its HTML view with a JSON body: the querysets, the page cache,
+replica reads and ETag/304 handling are the same. Rows are read with
+``.values()``, no model instances are built, and lists are cursor paginated
+so no page costs a ``COUNT(*)``. ``?fields=title,slug`` selects the fields
+returned, the default set otherwise.
+"""
+from collections.abc import Sequence
+from datetime import datetime
+from typing import Any, Final
+
+from django.core.files.storage import default_storage
+from django.http import HttpRequest, JsonResponse
+from django.http.response import Http404, HttpResponseBase
+from django.utils.cache import quote_etag
+from django.views import View
+
+from recipes.cache import make_recipes_key
+from recipes.mixins import page_query
+from recipes.views import (
+    PER_PAGE,
+    RecipeDetail,
+    RecipeListViewCategory,
+    RecipeListViewHome,
+    RecipeListViewSearch,
+)
+from utils.pagination import CURSOR_MODE, make_cursor_pagination
+
+# Public name of each field and the column it is read from
+API_FIELDS: Final[dict[str, str]] = {
+    "id": "id",
+    "title": "title",
+    "slug": "slug",
+    "description": "description",
+    "preparation_time": "preparation_time",
+    "preparation_time_unit": "preparation_time_unit",
+    "servings": "servings",
+    "servings_unit": "servings_unit",
+    "preparation_steps": "preparation_steps",
+    "preparation_steps_is_html": "preparation_steps_is_html",
+    "cover": "cover",
+    "category": "category__name",
+    "category_id": "category_id",
+    "author": "author__username",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+}
+LIST_FIELDS: Final[tuple[str, ...]] = (
+    "id", "title", "slug", "description", "preparation_time",
+    "preparation_time_unit", "servings", "servings_unit", "cover", "category",
+    "author", "created_at", "updated_at",
+)
+DETAIL_FIELDS: Final[tuple[str, ...]] = (
+    *LIST_FIELDS, "preparation_steps", "preparation_steps_is_html",
+)
+
+
+class InvalidFieldsError(ValueError):
+    pass
+
+
+def parse_fields(value: str | None, default: Sequence[str]) -> tuple[str, ...]:
+    """
+    >>> parse_fields("title, slug,title", LIST_FIELDS)
+    ('title', 'slug')
+    >>> parse_fields(None, ("id",))
+    ('id',)
+    >>> parse_fields("title,password", LIST_FIELDS)
+    Traceback (most recent call last):
+    ...
+    recipes.api.InvalidFieldsError: Unknown fields: password
+    """
+    if not value:
+        return tuple(default)
+    fields = tuple(dict.fromkeys(
+        field for field in (part.strip() for part in value.split(",")) if field
+    ))
+    unknown = [field for field in fields if field not in API_FIELDS]
+    if unknown:
+        msg = f"Unknown fields: {', '.join(unknown)}"
+        raise InvalidFieldsError(msg)
+    return fields or tuple(default)
+
+
+def serialize(row: dict[str, Any], fields: Sequence[str]) -> dict[str, Any]:
+    data = {field: row[API_FIELDS[field]] for field in fields}
+    if data.get("cover") is not None:
+        data["cover"] = default_storage.url(data["cover"]) if data["cover"] else None
+    return data
+
+
+class RecipeApiMixin(View):
+    """Answers with JSON, errors included."""
+
+    default_fields: Sequence[str] = LIST_FIELDS
+    # Read to build the response even when not asked for
+    internal_columns: tuple[str, ...] = ("id", "updated_at")
+
+    def get_fields(self) -> tuple[str, ...]:
+        return parse_fields(self.request.GET.get("fields"), self.default_fields)
+
+    def get_columns(self, fields: Sequence[str]) -> list[str]:
+        return list(dict.fromkeys(
+            [*(API_FIELDS[field] for field in fields), *self.internal_columns],
+        ))
+
+    def dispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any,  # noqa: ANN401
+    ) -> HttpResponseBase:
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except InvalidFieldsError as error:
+            return JsonResponse({"error": str(error)}, status=400)
+        except Http404:
+            return JsonResponse({"error": "Not found"}, status=404)
+
+
+class RecipeListApiMixin(RecipeApiMixin):
+    pagination_mode = CURSOR_MODE
+
+    def get_cursor_ordering(self) -> tuple[str, ...]:
+        # Keeps the queryset's own order, e.g. search relevance, and pages by it
+        return tuple(self.get_queryset().query.order_by) or ("-id",)
+
+    def get_columns(self, fields: Sequence[str]) -> list[str]:
+        # The cursors are built out of the ordering columns, rank included
+        ordering = [field.lstrip("-") for field in self.get_cursor_ordering()]
+        return list(dict.fromkeys([*super().get_columns(fields), *ordering]))
+
+    def page_url(self, cursor: str | None) -> str | None:
+        if cursor is None:
+            return None
+        query = self.request.GET.copy()
+        query["cursor"] = cursor
+        return self.request.build_absolute_uri(
+            f"{self.request.path}?{query.urlencode()}",
+        )
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:  # noqa: ANN401
+        fields = self.get_fields()
+        rows = self.get_queryset().values(*self.get_columns(fields))
+        page, _ = make_cursor_pagination(
+            request, rows, PER_PAGE, self.get_cursor_ordering(),
+        )
+        self.rendered_last_modified: datetime | None = max(
+            (row["updated_at"] for row in page), default=None,
+        )
+        return JsonResponse({
+            "results": [serialize(row, fields) for row in page],
+            "next": self.page_url(page.next_cursor),
+            "previous": self.page_url(page.previous_cursor),
+        })
+
+
+class RecipeListApi(RecipeListApiMixin, RecipeListViewHome):
+    pass
+
+
+class RecipeCategoryApi(RecipeListApiMixin, RecipeListViewCategory):
+    pass
+
+
+class RecipeSearchApi(RecipeListApiMixin, RecipeListViewSearch):
+    pass
+
+
+class RecipeDetailApi(RecipeApiMixin, RecipeDetail):
+    default_fields = DETAIL_FIELDS
+
+    def make_etag(self, last_modified: datetime, version: int) -> str:
+        # Must not match the HTML page's, nor a response with other fields
+        return quote_etag(make_recipes_key(
+            "etag", type(self).__name__, self.kwargs["pk"], page_query(self.request),
+            last_modified, version=version,
+        ))
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:  # noqa: ANN401
+        fields = self.get_fields()
+        row = (
+            self.get_queryset().filter(pk=self.kwargs["pk"])
+            .values(*self.get_columns(fields)).first()
+        )
+        if row is None:
+            raise Http404
+        self.rendered_last_modified = row["updated_at"]
+        return JsonResponse(serialize(row, fields))
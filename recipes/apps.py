@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class RecipesConfig(AppConfig):
     DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
     name = "recipes"
+
+    def ready(self) -> None:
+        # Imported for the receivers they connect
+        from recipes import covers, signals
+        from utils.db import configure_connection
+
+        connection_created.connect(
+            configure_connection, dispatch_uid="utils.db.configure_connection",
+        )
@@ -0,0 +1,97 @@
+"""
+Async versions of the public recipe pages, served instead of the ones in
+``recipes.views`` when ``ASYNC_VIEWS`` is on.
+
+Under ASGI a sync view takes a worker thread for its whole run. These await
+the ORM and the cache instead (``aget``, ``acount``, async iteration through
+``amake_pagination``), so a request waiting on the database leaves the event
+loop free. Querysets, templates and cache keys are shared with the sync views
+of the same name; only template rendering still happens in a thread.
+"""
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from django.http import HttpRequest
+from django.shortcuts import aget_object_or_404
+from django.template.response import TemplateResponse
+
+from recipes import views
+from recipes.cache import aget_recipes_version, amake_recipes_key
+from recipes.views import PER_PAGE
+from utils.pagination import amake_pagination
+
+
+class AsyncRecipeListMixin(views.RecipeListViewBase):
+    async def aprepare(self) -> None:
+        """Loads what ``get_queryset`` needs before any query is built."""
+
+    async def aget_last_modified(self) -> datetime | None:
+        await self.aprepare()
+        # Clamping a deep page may count the rows, which only runs sync
+        return await super().aget_last_modified()
+
+    async def aget_etag(self, last_modified: datetime | None) -> str | None:
+        return self.make_etag(last_modified, await aget_recipes_version())
+
+    async def aget(
+        self, request: HttpRequest, *args: Any, **kwargs: Any,  # noqa: ANN401
+    ) -> TemplateResponse:
+        await self.aprepare()
+        self.object_list = self.get_queryset()
+        page_obj, pagination_range = await amake_pagination(
+            request, self.object_list, PER_PAGE,
+            mode=self.pagination_mode, cursor_ordering=self.get_cursor_ordering(),
+            count_cache_key=await amake_recipes_key(
+                "count", type(self).__name__, *self.get_count_cache_parts(),
+            ),
+            known_count=self.get_known_count(),
+        )
+        context = self.get_context_data(
+            recipes=page_obj, pagination_range=pagination_range,
+        )
+        return self.render_to_response(context)
+
+    if not TYPE_CHECKING:
+        # The handler View.dispatch looks up, typed sync on the generic views
+        get = aget
+
+
+class RecipeListViewHome(AsyncRecipeListMixin, views.RecipeListViewHome):
+    pass
+
+
+class RecipeListViewCategory(AsyncRecipeListMixin, views.RecipeListViewCategory):
+    async def aprepare(self) -> None:
+        if "category" not in self.__dict__:
+            self.category = await aget_object_or_404(self.get_category_queryset())
+
+
+class RecipeListViewSearch(AsyncRecipeListMixin, views.RecipeListViewSearch):
+    pass
+
+
+class RecipeDetail(views.RecipeDetail):
+    async def aget_page_cache_version(self) -> int:
+        return await aget_recipes_version(self.kwargs["pk"])
+
+    async def aget_last_modified(self) -> datetime | None:
+        return await self.get_updated_at_queryset().afirst()
+
+    async def aget_etag(self, last_modified: datetime | None) -> str | None:
+        if last_modified is None:
+            return None
+        return self.make_etag(
+            last_modified, await aget_recipes_version(self.kwargs["pk"]),
+        )
+
+    async def aget(
+        self, request: HttpRequest, *args: Any, **kwargs: Any,  # noqa: ANN401
+    ) -> TemplateResponse:
+        self.object = await aget_object_or_404(
+            self.get_queryset(), pk=self.kwargs["pk"],
+        )
+        context = self.get_context_data(object=self.object)
+        return self.render_to_response(context)
+
+    if not TYPE_CHECKING:
+        get = aget
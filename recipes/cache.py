@@ -0,0 +1,122 @@
+import contextlib
+import hashlib
+import time
+from collections.abc import Iterable
+from typing import Final
+
+from django.core.cache import cache
+
+from utils.instrumentation import record_cache_lookup
+
+RECIPES_VERSION_KEY: Final[str] = "recipes:version"
+PAGE_CACHE_HITS_KEY: Final[str] = "recipes:page-cache:hits"
+PAGE_CACHE_MISSES_KEY: Final[str] = "recipes:page-cache:misses"
+
+
+def _version_key(recipe_id: int | None) -> str:
+    if recipe_id is None:
+        return RECIPES_VERSION_KEY
+    return f"{RECIPES_VERSION_KEY}:{recipe_id}"
+
+
+def get_recipes_version(recipe_id: int | None = None) -> int:
+    """
+    Returns the current generation of published recipe data, or of a single
+    recipe when ``recipe_id`` is given.
+
+    Cache keys that depend on which recipes are published embed this number,
+    so bumping it invalidates all of them at once without tracking each key.
+    A fresh timestamp seeds the counter, so an evicted version never
+    resurrects entries written under an older one.
+    """
+    key = _version_key(recipe_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, time.time_ns())
+    return version
+
+
+async def aget_recipes_version(recipe_id: int | None = None) -> int:
+    key = _version_key(recipe_id)
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, time.time_ns(), None)
+        version = await cache.aget(key, time.time_ns())
+    return version
+
+
+def bump_recipes_version(recipe_id: int | None = None) -> None:
+    key = _version_key(recipe_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def bump_recipe_versions(recipe_ids: Iterable[int]) -> None:
+    """
+    Bumps the versions of many recipes in one round trip. The dropped keys
+    are reseeded with a fresh timestamp when next read, which is larger than
+    any value they held before.
+    """
+    cache.delete_many([_version_key(recipe_id) for recipe_id in recipe_ids])
+
+
+def make_recipes_key(prefix: str, *parts: object, version: int | None = None) -> str:
+    """
+    Builds a versioned cache key, hashing ``parts`` so that arbitrary search
+    terms stay within the key length limits of every cache backend.
+
+    >>> make_recipes_key("count", "home", 1, version=7).startswith("recipes:count:7:")
+    True
+    """
+    if version is None:
+        version = get_recipes_version()
+    digest = hashlib.md5(
+        repr(parts).encode(), usedforsecurity=False,
+    ).hexdigest()
+    return f"recipes:{prefix}:{version}:{digest}"
+
+
+async def amake_recipes_key(
+    prefix: str, *parts: object, version: int | None = None,
+) -> str:
+    if version is None:
+        version = await aget_recipes_version()
+    return make_recipes_key(prefix, *parts, version=version)
+
+
+def record_page_cache(*, hit: bool) -> None:
+    record_cache_lookup(hits=int(hit), misses=int(not hit))
+    key = PAGE_CACHE_HITS_KEY if hit else PAGE_CACHE_MISSES_KEY
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        # Still missing with caches that store nothing, like DummyCache
+        with contextlib.suppress(ValueError):
+            cache.incr(key)
+
+
+async def arecord_page_cache(*, hit: bool) -> None:
+    record_cache_lookup(hits=int(hit), misses=int(not hit))
+    key = PAGE_CACHE_HITS_KEY if hit else PAGE_CACHE_MISSES_KEY
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 0, None)
+        with contextlib.suppress(ValueError):
+            await cache.aincr(key)
+
+
+def get_page_cache_stats() -> dict[str, float]:
+    counters = cache.get_many([PAGE_CACHE_HITS_KEY, PAGE_CACHE_MISSES_KEY])
+    hits = counters.get(PAGE_CACHE_HITS_KEY, 0)
+    misses = counters.get(PAGE_CACHE_MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
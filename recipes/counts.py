@@ -0,0 +1,115 @@
+"""
+Keeps ``Category.published_recipe_count`` and ``latest_recipe_at`` in step
+with the published recipes.
+
+Saves and deletes adjust the affected categories by one with a single
+``UPDATE`` in the same transaction (see ``recipes.signals``). Writes that skip
+the signals, like bulk imports, call ``refresh_category_counts`` afterwards,
+which recomputes from the recipes table and also repairs any drift.
+
+The deltas are relative to the values an instance was loaded with, so two
+concurrent edits of the same recipe can both apply theirs and drift a count.
+Run ``manage.py refresh_category_counts`` periodically (e.g. nightly from
+cron) to repair that; the pages never show a count below zero meanwhile.
+"""
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from recipes.models import Category, Recipe
+
+# (category_id, is_published) of a recipe row
+Placement = tuple[int | None, bool]
+
+
+def stored_placement(recipe: Recipe) -> Placement | None:
+    """Where the stored row of ``recipe`` counts, None if there is no row yet."""
+    if recipe._state.adding:  # noqa: SLF001
+        return None
+    loaded_values = getattr(recipe, "loaded_values", {})
+    if {"category_id", "is_published"} <= loaded_values.keys():
+        return loaded_values["category_id"], loaded_values["is_published"]
+    # Instances loaded with only() or defer() don't know, ask the database
+    return (
+        Recipe.objects.filter(pk=recipe.pk)
+        .values_list("category_id", "is_published")
+        .first()
+    )
+
+
+def placement_deltas(old: Placement | None, new: Placement | None) -> Counter[int]:
+    """
+    How the published count of each category moves from ``old`` to ``new``.
+
+    >>> placement_deltas(None, (1, True))
+    Counter({1: 1})
+    >>> placement_deltas((1, True), (2, True))
+    Counter({2: 1, 1: -1})
+    >>> placement_deltas((1, False), (1, True))
+    Counter({1: 1})
+    >>> placement_deltas((1, True), (1, True))
+    Counter()
+    """
+    deltas: Counter[int] = Counter()
+    if old is not None and old[0] is not None and old[1]:
+        deltas[old[0]] -= 1
+    if new is not None and new[0] is not None and new[1]:
+        deltas[new[0]] += 1
+    return Counter({pk: delta for pk, delta in deltas.items() if delta})
+
+
+def _latest_published(category: str = "pk") -> Subquery:
+    return Subquery(
+        Recipe.objects.published()
+        .filter(category=OuterRef(category))
+        .order_by("-created_at")
+        .values("created_at")[:1],
+    )
+
+
+def apply_category_deltas(deltas: Counter[int], created_at: datetime) -> None:
+    """
+    Adds each delta to the category's count. ``created_at`` is the moved
+    recipe's, the latest date is only recomputed when that recipe was it.
+    """
+    for category_id, delta in deltas.items():
+        categories = Category.objects.filter(pk=category_id)
+        if delta > 0:
+            categories.update(
+                published_recipe_count=F("published_recipe_count") + delta,
+                latest_recipe_at=Greatest(
+                    Coalesce("latest_recipe_at", Value(created_at)), Value(created_at),
+                ),
+            )
+        else:
+            categories.update(
+                published_recipe_count=Greatest(
+                    F("published_recipe_count") + delta, Value(0),
+                ),
+                latest_recipe_at=Case(
+                    When(latest_recipe_at__lte=created_at, then=_latest_published()),
+                    default=F("latest_recipe_at"),
+                ),
+            )
+
+
+def refresh_category_counts(category_ids: Iterable[int] | None = None) -> int:
+    """Recomputes the counts of ``category_ids``, or of every category."""
+    counts = (
+        Recipe.objects.published()
+        .filter(category=OuterRef("pk"))
+        .order_by()
+        .values("category")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    categories = Category.objects.all()
+    if category_ids is not None:
+        categories = categories.filter(pk__in=list(category_ids))
+    return categories.update(
+        published_recipe_count=Coalesce(Subquery(counts), 0),
+        latest_recipe_at=_latest_published(),
+    )
@@ -0,0 +1,76 @@
+"""
+Renders cover variants off the request path.
+
+Saving a recipe with a new cover enqueues ``process_cover`` on the task
+queue, in the same transaction, and ``manage.py run_workers`` renders the
+variants. Uploads return as soon as the original file is stored.
+"""
+from typing import Any
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from recipes.images import delete_variants, render_variants, variants_are_current
+from recipes.models import Recipe
+from recipes.signals import invalidate_public_caches
+from tasks.queue import enqueue, enqueue_many
+
+PROCESS_COVER_TASK = "recipes.process_cover"
+PROCESS_COVER_ATTEMPTS = 3
+
+
+def process_cover(recipe_id: int, *, force: bool = False) -> bool:
+    """
+    Brings the variants of one recipe in line with its cover. Returns whether
+    anything was rendered or removed.
+    """
+    recipe = Recipe.objects.filter(pk=recipe_id).only(
+        "cover", "cover_variants", "is_published",
+    ).first()
+    if recipe is None:
+        return False
+    source = recipe.cover.name or ""
+    old_variants = recipe.cover_variants or {}
+    if not force and variants_are_current(old_variants, source):
+        return False
+
+    storage = recipe.cover.storage
+    cover_variants = render_variants(storage, source) if source else {}
+    # The cover may have been replaced while rendering, leave the row to the
+    # run scheduled by that save
+    updated = Recipe.objects.filter(pk=recipe_id, cover=source).update(
+        cover_variants=cover_variants, updated_at=timezone.now(),
+    )
+    if not updated:
+        delete_variants(storage, cover_variants)
+        return False
+    if old_variants.get("source") != source:
+        delete_variants(storage, old_variants)
+    # update() skips the signals that keep public pages fresh
+    if recipe.is_published:
+        invalidate_public_caches(recipe_id)
+    return True
+
+
+def schedule_cover_processing(recipe_id: int) -> None:
+    enqueue(
+        PROCESS_COVER_TASK, {"recipe_id": recipe_id},
+        max_attempts=PROCESS_COVER_ATTEMPTS,
+    )
+
+
+def schedule_covers_processing(recipe_ids: list[int]) -> int:
+    return enqueue_many(
+        PROCESS_COVER_TASK, [{"recipe_id": recipe_id} for recipe_id in recipe_ids],
+        max_attempts=PROCESS_COVER_ATTEMPTS,
+    )
+
+
+@receiver(post_save, sender=Recipe, dispatch_uid="recipes_process_cover_on_save")
+def process_cover_on_save(instance: Recipe, **kwargs: Any) -> None:  # noqa: ANN401
+    # Deferred on purpose, a listing instance never needs to load these
+    if {"cover", "cover_variants"} & instance.get_deferred_fields():
+        return
+    if not variants_are_current(instance.cover_variants, instance.cover.name or ""):
+        schedule_cover_processing(instance.pk)
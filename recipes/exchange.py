@@ -0,0 +1,100 @@
+import csv
+import json
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import IO, Any, Final
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+JSONL: Final[str] = "jsonl"
+CSV: Final[str] = "csv"
+FORMATS: Final[tuple[str, ...]] = (JSONL, CSV)
+
+# Columns of an exported recipe, category and author travel by name
+EXCHANGE_FIELDS: Final[tuple[str, ...]] = (
+    "title",
+    "slug",
+    "description",
+    "preparation_time",
+    "preparation_time_unit",
+    "servings",
+    "servings_unit",
+    "preparation_steps",
+    "preparation_steps_is_html",
+    "is_published",
+    "cover",
+    "category",
+    "author",
+    "created_at",
+)
+
+
+def detect_format(path: str, default: str = JSONL) -> str:
+    """
+    >>> detect_format("recipes.csv")
+    'csv'
+    >>> detect_format("-")
+    'jsonl'
+    """
+    suffix = Path(path).suffix.lstrip(".").lower()
+    return suffix if suffix in FORMATS else default
+
+
+def read_records(stream: IO[str], fmt: str) -> Iterator[str | dict[str, Any]]:
+    """
+    Yields one record per row without reading the whole file: a dict for CSV,
+    the undecoded line for JSONL, so that a malformed line can be reported and
+    skipped on its own by ``decode_record``.
+    """
+    if fmt == CSV:
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if line.strip():
+            yield line
+
+
+def decode_record(record: str | dict[str, Any]) -> dict[str, Any]:
+    """
+    >>> decode_record('{"title": "Pudim"}')
+    {'title': 'Pudim'}
+    >>> decode_record("[]")
+    Traceback (most recent call last):
+    ...
+    TypeError: expected a JSON object, got list
+    """
+    if isinstance(record, dict):
+        return record
+    row = json.loads(record)
+    if not isinstance(row, dict):
+        msg = f"expected a JSON object, got {type(row).__name__}"
+        raise TypeError(msg)
+    return row
+
+
+def write_rows(stream: IO[str], fmt: str, rows: Iterable[dict[str, Any]]) -> int:
+    total = 0
+    if fmt == CSV:
+        writer = csv.DictWriter(stream, fieldnames=EXCHANGE_FIELDS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            total += 1
+        return total
+    for row in rows:
+        stream.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False))
+        stream.write("\n")
+        total += 1
+    return total
+
+
+def as_bool(value: Any) -> bool:  # noqa: ANN401
+    """
+    CSV cells arrive as text, JSON values already typed.
+
+    >>> [as_bool(v) for v in (True, "True", "1", "yes", "", "False", None)]
+    [True, True, True, True, False, False, False]
+    """
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+    return bool(value)
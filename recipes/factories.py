@@ -0,0 +1,168 @@
+"""
+Builders for recipes, authors and categories.
+
+The ``build_*`` helpers return unsaved instances with the same defaults the
+test suite has always used, the ``fake_*`` helpers feed them realistic data
+from Faker for ``manage.py seed_recipes``.
+"""
+from dataclasses import dataclass
+from typing import Any
+
+from django.contrib.auth.hashers import make_password
+from faker import Faker
+
+from recipes.models import Category, Recipe, User
+
+DEFAULT_LOCALE = "pt_BR"
+
+RECIPE_DEFAULTS: dict[str, Any] = {
+    "title": "Recipe title",
+    "description": "Recipe description",
+    "slug": "recipe-slug",
+    "preparation_time": 10,
+    "preparation_time_unit": "Minutos",
+    "servings": 5,
+    "servings_unit": "Porções",
+    "preparation_steps": "Recipe Preparation Steps",
+    "preparation_steps_is_html": False,
+    "is_published": True,
+}
+
+AUTHOR_DEFAULTS: dict[str, Any] = {
+    "first_name": "user",
+    "last_name": "name",
+    "username": "username",
+    "email": "username@gmail.com",
+}
+
+CATEGORY_NAMES = (
+    "Bolos", "Doces", "Salgados", "Massas", "Carnes", "Peixes", "Saladas",
+    "Sopas", "Bebidas", "Pães", "Vegetarianos", "Lanches",
+)
+DISHES = (
+    "Bolo", "Torta", "Pudim", "Risoto", "Frango", "Salada", "Sopa", "Pão",
+    "Lasanha", "Moqueca", "Escondidinho", "Mousse", "Panqueca", "Farofa",
+)
+INGREDIENTS = (
+    "chocolate", "milho", "cenoura", "limão", "queijo", "abóbora", "banana",
+    "coco", "camarão", "palmito", "espinafre", "mandioca", "frango", "maracujá",
+)
+STYLES = (
+    "", "da vovó", "caseiro", "cremoso", "fit", "de panela", "assado",
+    "rápido", "especial", "sem glúten",
+)
+PREPARATION_TIME_UNITS = tuple(
+    value for value, _ in Recipe.PREPARATION_TIME_UNIT_CHOICES
+)
+SERVINGS_UNITS = tuple(value for value, _ in Recipe.SERVINGS_UNIT_CHOICES)
+
+
+def build_category(name: str = "category") -> Category:
+    return Category(name=name)
+
+
+def build_author(
+    password: str = "1234567",  # noqa: S107
+    password_hash: str | None = None,
+    **kwargs: Any,  # noqa: ANN401
+) -> User:
+    """
+    Pass ``password_hash`` when building many authors, hashing is by design
+    the slowest part of creating a user.
+    """
+    user = User(**(AUTHOR_DEFAULTS | kwargs))
+    user.password = password_hash or make_password(password)
+    return user
+
+
+def build_recipe(**kwargs: Any) -> Recipe:  # noqa: ANN401
+    return Recipe(**(RECIPE_DEFAULTS | kwargs))
+
+
+def make_faker(seed: int, *parts: int, locale: str = DEFAULT_LOCALE) -> Faker:
+    """Returns a Faker whose output only depends on ``seed`` and ``parts``."""
+    faker = Faker(locale)
+    faker.seed_instance(":".join(map(str, (seed, *parts))))
+    return faker
+
+
+def fake_category_names(count: int) -> list[str]:
+    """
+    >>> fake_category_names(3)
+    ['Bolos', 'Doces', 'Salgados']
+    >>> fake_category_names(14)[-2:]
+    ['Bolos 2', 'Doces 2']
+    """
+    return [
+        CATEGORY_NAMES[i % len(CATEGORY_NAMES)]
+        + (f" {i // len(CATEGORY_NAMES) + 1}" if i >= len(CATEGORY_NAMES) else "")
+        for i in range(count)
+    ]
+
+
+def fake_author_fields(faker: Faker, index: int) -> dict[str, str]:
+    first_name, last_name = faker.first_name(), faker.last_name()
+    # The index keeps usernames unique however many authors are seeded
+    username = f"{faker.user_name()}.{index}"
+    return {
+        "first_name": first_name,
+        "last_name": last_name,
+        "username": username,
+        "email": f"{username}@example.com",
+    }
+
+
+def fake_recipe_title(faker: Faker) -> str:
+    title = (
+        f"{faker.random_element(DISHES)} de {faker.random_element(INGREDIENTS)} "
+        f"{faker.random_element(STYLES)}"
+    )
+    return title.strip()
+
+
+def fake_recipe_fields(faker: Faker, published_ratio: float) -> dict[str, Any]:
+    return {
+        "title": fake_recipe_title(faker),
+        "description": faker.sentence(nb_words=14)[:165],
+        "preparation_time": faker.random_int(5, 240),
+        "preparation_time_unit": faker.random_element(PREPARATION_TIME_UNITS),
+        "servings": faker.random_int(1, 12),
+        "servings_unit": faker.random_element(SERVINGS_UNITS),
+        "preparation_steps": "\n\n".join(faker.paragraphs(faker.random_int(2, 5))),
+        "is_published": faker.random.random() < published_ratio,
+    }
+
+
+@dataclass(frozen=True)
+class RecipeChunk:
+    """One unit of work for a seeding worker, a slice of the recipe sequence."""
+
+    seed: int
+    number: int
+    size: int
+    authors: int
+    categories: int
+    covers: int = 0
+    published_ratio: float = 0.9
+    locale: str = DEFAULT_LOCALE
+
+
+def fake_recipe_chunk(chunk: RecipeChunk) -> list[dict[str, Any]]:
+    """
+    Generates the field values of one chunk of recipes.
+
+    Relations are returned as indexes into the seeded authors, categories and
+    covers. Each chunk gets its own Faker seeded from ``(seed, number)``, so
+    the output does not depend on how many workers share the chunks.
+    """
+    faker = make_faker(chunk.seed, chunk.number, locale=chunk.locale)
+    rows = []
+    for _ in range(chunk.size):
+        row = fake_recipe_fields(faker, chunk.published_ratio)
+        row["author"] = faker.random_int(0, chunk.authors - 1)
+        row["category"] = faker.random_int(0, chunk.categories - 1)
+        row["cover"] = (
+            faker.random_int(0, chunk.covers - 1) if chunk.covers else None
+        )
+        rows.append(row)
+    return rows
@@ -0,0 +1,156 @@
+"""
+RSS and Atom feeds of the newest published recipes, of a category and of an
+author, for feed readers that would otherwise poll the home page.
+
+``RecipeFeedView`` serves a ``django.contrib.syndication`` feed through the
+same page cache and conditional GET handling as the pages, so a poll with
+``If-None-Match`` is answered from the cache as a 304 without any query.
+"""
+from datetime import datetime
+from functools import cached_property
+from typing import Any, Final
+
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.db.models.query import QuerySet
+from django.http import HttpRequest, HttpResponse
+from django.http.response import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import quote_etag
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed, SyndicationFeed
+from django.views import View
+
+from recipes.cache import get_recipes_version, make_recipes_key
+from recipes.mixins import ConditionalGetMixin, PageCacheMixin, ReplicaReadMixin
+from recipes.models import Category, Recipe, User
+
+FEED_TYPES: Final[dict[str, type[SyndicationFeed]]] = {
+    "rss": Rss201rev2Feed,
+    "atom": Atom1Feed,
+}
+
+
+class RecipeFeed(Feed):
+    # Feed calls these with the object of get_object(), None here
+    def title(self, obj: Any) -> str:  # noqa: ANN401
+        return "Recipes"
+
+    def description(self, obj: Any) -> str:  # noqa: ANN401
+        return "The newest recipes."
+
+    def link(self, obj: Any) -> str:  # noqa: ANN401
+        return reverse("recipes:home")
+
+    def get_queryset(self, obj: Any) -> QuerySet[Recipe]:  # noqa: ANN401
+        return Recipe.objects.published()
+
+    def items(self, obj: Any) -> QuerySet[Recipe]:  # noqa: ANN401
+        # The home page's rows, newest first, only as many as a reader shows
+        return (
+            self.get_queryset(obj).for_listing().order_by("-id")[:settings.FEED_ITEMS]
+        )
+
+    def item_title(self, item: Recipe) -> str:
+        return item.title
+
+    def item_description(self, item: Recipe) -> str:
+        return item.description
+
+    def item_link(self, item: Recipe) -> str:
+        return reverse("recipes:recipe", kwargs={"pk": item.pk})
+
+    def item_pubdate(self, item: Recipe) -> datetime:
+        return item.created_at
+
+    def item_updateddate(self, item: Recipe) -> datetime:
+        return item.updated_at
+
+    def item_author_name(self, item: Recipe) -> str | None:
+        if item.author is None:
+            return None
+        return item.author.get_full_name() or item.author.username
+
+    def item_categories(self, item: Recipe) -> tuple[str, ...]:
+        return (item.category.name,) if item.category else ()
+
+
+class CategoryRecipeFeed(RecipeFeed):
+    def get_object(self, request: HttpRequest, category_id: int) -> Category:
+        return get_object_or_404(
+            Category.objects.only("name"), pk=category_id, published_recipe_count__gt=0,
+        )
+
+    def title(self, obj: Category) -> str:
+        return f"{obj.name} - Recipes"
+
+    def description(self, obj: Category) -> str:
+        return f"The newest {obj.name} recipes."
+
+    def link(self, obj: Category) -> str:
+        return reverse("recipes:category", kwargs={"category_id": obj.pk})
+
+    def get_queryset(self, obj: Category) -> QuerySet[Recipe]:
+        return super().get_queryset(obj).filter(category=obj)
+
+
+class AuthorRecipeFeed(RecipeFeed):
+    def get_object(self, request: HttpRequest, username: str) -> User:
+        return get_object_or_404(
+            User.objects.only("username", "first_name", "last_name"),
+            username=username, is_active=True,
+        )
+
+    def title(self, obj: User) -> str:
+        return f"Recipes by {obj.get_full_name() or obj.username}"
+
+    def description(self, obj: User) -> str:
+        return f"The newest recipes by {obj.get_full_name() or obj.username}."
+
+    def get_queryset(self, obj: User) -> QuerySet[Recipe]:
+        return super().get_queryset(obj).filter(author=obj)
+
+
+class RecipeFeedView(ReplicaReadMixin, PageCacheMixin, ConditionalGetMixin, View):
+    """Serves ``feed_class`` in the ``feed_format`` of the URL."""
+
+    feed_class: type[RecipeFeed] = RecipeFeed
+    # Unpublishing a recipe moves no shown date forward
+    send_last_modified = False
+
+    @cached_property
+    def feed(self) -> RecipeFeed:
+        feed_type = FEED_TYPES.get(self.kwargs["feed_format"])
+        if feed_type is None:
+            raise Http404
+        feed = self.feed_class()
+        feed.feed_type = feed_type
+        return feed
+
+    @cached_property
+    def feed_object(self) -> Any:  # noqa: ANN401
+        kwargs = {k: v for k, v in self.kwargs.items() if k != "feed_format"}
+        return self.feed.get_object(self.request, **kwargs)
+
+    def get_last_modified(self) -> datetime | None:
+        items = self.feed.items(self.feed_object)
+        return max(items.values_list("updated_at", flat=True), default=None)
+
+    def get_etag(self, last_modified: datetime | None) -> str | None:
+        # The recipes version covers unpublishing, which moves no updated_at
+        return quote_etag(make_recipes_key(
+            "etag", type(self).__name__, self.request.path, last_modified,
+            version=get_recipes_version(),
+        ))
+
+    def get(
+        self, request: HttpRequest, *args: Any, **kwargs: Any,  # noqa: ANN401
+    ) -> HttpResponse:
+        feedgen = self.feed.get_feed(self.feed_object, request)
+        response = HttpResponse(content_type=feedgen.content_type)
+        feedgen.write(response, "utf-8")
+        # Not feedgen.latest_post_date(), which is "now" for an empty feed
+        self.rendered_last_modified = max(
+            (item["updateddate"] for item in feedgen.items), default=None,
+        )
+        return response
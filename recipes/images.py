@@ -0,0 +1,141 @@
+"""
+Resized variants of recipe covers.
+
+Every cover gets a few widths in WebP and JPEG. What was rendered is kept in
+``Recipe.cover_variants`` so templates can build ``srcset`` without touching
+the storage::
+
+    {
+        "source": "recipes/covers/2024/01/01/bolo.jpg",
+        "width": 3000, "height": 2000,
+        "variants": {
+            "card": {"width": 640, "height": 427,
+                     "webp": "recipes/covers/2024/01/01/bolo.card.webp",
+                     "jpeg": "recipes/covers/2024/01/01/bolo.card.jpg"},
+            ...
+        },
+    }
+"""
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import Any, Final
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from PIL import Image, ImageOps
+
+# Variant name -> largest width, smaller originals are never upscaled
+VARIANT_WIDTHS: Final[dict[str, int]] = {
+    "thumb": 320,
+    "card": 640,
+    "detail": 1280,
+}
+# Format key -> (Pillow format, file extension, save options)
+VARIANT_FORMATS: Final[dict[str, tuple[str, str, dict[str, Any]]]] = {
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def variant_name(source: str, variant: str, extension: str) -> str:
+    """
+    >>> variant_name("recipes/covers/2024/01/01/bolo.png", "card", "webp")
+    'recipes/covers/2024/01/01/bolo.card.webp'
+    """
+    path = PurePosixPath(source)
+    return str(path.with_name(f"{path.stem}.{variant}.{extension}"))
+
+
+def scaled_size(size: tuple[int, int], width: int) -> tuple[int, int]:
+    """
+    >>> scaled_size((3000, 2000), 640)
+    (640, 427)
+    >>> scaled_size((300, 200), 640)
+    (300, 200)
+    """
+    if size[0] <= width:
+        return size
+    return width, max(1, round(size[1] * width / size[0]))
+
+
+def render_variants(storage: Storage, source: str) -> dict[str, Any]:
+    """Writes every variant of ``source`` to ``storage`` and describes them."""
+    with storage.open(source) as stream, Image.open(stream) as original:
+        # Phones store the orientation in EXIF, bake it into the pixels
+        image = ImageOps.exif_transpose(original).convert("RGB")
+
+    variants: dict[str, Any] = {}
+    for variant, width in VARIANT_WIDTHS.items():
+        size = scaled_size(image.size, width)
+        resized = image if size == image.size else image.resize(
+            size, Image.Resampling.LANCZOS, reducing_gap=3.0,
+        )
+        variants[variant] = {"width": size[0], "height": size[1]}
+        for key, (fmt, extension, options) in VARIANT_FORMATS.items():
+            buffer = BytesIO()
+            resized.save(buffer, format=fmt, **options)
+            name = variant_name(source, variant, extension)
+            if storage.exists(name):
+                storage.delete(name)
+            variants[variant][key] = storage.save(name, ContentFile(buffer.getvalue()))
+    return {
+        "source": source,
+        "width": image.size[0],
+        "height": image.size[1],
+        "variants": variants,
+    }
+
+
+def delete_variants(storage: Storage, cover_variants: dict[str, Any]) -> None:
+    for variant in cover_variants.get("variants", {}).values():
+        for key in VARIANT_FORMATS:
+            if variant.get(key):
+                storage.delete(variant[key])
+
+
+def variants_are_current(cover_variants: dict[str, Any], source: str) -> bool:
+    """
+    >>> variants_are_current({"source": "a.jpg", "variants": {}}, "a.jpg")
+    True
+    >>> variants_are_current({"source": "a.jpg"}, "b.jpg")
+    False
+    >>> variants_are_current({}, "")
+    True
+    """
+    return (cover_variants or {}).get("source", "") == source
+
+
+@dataclass(frozen=True)
+class CoverSources:
+    """What a ``<picture>`` element needs to render a cover."""
+
+    src: str
+    webp_srcset: str = ""
+    jpeg_srcset: str = ""
+    width: int | None = None
+    height: int | None = None
+
+
+def cover_sources(
+    storage: Storage, cover_variants: dict[str, Any], source: str, fallback_url: str,
+    default: str = "card",
+) -> CoverSources:
+    """Falls back to the original upload until its variants are rendered."""
+    if not source or not variants_are_current(cover_variants, source):
+        return CoverSources(src=fallback_url)
+    variants = cover_variants["variants"]
+
+    def srcset(key: str) -> str:
+        return ", ".join(
+            f"{storage.url(variant[key])} {variant['width']}w"
+            for variant in variants.values()
+        )
+
+    return CoverSources(
+        src=storage.url(variants[default]["jpeg"]),
+        webp_srcset=srcset("webp"),
+        jpeg_srcset=srcset("jpeg"),
+        width=variants[default]["width"],
+        height=variants[default]["height"],
+    )
@@ -0,0 +1,54 @@
+import sys
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from recipes.exchange import EXCHANGE_FIELDS, FORMATS, detect_format, write_rows
+from recipes.models import Recipe
+
+# Exchange column -> ORM lookup, relations are exported by their natural key
+LOOKUPS = {field: field for field in EXCHANGE_FIELDS} | {
+    "category": "category__name",
+    "author": "author__username",
+}
+
+
+class Command(BaseCommand):
+    help = "Streams recipes to a JSONL or CSV file in constant memory."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="Output file, '-' for stdout.")
+        parser.add_argument("--format", choices=FORMATS, help="Default: by suffix.")
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--published-only", action="store_true",
+            help="Skip recipes that are not published.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        path = options["path"]
+        fmt = options["format"] or detect_format(path)
+        queryset = Recipe.objects.order_by("id")
+        if options["published_only"]:
+            queryset = queryset.published()
+        rows = (
+            {field: row[lookup] for field, lookup in LOOKUPS.items()}
+            for row in queryset.values(*LOOKUPS.values()).iterator(
+                chunk_size=options["chunk_size"],
+            )
+        )
+
+        start = time.perf_counter()
+        if path == "-":
+            total = write_rows(sys.stdout, fmt, rows)
+        else:
+            with open(path, "w", encoding="utf-8", newline="") as stream:
+                total = write_rows(stream, fmt, rows)
+        elapsed = time.perf_counter() - start
+        # Keep stdout clean when it carries the export itself
+        report = self.stderr if path == "-" else self.stdout
+        report.write(
+            f"Exported {total} recipes in {elapsed:.2f}s "
+            f"({total / elapsed if elapsed else 0:.0f} recipes/s).",
+        )
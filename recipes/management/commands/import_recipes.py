@@ -0,0 +1,218 @@
+import contextlib
+import sys
+import time
+from datetime import datetime
+from typing import Any
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from recipes import search
+from recipes.counts import refresh_category_counts
+from recipes.exchange import (
+    FORMATS,
+    as_bool,
+    decode_record,
+    detect_format,
+    read_records,
+)
+from recipes.models import Category, Recipe
+from recipes.signals import invalidate_public_caches
+from utils.slugs import SlugAllocator
+
+PREPARATION_TIME_UNITS = {value for value, _ in Recipe.PREPARATION_TIME_UNIT_CHOICES}
+SERVINGS_UNITS = {value for value, _ in Recipe.SERVINGS_UNIT_CHOICES}
+# Columns that hold text or nothing; JSON may carry any type in them
+TEXT_FIELDS = (
+    "title", "slug", "description", "preparation_time_unit", "servings_unit",
+    "preparation_steps", "cover", "category", "author", "created_at",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk loads recipes from a JSONL or CSV file (see export_recipes), "
+        "streaming it in batches of bulk inserts."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", help="Input file, '-' for stdin.")
+        parser.add_argument("--format", choices=FORMATS, help="Default: by suffix.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        path = options["path"]
+        fmt = options["format"] or detect_format(path)
+        batch_size = options["batch_size"]
+        self.verbosity = options["verbosity"]
+        # Everything a row refers to is resolved through these maps, each name
+        # hits the database at most once for the whole import
+        self.categories: dict[str, int] = dict(
+            Category.objects.values_list("name", "id"),
+        )
+        self.authors: dict[str, int | None] = {}
+        self.slugs = SlugAllocator(Recipe.objects.all())
+        self.imported = self.skipped = self.published = 0
+        self.published_categories: set[int] = set()
+        self.start = time.perf_counter()
+
+        stdin = contextlib.nullcontext(sys.stdin)
+        with (
+            stdin if path == "-" else open(path, encoding="utf-8", newline="")
+        ) as stream:
+            batch: list[tuple[int, str | dict[str, Any]]] = []
+            for line, record in enumerate(read_records(stream, fmt), start=1):
+                batch.append((line, record))
+                if len(batch) >= batch_size:
+                    self.import_batch(batch)
+                    batch = []
+            if batch:
+                self.import_batch(batch)
+
+        if self.published:
+            # bulk_create skipped the signals that keep these up to date
+            refresh_category_counts(self.published_categories)
+            invalidate_public_caches()
+        elapsed = time.perf_counter() - self.start
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {self.imported} recipes, skipped {self.skipped}, "
+            f"in {elapsed:.2f}s ({self.rate(elapsed):.0f} recipes/s).",
+        ))
+
+    def rate(self, elapsed: float) -> float:
+        return self.imported / elapsed if elapsed else 0
+
+    def skip(self, line: int, error: Exception) -> None:
+        self.skipped += 1
+        self.stderr.write(f"Line {line} skipped: {error!r}")
+
+    def import_batch(self, batch: list[tuple[int, str | dict[str, Any]]]) -> None:
+        rows = []
+        for line, record in batch:
+            try:
+                rows.append((line, self.decode_row(record)))
+            except (TypeError, ValueError) as error:
+                self.skip(line, error)
+        with transaction.atomic():
+            recipes = self.build_recipes(rows)
+            # auto_now_add overwrites created_at on insert
+            created_at = [recipe.created_at for recipe in recipes]
+            # bulk_create skips Recipe.save and its signals, keep the search
+            # index in step here
+            created = Recipe.objects.bulk_create(recipes)
+            search.index_recipes(created)
+            dated = []
+            for recipe, value in zip(created, created_at, strict=True):
+                if value is not None:
+                    recipe.created_at = value
+                    dated.append(recipe)
+            Recipe.objects.bulk_update(dated, ["created_at"])
+        self.imported += len(created)
+        self.published += sum(recipe.is_published for recipe in created)
+        self.published_categories.update(
+            recipe.category_id for recipe in created
+            if recipe.is_published and recipe.category_id is not None
+        )
+        if self.verbosity >= 2:
+            elapsed = time.perf_counter() - self.start
+            self.stdout.write(
+                f"{self.imported} recipes ({self.rate(elapsed):.0f} recipes/s)",
+            )
+
+    def build_recipes(self, rows: list[tuple[int, dict[str, Any]]]) -> list[Recipe]:
+        self.resolve_authors(row.get("author") for _, row in rows)
+        recipes = []
+        categories = []
+        for line, row in rows:
+            try:
+                recipes.append(self.build_recipe(row))
+            except (KeyError, TypeError, ValueError) as error:
+                self.skip(line, error)
+            else:
+                categories.append(row.get("category") or "")
+        # Only once validated, skipped rows must not leave categories behind
+        self.resolve_categories(categories)
+        for recipe, category in zip(recipes, categories, strict=True):
+            recipe.category_id = self.categories.get(category)
+        # Exported slugs come back as they were unless taken
+        slugs = self.slugs.keep_or_allocate(
+            (recipe.slug for recipe in recipes), (recipe.title for recipe in recipes),
+        )
+        for recipe, slug in zip(recipes, slugs, strict=True):
+            recipe.slug = slug
+        return recipes
+
+    def resolve_authors(self, usernames: Any) -> None:  # noqa: ANN401
+        missing = {name for name in usernames if name and name not in self.authors}
+        if not missing:
+            return
+        found = dict(
+            User.objects.filter(username__in=missing).values_list("username", "id"),
+        )
+        for name in missing:
+            # Unknown authors import as authorless, like a deleted user would
+            self.authors[name] = found.get(name)
+
+    def resolve_categories(self, names: Any) -> None:  # noqa: ANN401
+        missing = {name for name in names if name and name not in self.categories}
+        if not missing:
+            return
+        created = Category.objects.bulk_create(
+            [Category(name=name) for name in sorted(missing)],
+        )
+        self.categories.update((category.name, category.pk) for category in created)
+
+    def decode_row(self, record: str | dict[str, Any]) -> dict[str, Any]:
+        row = decode_record(record)
+        for field in TEXT_FIELDS:
+            value = row.get(field)
+            if value is not None and not isinstance(value, str):
+                msg = f"{field} must be text, got {type(value).__name__}"
+                raise TypeError(msg)
+        return row
+
+    def build_recipe(self, row: dict[str, Any]) -> Recipe:
+        preparation_time_unit = row.get("preparation_time_unit") or "Minutos"
+        servings_unit = row.get("servings_unit") or "Porções"
+        if preparation_time_unit not in PREPARATION_TIME_UNITS:
+            msg = f"invalid preparation_time_unit {preparation_time_unit!r}"
+            raise ValueError(msg)
+        if servings_unit not in SERVINGS_UNITS:
+            msg = f"invalid servings_unit {servings_unit!r}"
+            raise ValueError(msg)
+        title = (row.get("title") or "").strip()
+        if not title:
+            msg = "empty title"
+            raise ValueError(msg)
+        created_at = self.parse_created_at(row.get("created_at"))
+        recipe = Recipe(
+            title=title[:65],
+            slug=row.get("slug") or "",
+            description=(row.get("description") or "")[:165],
+            preparation_time=int(row["preparation_time"]),
+            preparation_time_unit=preparation_time_unit,
+            servings=int(row["servings"]),
+            servings_unit=servings_unit,
+            preparation_steps=row.get("preparation_steps") or "",
+            preparation_steps_is_html=as_bool(row.get("preparation_steps_is_html")),
+            is_published=as_bool(row.get("is_published")),
+            cover=row.get("cover") or "",
+            author_id=self.authors.get(row.get("author") or ""),
+        )
+        if created_at is not None:
+            recipe.created_at = created_at
+        return recipe
+
+    def parse_created_at(self, value: str | None) -> datetime | None:
+        if not value:
+            return None
+        created_at = parse_datetime(value)
+        if created_at is None:
+            msg = f"invalid created_at {value!r}"
+            raise ValueError(msg)
+        if timezone.is_naive(created_at):
+            created_at = timezone.make_aware(created_at)
+        return created_at
@@ -0,0 +1,16 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from recipes.cache import get_page_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Shows hit and miss counters of the public page cache."
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        stats = get_page_cache_stats()
+        self.stdout.write(
+            f"hits={stats['hits']} misses={stats['misses']} "
+            f"hit_ratio={stats['hit_ratio']:.2%}",
+        )
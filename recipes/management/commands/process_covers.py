@@ -0,0 +1,73 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from recipes.covers import process_cover, schedule_covers_processing
+from recipes.images import variants_are_current
+from recipes.models import Recipe
+
+
+class Command(BaseCommand):
+    help = (
+        "Renders the missing or stale cover variants, e.g. for covers uploaded "
+        "before variants existed or loaded with bulk inserts."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--force", action="store_true", help="Render current variants again.",
+        )
+        parser.add_argument("--workers", type=int, default=1,
+                            help="Threads rendering covers in this process.")
+        parser.add_argument(
+            "--enqueue", action="store_true",
+            help="Leave the rendering to run_workers instead.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        force = options["force"]
+        # Only ids are kept, the images are read one recipe at a time
+        pending = [
+            recipe_id
+            for recipe_id, cover, cover_variants in Recipe.objects.order_by("id")
+            .values_list("id", "cover", "cover_variants")
+            .iterator(chunk_size=options["chunk_size"])
+            if force or not variants_are_current(cover_variants, cover)
+        ]
+        if options["enqueue"]:
+            queued = schedule_covers_processing(pending)
+            self.stdout.write(self.style.SUCCESS(f"Enqueued {queued} covers."))
+            return
+
+        start = time.perf_counter()
+        if options["workers"] <= 1:
+            results = [self.process(recipe_id, force=force) for recipe_id in pending]
+        else:
+            with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+                results = list(executor.map(
+                    lambda recipe_id: self.process_in_worker(recipe_id, force=force),
+                    pending,
+                ))
+        elapsed = time.perf_counter() - start
+        processed = sum(results)
+        self.stdout.write(self.style.SUCCESS(
+            f"Processed {processed} of {len(pending)} covers in {elapsed:.2f}s "
+            f"({processed / elapsed if elapsed else 0:.1f} covers/s).",
+        ))
+
+    def process(self, recipe_id: int, *, force: bool) -> bool:
+        try:
+            return process_cover(recipe_id, force=force)
+        except Exception as error:  # noqa: BLE001
+            self.stderr.write(f"Recipe {recipe_id} failed: {error!r}")
+            return False
+
+    def process_in_worker(self, recipe_id: int, *, force: bool) -> bool:
+        try:
+            return self.process(recipe_id, force=force)
+        finally:
+            close_old_connections()
@@ -0,0 +1,18 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from recipes.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the recipe full-text search index in bulk."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--database", default="default", help="Database alias to rebuild.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        total = rebuild_search_index(using=options["database"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} recipes."))
@@ -0,0 +1,19 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from recipes.counts import refresh_category_counts
+from recipes.signals import invalidate_public_caches
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the denormalized published recipe counts of every "
+        "category, e.g. after raw SQL writes. Run it periodically to repair "
+        "the drift of concurrent edits."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        total = refresh_category_counts()
+        invalidate_public_caches()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {total} categories."))
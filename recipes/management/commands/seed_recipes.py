@@ -0,0 +1,182 @@
+import multiprocessing
+import os
+import time
+from collections.abc import Iterator
+from io import BytesIO
+from typing import Any
+
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from PIL import Image, ImageDraw
+
+from recipes import search
+from recipes.counts import refresh_category_counts
+from recipes.factories import (
+    RecipeChunk,
+    build_author,
+    build_category,
+    build_recipe,
+    fake_author_fields,
+    fake_category_names,
+    fake_recipe_chunk,
+    make_faker,
+)
+from recipes.models import Category, Recipe, User
+from recipes.signals import invalidate_public_caches
+from utils.slugs import SlugAllocator
+
+COVER_DIRECTORY = "recipes/covers/seed"
+COVER_SIZE = (1280, 720)
+# Keeps ``username IN (...)`` lookups under SQLite's parameter limit
+LOOKUP_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills the database with fake recipes, authors and categories. The "
+        "same --seed always generates the same data, however many workers."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--count", type=int, default=1000, help="Recipes.")
+        parser.add_argument("--authors", type=int, default=None,
+                            help="Default: one per 50 recipes.")
+        parser.add_argument("--categories", type=int, default=12)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="Processes generating data, 1 runs inline.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--covers", type=int, default=0,
+                            help="Placeholder cover images to share among recipes.")
+        parser.add_argument("--published-ratio", type=float, default=0.9)
+        parser.add_argument("--password", default="seed-password",
+                            help="Password of every seeded author.")
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        count, seed = options["count"], options["seed"]
+        if count < 0 or options["categories"] < 1 or options["batch_size"] < 1:
+            msg = "--count, --categories and --batch-size must be positive."
+            raise CommandError(msg)
+        self.verbosity = options["verbosity"]
+        start = time.perf_counter()
+
+        authors = options["authors"] or max(1, count // 50)
+        author_ids = self.seed_authors(seed, authors, options["password"])
+        category_ids = self.seed_categories(options["categories"])
+        covers = self.seed_covers(seed, options["covers"])
+        chunks = [
+            RecipeChunk(
+                seed=seed, number=number, size=min(options["batch_size"], remaining),
+                authors=authors, categories=len(category_ids), covers=len(covers),
+                published_ratio=options["published_ratio"],
+            )
+            for number, remaining in enumerate(
+                range(count, 0, -options["batch_size"]),
+            )
+        ]
+
+        slugs = SlugAllocator(Recipe.objects.all())
+        created = published = 0
+        for rows in self.generate(chunks, options["workers"]):
+            recipes = []
+            for row in rows:
+                author, category, cover = (
+                    row.pop("author"), row.pop("category"), row.pop("cover"),
+                )
+                recipes.append(build_recipe(
+                    **row,
+                    author_id=author_ids[author],
+                    category_id=category_ids[category],
+                    cover="" if cover is None else covers[cover],
+                ))
+            for recipe, slug in zip(
+                recipes, slugs.allocate(r.title for r in recipes), strict=True,
+            ):
+                recipe.slug = slug
+            with transaction.atomic():
+                # bulk_create skips Recipe.save and its signals
+                batch = Recipe.objects.bulk_create(recipes)
+                search.index_recipes(batch)
+            created += len(batch)
+            published += sum(recipe.is_published for recipe in batch)
+            if self.verbosity >= 2:
+                self.stdout.write(f"{created}/{count} recipes")
+
+        if published:
+            # bulk_create skipped the signals that keep these up to date
+            refresh_category_counts(set(category_ids))
+            invalidate_public_caches()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {created} recipes, {authors} authors and "
+            f"{len(category_ids)} categories in {elapsed:.2f}s "
+            f"({created / elapsed if elapsed else 0:.0f} recipes/s).",
+        ))
+
+    def generate(
+        self, chunks: list[RecipeChunk], workers: int,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Yields the chunks in order while workers build the ones after them."""
+        if workers <= 1 or len(chunks) <= 1:
+            yield from map(fake_recipe_chunk, chunks)
+            return
+        # Workers only run Faker and never touch the database, forking them
+        # from a configured Django process spares each one its own setup
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        with context.Pool(min(workers, len(chunks))) as pool:
+            yield from pool.imap(fake_recipe_chunk, chunks)
+
+    def seed_authors(self, seed: int, count: int, password: str) -> list[int]:
+        faker = make_faker(seed, -1)
+        # One hash for everyone, hashing is slow on purpose
+        password_hash = make_password(password)
+        authors = [
+            build_author(password_hash=password_hash, **fake_author_fields(faker, i))
+            for i in range(count)
+        ]
+        # Reseeding with the same seed reuses the authors created last time
+        User.objects.bulk_create(
+            authors, batch_size=LOOKUP_BATCH_SIZE, ignore_conflicts=True,
+        )
+        usernames = [author.username for author in authors]
+        ids: dict[str, int] = {}
+        for start in range(0, len(usernames), LOOKUP_BATCH_SIZE):
+            ids.update(User.objects.filter(
+                username__in=usernames[start:start + LOOKUP_BATCH_SIZE],
+            ).values_list("username", "id"))
+        return [ids[username] for username in usernames]
+
+    def seed_categories(self, count: int) -> list[int]:
+        names = fake_category_names(count)
+        ids = dict(Category.objects.filter(name__in=names).values_list("name", "id"))
+        missing = [build_category(name) for name in names if name not in ids]
+        ids.update(
+            (category.name, category.pk)
+            for category in Category.objects.bulk_create(missing)
+        )
+        return [ids[name] for name in names]
+
+    def seed_covers(self, seed: int, count: int) -> list[str]:
+        faker = make_faker(seed, -2)
+        covers = []
+        for index in range(count):
+            color = faker.color_rgb()
+            name = f"{COVER_DIRECTORY}/seed-{seed}-{index}.jpg"
+            if not default_storage.exists(name):
+                name = default_storage.save(name, ContentFile(
+                    placeholder_cover(color, f"#{index}"),
+                ))
+            covers.append(name)
+        return covers
+
+
+def placeholder_cover(color: tuple[int, int, int], label: str) -> bytes:
+    image = Image.new("RGB", COVER_SIZE, color)
+    ImageDraw.Draw(image).text((40, 40), label, fill=(255, 255, 255))
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=80)
+    return buffer.getvalue()
@@ -0,0 +1,31 @@
+from pathlib import Path
+from typing import Any
+from urllib.error import URLError
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.vendor import VENDOR_STYLESHEETS, vendor_stylesheet
+
+
+class Command(BaseCommand):
+    help = (
+        "Downloads the vendored stylesheets and fonts into base_static/vendor, "
+        "commit them afterwards. collectstatic bundles and hashes them with the "
+        "project's own files."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        root = Path(settings.BASE_DIR) / "base_static"
+        written = 0
+        for stylesheet in VENDOR_STYLESHEETS:
+            try:
+                names = vendor_stylesheet(stylesheet, root)
+            except (URLError, ValueError) as exc:
+                msg = f"{stylesheet.url}: {exc}"
+                raise CommandError(msg) from exc
+            written += len(names)
+            if options["verbosity"] >= 2:
+                for name in names:
+                    self.stdout.write(f"  {name}")
+        self.stdout.write(self.style.SUCCESS(f"Vendored {written} files."))
@@ -0,0 +1,30 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.templates import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        "Compiles every project template. Workers warm their own cache at boot "
+        "(WARM_TEMPLATES_AT_BOOT), run this in CI or before a deploy to catch "
+        "templates that don't compile."
+    )
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        start = time.perf_counter()
+        report = warm_templates()
+        elapsed = (time.perf_counter() - start) * 1000
+        if options["verbosity"] >= 2:
+            for name in report.compiled:
+                self.stdout.write(f"  {name}")
+        for name, error in report.errors.items():
+            self.stderr.write(f"{name}: {error}")
+        if report.errors:
+            msg = f"{len(report.errors)} templates failed to compile."
+            raise CommandError(msg)
+        self.stdout.write(self.style.SUCCESS(
+            f"Compiled {len(report.compiled)} templates in {elapsed:.1f} ms.",
+        ))
@@ -0,0 +1,55 @@
+from django.db import migrations
+
+# The SQL is spelled out here, not imported from recipes.search, so later
+# changes to the app can't change what this migration does
+FTS_TABLE = "recipes_recipe_fts"
+GIN_INDEX_NAME = "recipe_search_gin_idx"
+
+
+def forwards(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE INDEX "{GIN_INDEX_NAME}" ON "recipes_recipe" USING gin (('
+                "setweight(to_tsvector('simple'::regconfig, "
+                "COALESCE(title, '')), 'A') || "
+                "setweight(to_tsvector('simple'::regconfig, "
+                "COALESCE(description, '')), 'B') || "
+                "setweight(to_tsvector('simple'::regconfig, "
+                "COALESCE(preparation_steps, '')), 'C')))",
+            )
+    elif connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                "title, description, preparation_steps, "
+                "tokenize = 'unicode61 remove_diacritics 2')",
+            )
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, description, "
+                "preparation_steps) "
+                "SELECT id, title, description, preparation_steps FROM recipes_recipe",
+            )
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+
+
+def backwards(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP INDEX IF EXISTS {GIN_INDEX_NAME}")
+    elif connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0006_alter_recipe_slug"),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:56
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_counts(apps, schema_editor):
+    Category = apps.get_model("recipes", "Category")
+    Recipe = apps.get_model("recipes", "Recipe")
+    published = Recipe.objects.filter(is_published=True, category=OuterRef("pk"))
+    Category.objects.update(
+        published_recipe_count=Coalesce(Subquery(
+            published.order_by().values("category")
+            .annotate(total=Count("pk")).values("total"),
+        ), 0),
+        latest_recipe_at=Subquery(
+            published.order_by("-created_at").values("created_at")[:1],
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0009_recipe_cover_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='latest_recipe_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='published_recipe_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
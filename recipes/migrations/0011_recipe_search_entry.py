@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("recipes", "0010_category_published_recipe_count"),
+    ]
+
+    operations = [
+        # The FTS5 table of 0007, mapped so searches can join it
+        migrations.CreateModel(
+            name="RecipeSearchEntry",
+            fields=[
+                ("recipe", models.OneToOneField(
+                    db_column="rowid", db_constraint=False,
+                    on_delete=django.db.models.deletion.DO_NOTHING,
+                    primary_key=True, related_name="search_entry",
+                    serialize=False, to="recipes.recipe",
+                )),
+                ("document", models.TextField(db_column="recipes_recipe_fts")),
+            ],
+            options={
+                "db_table": "recipes_recipe_fts",
+                "managed": False,
+            },
+        ),
+    ]
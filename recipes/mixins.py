@@ -0,0 +1,285 @@
+from collections.abc import Awaitable
+from datetime import datetime
+from typing import Any, Final, cast
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http.request import HttpRequest
+from django.http.response import HttpResponseBase
+from django.template.response import SimpleTemplateResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views import View
+
+from recipes.cache import (
+    aget_recipes_version,
+    arecord_page_cache,
+    get_recipes_version,
+    make_recipes_key,
+    record_page_cache,
+)
+from utils.db import may_cache_reads, read_from_replicas
+
+# Only these query parameters change what a public page renders, fields
+# selects what the JSON API returns
+PAGE_CACHE_QUERY_PARAMS: Final[tuple[str, ...]] = ("page", "cursor", "q", "fields")
+# What View.dispatch returns on async views
+AsyncResponse = Awaitable[HttpResponseBase]
+
+
+def page_query(request: HttpRequest) -> tuple[tuple[str, str], ...]:
+    """The query parameters of ``request`` that change what a page renders."""
+    return tuple(
+        (name, request.GET.get(name, ""))
+        for name in PAGE_CACHE_QUERY_PARAMS
+        if name in request.GET
+    )
+
+
+class ReplicaReadMixin(View):
+    """
+    Reads from the database replicas for the whole request, templates
+    included. Only for pages that can show data a few seconds old, clients
+    that just wrote are kept on the primary (see ``utils.db``).
+    """
+
+    def dispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any,  # noqa: ANN401
+    ) -> HttpResponseBase:
+        if request.method in ("GET", "HEAD"):
+            read_from_replicas()
+        return super().dispatch(request, *args, **kwargs)
+
+
+class PageCacheMixin(View):
+    """
+    Caches whole rendered responses for anonymous GET requests.
+
+    Keys embed the recipes version (see ``recipes.cache``), so publishing,
+    unpublishing, editing or deleting a published recipe invalidates them.
+    Pages read from a replica aren't stored, see ``utils.db.may_cache_reads``.
+    Every response gets an ``X-Page-Cache`` header of hit, miss or bypass.
+    Async views use the ``a``-prefixed hooks.
+    """
+
+    def get_page_cache_version(self) -> int:
+        return get_recipes_version()
+
+    async def aget_page_cache_version(self) -> int:
+        return await aget_recipes_version()
+
+    def can_use_page_cache(self, request: HttpRequest) -> bool:
+        if request.method not in ("GET", "HEAD"):
+            return False
+        if request.user.is_authenticated:
+            return False
+        # Pending messages are rendered once and must not end up in the cache
+        return not len(get_messages(request))
+
+    async def acan_use_page_cache(self, request: HttpRequest) -> bool:
+        if request.method not in ("GET", "HEAD"):
+            return False
+        if (await request.auser()).is_authenticated:
+            return False
+        return not len(get_messages(request))
+
+    def get_page_cache_key(self, request: HttpRequest, version: int) -> str:
+        return make_recipes_key(
+            "page", type(self).__name__, request.path, page_query(request),
+            version=version,
+        )
+
+    def dispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any,  # noqa: ANN401
+    ) -> HttpResponseBase:
+        if self.view_is_async:
+            return self._page_cache_adispatch(request, *args, **kwargs)
+        if not self.can_use_page_cache(request):
+            response = super().dispatch(request, *args, **kwargs)
+            response["X-Page-Cache"] = "bypass"
+            return response
+
+        key = self.get_page_cache_key(request, self.get_page_cache_version())
+        cached_response = cache.get(key)
+        record_page_cache(hit=cached_response is not None)
+        if cached_response is not None:
+            return self.serve_cached_page(request, cached_response)
+
+        response = super().dispatch(request, *args, **kwargs)
+        response["X-Page-Cache"] = "miss"
+        if self.should_store_page(response):
+            if isinstance(response, SimpleTemplateResponse):
+                response.add_post_render_callback(
+                    lambda rendered: self.store_page(key, rendered),
+                )
+            else:
+                self.store_page(key, response)
+        return response
+
+    async def _page_cache_adispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any,  # noqa: ANN401
+    ) -> HttpResponseBase:
+        if not await self.acan_use_page_cache(request):
+            response = await cast(
+            "AsyncResponse", super().dispatch(request, *args, **kwargs),
+        )
+            response["X-Page-Cache"] = "bypass"
+            return response
+
+        key = self.get_page_cache_key(request, await self.aget_page_cache_version())
+        cached_response = await cache.aget(key)
+        await arecord_page_cache(hit=cached_response is not None)
+        if cached_response is not None:
+            return self.serve_cached_page(request, cached_response)
+
+        response = await cast(
+            "AsyncResponse", super().dispatch(request, *args, **kwargs),
+        )
+        response["X-Page-Cache"] = "miss"
+        if self.should_store_page(response):
+            if isinstance(response, SimpleTemplateResponse):
+                # Templates render in a worker thread, where blocking is fine
+                response.add_post_render_callback(
+                    lambda rendered: self.store_page(key, rendered),
+                )
+            elif may_cache_reads():
+                await cache.aset(key, response, settings.PAGE_CACHE_TIMEOUT)
+        return response
+
+    def serve_cached_page(
+        self, request: HttpRequest, cached_response: HttpResponseBase,
+    ) -> HttpResponseBase:
+        cached_response["X-Page-Cache"] = "hit"
+        # Revalidate against the stored validators without touching the DB
+        return get_conditional_response(
+            request,
+            etag=cached_response.get("ETag"),
+            last_modified=parse_http_date_safe(
+                cached_response.get("Last-Modified", ""),
+            ),
+            response=cached_response,
+        ) or cached_response
+
+    def should_store_page(self, response: HttpResponseBase) -> bool:
+        return response.status_code == 200 and not response.cookies
+
+    def store_page(self, key: str, response: HttpResponseBase) -> None:
+        # Checked once rendered, templates read too
+        if may_cache_reads():
+            cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+
+
+class ConditionalGetMixin(View):
+    """
+    Adds ``ETag``/``Last-Modified`` to successful responses and answers
+    ``If-None-Match``/``If-Modified-Since`` with a 304 before rendering.
+
+    Conditional requests pay for one cheap ``get_last_modified`` lookup ahead
+    of the main queryset. Plain requests skip it and take the validators from
+    what was rendered (``rendered_last_modified``), so they cost no extra query.
+    Async views use ``aget_last_modified``/``aget_etag``, which run the sync
+    hooks in a thread unless overridden.
+
+    Pages that change without any shown row moving its date forward, like a
+    list losing a deleted recipe, turn ``send_last_modified`` off: the date
+    still goes into the ETag, but is neither sent nor compared with
+    ``If-Modified-Since``, which would answer a stale 304.
+    """
+
+    rendered_last_modified: datetime | None = None
+    send_last_modified: bool = True
+
+    def get_last_modified(self) -> datetime | None:
+        return None
+
+    def get_etag(self, last_modified: datetime | None) -> str | None:
+        return None
+
+    async def aget_last_modified(self) -> datetime | None:
+        return await sync_to_async(self.get_last_modified)()
+
+    def sent_last_modified(self, last_modified: datetime | None) -> datetime | None:
+        return last_modified if self.send_last_modified else None
+
+    async def aget_etag(self, last_modified: datetime | None) -> str | None:
+        return await sync_to_async(self.get_etag)(last_modified)
+
+    def dispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any,  # noqa: ANN401
+    ) -> HttpResponseBase:
+        if self.view_is_async:
+            return self._conditional_adispatch(request, *args, **kwargs)
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+
+        is_conditional = _is_conditional(request)
+        if is_conditional:
+            last_modified = self.get_last_modified()
+            etag = self.get_etag(last_modified)
+            not_modified = get_conditional_response(
+                request, etag=etag,
+                last_modified=_timestamp(self.sent_last_modified(last_modified)),
+            )
+            if not_modified is not None:
+                return not_modified
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        if not is_conditional:
+            last_modified = self.rendered_last_modified
+            etag = self.get_etag(last_modified)
+        _set_validators(response, etag, self.sent_last_modified(last_modified))
+        return response
+
+    async def _conditional_adispatch(
+        self, request: HttpRequest, *args: Any, **kwargs: Any,  # noqa: ANN401
+    ) -> HttpResponseBase:
+        if request.method not in ("GET", "HEAD"):
+            return await cast(
+                "AsyncResponse", super().dispatch(request, *args, **kwargs),
+            )
+
+        is_conditional = _is_conditional(request)
+        if is_conditional:
+            last_modified = await self.aget_last_modified()
+            etag = await self.aget_etag(last_modified)
+            not_modified = get_conditional_response(
+                request, etag=etag,
+                last_modified=_timestamp(self.sent_last_modified(last_modified)),
+            )
+            if not_modified is not None:
+                return not_modified
+
+        response = await cast(
+            "AsyncResponse", super().dispatch(request, *args, **kwargs),
+        )
+        if response.status_code != 200:
+            return response
+        if not is_conditional:
+            last_modified = self.rendered_last_modified
+            etag = await self.aget_etag(last_modified)
+        _set_validators(response, etag, self.sent_last_modified(last_modified))
+        return response
+
+
+def _is_conditional(request: HttpRequest) -> bool:
+    return (
+        "HTTP_IF_NONE_MATCH" in request.META
+        or "HTTP_IF_MODIFIED_SINCE" in request.META
+    )
+
+
+def _set_validators(
+    response: HttpResponseBase, etag: str | None, last_modified: datetime | None,
+) -> None:
+    if etag and not response.has_header("ETag"):
+        response["ETag"] = etag
+    if last_modified and not response.has_header("Last-Modified"):
+        response["Last-Modified"] = http_date(_timestamp(last_modified))
+
+
+def _timestamp(value: datetime | None) -> int | None:
+    return int(value.timestamp()) if value else None
@@ -1,18 +1,63 @@
-import itertools
+from collections.abc import Collection
+from typing import Any, Self
 
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.urls import reverse
-from django.utils.text import slugify
+
+from recipes.images import CoverSources, cover_sources
+from recipes.search import FTS_TABLE, Match
+from utils.slugs import slug_base, unique_slug
+
+SLUG_SAVE_ATTEMPTS = 3
+SLUG_MAX_LENGTH = 50
 
 
 class Category(models.Model):
     name = models.CharField(max_length=65)
+    # Denormalized from the published recipes, see recipes.counts
+    published_recipe_count = models.PositiveIntegerField(default=0, editable=False)
+    latest_recipe_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     def __str__(self) -> str:
         return self.name
 
 
+class RecipeQuerySet(models.QuerySet["Recipe"]):
+    LISTING_FIELDS = (
+        "id",
+        "title",
+        "description",
+        "preparation_time",
+        "preparation_time_unit",
+        "servings",
+        "servings_unit",
+        "created_at",
+        "updated_at",
+        "cover",
+        "cover_variants",
+        "author__first_name",
+        "author__last_name",
+        "author__username",
+        "category__name",
+    )
+    DETAIL_FIELDS = (
+        *LISTING_FIELDS,
+        "preparation_steps",
+        "preparation_steps_is_html",
+    )
+
+    def published(self) -> "RecipeQuerySet":
+        return self.filter(is_published=True)
+
+    def for_listing(self) -> "RecipeQuerySet":
+        """Join author and category and load only what the recipe card renders."""
+        return self.select_related("author", "category").only(*self.LISTING_FIELDS)
+
+    def for_detail(self) -> "RecipeQuerySet":
+        return self.select_related("author", "category").only(*self.DETAIL_FIELDS)
+
+
 class Recipe(models.Model):
     SERVINGS_UNIT_CHOICES = (
         ("Porções", "Porções"),
@@ -26,7 +71,7 @@ class Recipe(models.Model):
     )
     title = models.CharField(max_length=65)
     description = models.CharField(max_length=165)
-    slug = models.SlugField(unique=True)
+    slug = models.SlugField(unique=True, max_length=SLUG_MAX_LENGTH)
     preparation_time = models.IntegerField()
     preparation_time_unit = models.CharField(
         max_length=65, choices=PREPARATION_TIME_UNIT_CHOICES,
@@ -40,24 +85,125 @@ class Recipe(models.Model):
     is_published = models.BooleanField(default=False)
     cover = models.ImageField(
         upload_to="recipes/covers/%Y/%m/%d", blank=True, default="")
+    # Resized copies of ``cover``, see recipes.images
+    cover_variants = models.JSONField(default=dict, blank=True, editable=False)
     category = models.ForeignKey(
         Category, on_delete=models.SET_NULL, null=True, blank=True, default=None,
     )
     author = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
 
+    objects = RecipeQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            # Home feed: WHERE is_published ORDER BY id DESC, and its COUNT(*)
+            models.Index(
+                models.F("id").desc(),
+                name="recipe_published_id_idx",
+                condition=models.Q(is_published=True),
+            ),
+            # Category pages: WHERE is_published AND category_id = ? ORDER BY id
+            models.Index(
+                "category", models.F("id").desc(),
+                name="recipe_published_cat_id_idx",
+                condition=models.Q(is_published=True),
+            ),
+            # Keyset pagination on (created_at, id)
+            models.Index(
+                models.F("created_at").desc(), models.F("id").desc(),
+                name="recipe_published_created_idx",
+                condition=models.Q(is_published=True),
+            ),
+            # Author dashboard: WHERE author_id = ? AND is_published = ?
+            models.Index(
+                fields=("author", "is_published"), name="recipe_author_published_idx",
+            ),
+        )
+
+    # Field values as last read from or written to the database, so signal
+    # handlers can tell what a save actually changed.
+    TRACKED_FIELDS = ("is_published", "category_id")
+
     def __str__(self) -> str:
         return self.title
 
     def save(self, *args, **kwargs) -> None: # noqa
-        if not self.slug:
-            base_slug = slugify(self.title)
-            slug = base_slug
-            for i in itertools.count(1):
-                if not Recipe.objects.filter(slug=slug).exists():
-                    break
-                slug = f"{base_slug}-{i}"
-            self.slug = slug
-        super().save(*args, **kwargs)
+        if self.slug:
+            super().save(*args, **kwargs)
+            return
+        base = slug_base(self.title, SLUG_MAX_LENGTH)
+        for attempt in range(1, SLUG_SAVE_ATTEMPTS + 1):
+            self.slug = unique_slug(Recipe.objects.all(), base)
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+            except IntegrityError:
+                # A concurrent save may have taken the same suffix meanwhile
+                if attempt == SLUG_SAVE_ATTEMPTS or not Recipe.objects.filter(
+                    slug=self.slug,
+                ).exists():
+                    self.slug = ""
+                    raise
+            else:
+                return
 
     def get_absolute_url(self) -> str:
         return reverse("recipes:recipe", kwargs={"pk": self.pk})
+
+    @classmethod
+    def from_db(
+        cls,
+        db: str | None,
+        field_names: Collection[str],
+        values: Collection[Any],
+        **kwargs: Any,  # noqa: ANN401
+    ) -> Self:
+        instance = super().from_db(db, field_names, values, **kwargs)
+        instance.remember_loaded_values()
+        return instance
+
+    def remember_loaded_values(self) -> None:
+        # Deferred fields are missing from __dict__ and stay unknown
+        self.loaded_values = {
+            field: self.__dict__[field]
+            for field in self.TRACKED_FIELDS
+            if field in self.__dict__
+        }
+
+    @property
+    def was_published(self) -> bool:
+        """Whether the stored row may be published, unknown counts as yes."""
+        if self._state.adding:
+            return False
+        loaded_values = getattr(self, "loaded_values", {})
+        return loaded_values.get("is_published", True)
+
+    @property
+    def cover_sources(self) -> CoverSources:
+        if not self.cover:
+            return CoverSources(src="")
+        return cover_sources(
+            self.cover.storage, self.cover_variants, self.cover.name, self.cover.url,
+        )
+
+
+class RecipeSearchEntry(models.Model):
+    """
+    A row of the SQLite FTS5 table ``recipes.search`` keeps in sync, joined
+    to its recipe on ``rowid``.
+    """
+
+    recipe = models.OneToOneField(
+        Recipe, on_delete=models.DO_NOTHING, primary_key=True, db_column="rowid",
+        db_constraint=False, related_name="search_entry",
+    )
+    # The hidden column named after the table, what MATCH and bm25() take
+    document = models.TextField(db_column=FTS_TABLE)
+    document.register_lookup(Match)
+
+    class Meta:
+        managed = False
+        db_table = FTS_TABLE
+
+    def __str__(self) -> str:
+        return str(self.pk)
@@ -0,0 +1,194 @@
+import re
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, Final
+
+from django.db import connections
+from django.db.models import F, FloatField, Func, Lookup, Q, Value
+from django.db.models.query import QuerySet
+from django.db.models.sql.compiler import SQLCompiler
+
+if TYPE_CHECKING:
+    from django.db.backends.base.base import BaseDatabaseWrapper
+
+    from recipes.models import Recipe
+
+FTS_TABLE: Final[str] = "recipes_recipe_fts"
+SEARCH_FIELDS: Final[tuple[str, ...]] = ("title", "description", "preparation_steps")
+# bm25() weights and PostgreSQL setweight() labels, in SEARCH_FIELDS order
+SEARCH_WEIGHTS: Final[tuple[float, ...]] = (10.0, 4.0, 1.0)
+SEARCH_LABELS: Final[tuple[str, ...]] = ("A", "B", "C")
+SEARCH_CONFIG: Final[str] = "simple"
+GIN_INDEX_NAME: Final[str] = "recipe_search_gin_idx"
+
+
+def search_terms(term: str) -> list[str]:
+    """
+    Splits user input into plain word tokens, dropping any query syntax.
+
+    >>> search_terms('  "Bolo" de <chocolate>* ')
+    ['Bolo', 'de', 'chocolate']
+    """
+    return re.findall(r"\w+", term)
+
+
+def search_vector():  # noqa: ANN201
+    """The tsvector expression queried and indexed (GIN) on PostgreSQL."""
+    from django.contrib.postgres.search import SearchVector
+
+    vectors = [
+        SearchVector(field, weight=label, config=SEARCH_CONFIG)
+        for field, label in zip(SEARCH_FIELDS, SEARCH_LABELS, strict=True)
+    ]
+    vector = vectors[0]
+    for other in vectors[1:]:
+        vector += other
+    return vector
+
+
+def search_recipes(queryset: QuerySet["Recipe"], term: str) -> QuerySet["Recipe"]:
+    """
+    Filters ``queryset`` down to recipes matching every word of ``term`` as a
+    prefix, ordered by relevance. Falls back to ``icontains`` on databases
+    without a full-text backend.
+    """
+    tokens = search_terms(term)
+    if not tokens:
+        return queryset.none()
+    vendor = connections[queryset.db].vendor
+    if vendor == "sqlite":
+        return _search_sqlite(queryset, tokens)
+    if vendor == "postgresql":
+        return _search_postgresql(queryset, tokens)
+    condition = Q()
+    for token in tokens:
+        condition &= Q(title__icontains=token) | Q(description__icontains=token)
+    return queryset.filter(condition)
+
+
+class Match(Lookup):
+    """``document MATCH query``, on the hidden column of an FTS5 table."""
+
+    lookup_name = "match"
+
+    def as_sql(
+        self, compiler: SQLCompiler, connection: "BaseDatabaseWrapper",
+    ) -> tuple[str, tuple[Any, ...]]:
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", (*lhs_params, *rhs_params)
+
+
+def _search_sqlite(
+    queryset: QuerySet["Recipe"], tokens: list[str],
+) -> QuerySet["Recipe"]:
+    # A join on rowid, FTS5 runs the MATCH once for the whole query
+    document = F("search_entry__document")
+    match = " ".join(f'"{token}"*' for token in tokens)
+    rank = Func(
+        document, *(Value(weight) for weight in SEARCH_WEIGHTS),
+        function="bm25", output_field=FloatField(),
+    )
+    # bm25() is negative, lower means more relevant
+    return (
+        queryset.filter(search_entry__document__match=match)
+        .annotate(search_rank=rank)
+        .order_by("search_rank", "-id")
+    )
+
+
+def _search_postgresql(
+    queryset: QuerySet["Recipe"], tokens: list[str],
+) -> QuerySet["Recipe"]:
+    from django.contrib.postgres.search import (
+        SearchQuery,
+        SearchRank,
+    )
+
+    vector = search_vector()
+    query = SearchQuery(
+        " & ".join(f"{token}:*" for token in tokens),
+        search_type="raw",
+        config=SEARCH_CONFIG,
+    )
+    return (
+        queryset.annotate(search_document=vector)
+        .filter(search_document=query)
+        .annotate(search_rank=SearchRank(vector, query))
+        .order_by("-search_rank", "-id")
+    )
+
+
+def create_search_index(connection: "BaseDatabaseWrapper") -> None:
+    if connection.vendor != "sqlite":
+        return
+    columns = ", ".join(SEARCH_FIELDS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{columns}, tokenize = 'unicode61 remove_diacritics 2')",
+        )
+
+
+def index_recipes(recipes: Iterable["Recipe"], using: str = "default") -> None:
+    """Upserts the searchable text of ``recipes`` into the SQLite FTS table."""
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        # PostgreSQL indexes the tsvector expression itself, nothing to sync
+        return
+    rows = [
+        (recipe.pk, *(getattr(recipe, field) for field in SEARCH_FIELDS))
+        for recipe in recipes
+    ]
+    if not rows:
+        return
+    placeholders = ", ".join(["%s"] * (len(SEARCH_FIELDS) + 1))
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",  # noqa: S608
+            [(row[0],) for row in rows],
+        )
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) "  # noqa: S608
+            f"VALUES ({placeholders})",
+            rows,
+        )
+
+
+def remove_recipes(recipe_ids: Iterable[int], using: str = "default") -> None:
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",  # noqa: S608
+            [(recipe_id,) for recipe_id in recipe_ids],
+        )
+
+
+def fill_search_index(connection: "BaseDatabaseWrapper", table: str) -> None:
+    """Replaces the SQLite FTS rows with the text currently in ``table``."""
+    columns = ", ".join(SEARCH_FIELDS)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")  # noqa: S608
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {columns}) "  # noqa: S608
+            f"SELECT id, {columns} FROM {table}",
+        )
+        # Merges the b-trees the insert left behind
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")  # noqa: S608
+
+
+def rebuild_search_index(using: str = "default") -> int:
+    """
+    Repopulates the whole index in one pass and returns the number of recipes.
+    """
+    from recipes.models import Recipe
+
+    connection = connections[using]
+    if connection.vendor == "sqlite":
+        create_search_index(connection)
+        fill_search_index(connection, Recipe._meta.db_table)  # noqa: SLF001
+    elif connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(f"REINDEX INDEX {GIN_INDEX_NAME}")
+    return Recipe.objects.using(using).count()
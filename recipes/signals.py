@@ -0,0 +1,135 @@
+from typing import Any, Final
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from recipes import search
+from recipes.cache import bump_recipe_versions, bump_recipes_version
+from recipes.counts import apply_category_deltas, placement_deltas, stored_placement
+from recipes.models import Category, Recipe, RecipeQuerySet
+
+# What the recipe pages show of their author
+AUTHOR_FIELDS: Final[frozenset[str]] = frozenset(
+    {"username", "first_name", "last_name"},
+)
+
+
+def invalidate_public_caches(recipe_id: int | None = None) -> None:
+    # Bump right away for readers in this transaction and again after commit,
+    # so a concurrent request can't re-cache data from before the write.
+    bump_recipes_version()
+    transaction.on_commit(bump_recipes_version)
+    if recipe_id is not None:
+        bump_recipes_version(recipe_id)
+        transaction.on_commit(lambda: bump_recipes_version(recipe_id))
+
+
+def invalidate_recipe_pages(recipes: RecipeQuerySet) -> None:
+    """
+    Invalidates the pages of the published ``recipes`` when something they
+    show besides their own row changes, like their category or author.
+    """
+    recipe_ids = list(recipes.published().values_list("pk", flat=True))
+    if recipe_ids:
+        invalidate_public_caches()
+        bump_recipe_versions(recipe_ids)
+        transaction.on_commit(lambda: bump_recipe_versions(recipe_ids))
+
+
+@receiver(pre_save, sender=Recipe, dispatch_uid="recipes_track_publication")
+def track_publication(instance: Recipe, **kwargs: Any) -> None:  # noqa: ANN401
+    # Read before the row is overwritten, the snapshot is refreshed post save
+    instance.affects_public_pages = instance.is_published or instance.was_published
+
+
+@receiver(post_save, sender=Recipe, dispatch_uid="recipes_invalidate_on_save")
+def invalidate_on_save(instance: Recipe, **kwargs: Any) -> None:  # noqa: ANN401
+    # Drafts that never were public don't show up on any cached page
+    if getattr(instance, "affects_public_pages", True):
+        invalidate_public_caches(instance.pk)
+    instance.remember_loaded_values()
+
+
+@receiver(post_delete, sender=Recipe, dispatch_uid="recipes_invalidate_on_delete")
+def invalidate_on_delete(instance: Recipe, **kwargs: Any) -> None:  # noqa: ANN401
+    if instance.was_published:
+        invalidate_public_caches(instance.pk)
+
+
+@receiver(pre_save, sender=Recipe, dispatch_uid="recipes_track_category_counts")
+def track_category_counts(instance: Recipe, **kwargs: Any) -> None:  # noqa: ANN401
+    instance.category_deltas = placement_deltas(
+        stored_placement(instance), (instance.category_id, instance.is_published),
+    )
+
+
+@receiver(post_save, sender=Recipe, dispatch_uid="recipes_count_on_save")
+def count_on_save(instance: Recipe, **kwargs: Any) -> None:  # noqa: ANN401
+    deltas = getattr(instance, "category_deltas", None)
+    if deltas:
+        apply_category_deltas(deltas, instance.created_at)
+    instance.category_deltas = None
+
+
+@receiver(
+    pre_delete, sender=Recipe, dispatch_uid="recipes_track_category_counts_on_delete",
+)
+def track_category_counts_on_delete(
+    instance: Recipe, **kwargs: Any,  # noqa: ANN401
+) -> None:
+    instance.category_deltas = placement_deltas(stored_placement(instance), None)
+    if instance.category_deltas:
+        # Read while the row still exists, in case the field was deferred
+        instance.deleted_created_at = instance.created_at
+
+
+@receiver(post_delete, sender=Recipe, dispatch_uid="recipes_count_on_delete")
+def count_on_delete(instance: Recipe, **kwargs: Any) -> None:  # noqa: ANN401
+    deltas = getattr(instance, "category_deltas", None)
+    if deltas:
+        apply_category_deltas(deltas, instance.deleted_created_at)
+
+
+@receiver(post_save, sender=Category, dispatch_uid="categories_invalidate_on_save")
+@receiver(
+    post_delete, sender=Category, dispatch_uid="categories_invalidate_on_delete",
+)
+def invalidate_on_category_change(**kwargs: Any) -> None:  # noqa: ANN401
+    invalidate_public_caches()
+
+
+@receiver(post_save, sender=Category, dispatch_uid="categories_invalidate_recipes")
+@receiver(
+    pre_delete, sender=Category, dispatch_uid="categories_invalidate_recipes_on_delete",
+)
+def invalidate_category_recipes(
+    instance: Category, **kwargs: Any,  # noqa: ANN401
+) -> None:
+    # Before a delete, while the recipes still point to the category
+    invalidate_recipe_pages(Recipe.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=User, dispatch_uid="authors_invalidate_recipes")
+def invalidate_on_author_save(
+    instance: User, update_fields: frozenset[str] | None, **kwargs: Any,  # noqa: ANN401
+) -> None:
+    # Logging in only saves last_login, which no page shows
+    if update_fields is None or update_fields & AUTHOR_FIELDS:
+        invalidate_recipe_pages(Recipe.objects.filter(author=instance))
+
+
+@receiver(pre_delete, sender=User, dispatch_uid="authors_invalidate_recipes_on_delete")
+def invalidate_on_author_delete(instance: User, **kwargs: Any) -> None:  # noqa: ANN401
+    invalidate_recipe_pages(Recipe.objects.filter(author=instance))
+
+
+@receiver(post_save, sender=Recipe, dispatch_uid="recipes_index_on_save")
+def index_recipe(instance: Recipe, using: str, **kwargs: Any) -> None:  # noqa: ANN401
+    search.index_recipes([instance], using=using)
+
+
+@receiver(post_delete, sender=Recipe, dispatch_uid="recipes_unindex_on_delete")
+def unindex_recipe(instance: Recipe, using: str, **kwargs: Any) -> None:  # noqa: ANN401
+    search.remove_recipes([instance.pk], using=using)
@@ -0,0 +1,200 @@
+"""
+sitemap.xml for search engines: an index, then a sitemap per block of
+``SITEMAP_PAGE_SIZE`` ids of each section, page 1 holding ids 1 to the size.
+
+Blocks are id ranges rather than offsets, so each sitemap is a seek on the
+primary key at any table size and a recipe never moves to another file. The
+XML is streamed from ``.iterator()``, holding a chunk of rows at a time, and
+the finished file is cached under the recipes version, which publishing,
+editing, unpublishing or deleting a published recipe bumps.
+"""
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Final
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Max, QuerySet
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.http.response import Http404, HttpResponseBase
+from django.urls import reverse
+from django.views import View
+
+from recipes.cache import make_recipes_key
+from recipes.mixins import ReplicaReadMixin
+from recipes.models import Category, Recipe
+from utils.db import may_cache_reads
+from utils.instrumentation import record_cache_lookup
+
+CONTENT_TYPE: Final[str] = "application/xml; charset=utf-8"
+ITERATOR_CHUNK_SIZE: Final[int] = 2000
+XML_HEADER: Final[str] = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SITEMAP_NS: Final[str] = "http://www.sitemaps.org/schemas/sitemap/0.9"
+# Stands in for the id while reversing, see location_template
+_ID_PLACEHOLDER: Final[int] = 987654321
+
+
+@dataclass(frozen=True)
+class SitemapSection:
+    viewname: str
+    id_kwarg: str
+    lastmod_field: str
+    get_queryset: Callable[[], QuerySet[Any]]
+
+
+SECTIONS: Final[dict[str, SitemapSection]] = {
+    "recipes": SitemapSection(
+        "recipes:recipe", "pk", "updated_at", lambda: Recipe.objects.published(),
+    ),
+    "categories": SitemapSection(
+        "recipes:category", "category_id", "latest_recipe_at",
+        lambda: Category.objects.filter(published_recipe_count__gt=0),
+    ),
+}
+
+
+def location_template(viewname: str, id_kwarg: str) -> str:
+    """
+    A ``str.format`` template of the URL path, reversing once per file
+    instead of once per row.
+
+    >>> location_template("recipes:recipe", "pk")
+    '/recipes/{}/'
+    """
+    path = reverse(viewname, kwargs={id_kwarg: _ID_PLACEHOLDER})
+    return path.replace(str(_ID_PLACEHOLDER), "{}")
+
+
+def format_lastmod(value: datetime | None) -> str:
+    return f"<lastmod>{value.isoformat(timespec='seconds')}</lastmod>" if value else ""
+
+
+def section_blocks(section: SitemapSection) -> list[tuple[int, datetime | None]]:
+    """The non-empty blocks of ``section`` and their newest ``lastmod``."""
+    rows = (
+        section.get_queryset()
+        .annotate(block=(F("id") - 1) / settings.SITEMAP_PAGE_SIZE)
+        .values("block")
+        .annotate(lastmod=Max(section.lastmod_field))
+        .order_by("block")
+    )
+    return [(row["block"], row["lastmod"]) for row in rows]
+
+
+def chunked(rows: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """
+    >>> list(chunked(range(5), 2))
+    [[0, 1], [2, 3], [4]]
+    """
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _store_when_done(key: str, parts: Iterator[str]) -> Iterator[str]:
+    streamed = []
+    for part in parts:
+        streamed.append(part)
+        yield part
+    # Only complete files, a client that disconnected closes this early
+    cache.set(key, "".join(streamed), settings.SITEMAP_CACHE_TIMEOUT)
+
+
+class SitemapViewBase(ReplicaReadMixin, View):
+    def get_cache_parts(self) -> tuple[Any, ...]:
+        raise NotImplementedError
+
+    def generate(self, base_url: str) -> Iterator[str]:
+        """Runs what can 404 right away and returns the XML chunks."""
+        raise NotImplementedError
+
+    def get(
+        self, request: HttpRequest, *args: Any, **kwargs: Any,  # noqa: ANN401
+    ) -> HttpResponseBase:
+        key = make_recipes_key("sitemap", *self.get_cache_parts())
+        xml = cache.get(key)
+        record_cache_lookup(hits=int(xml is not None), misses=int(xml is None))
+        if xml is not None:
+            return HttpResponse(xml, content_type=CONTENT_TYPE)
+        base_url = escape(request.build_absolute_uri("/").rstrip("/"))
+        parts = self.generate(base_url)
+        if may_cache_reads():
+            parts = _store_when_done(key, parts)
+        return StreamingHttpResponse(parts, content_type=CONTENT_TYPE)
+
+
+class SitemapIndex(SitemapViewBase):
+    def get_cache_parts(self) -> tuple[Any, ...]:
+        return ("index", self.request.get_host())
+
+    def generate(self, base_url: str) -> Iterator[str]:
+        entries = [
+            (
+                reverse(
+                    "recipes:sitemap_section",
+                    kwargs={"section": name, "page": block + 1},
+                ),
+                lastmod,
+            )
+            for name, section in SECTIONS.items()
+            for block, lastmod in section_blocks(section)
+        ]
+        return self.render(base_url, entries)
+
+    def render(
+        self, base_url: str, entries: list[tuple[str, datetime | None]],
+    ) -> Iterator[str]:
+        yield f'{XML_HEADER}<sitemapindex xmlns="{SITEMAP_NS}">\n'
+        for path, lastmod in entries:
+            yield (
+                f"<sitemap><loc>{base_url}{path}</loc>{format_lastmod(lastmod)}"
+                "</sitemap>\n"
+            )
+        yield "</sitemapindex>\n"
+
+
+class SitemapSectionView(SitemapViewBase):
+    @property
+    def section(self) -> SitemapSection:
+        try:
+            return SECTIONS[self.kwargs["section"]]
+        except KeyError:
+            raise Http404 from None
+
+    def get_cache_parts(self) -> tuple[Any, ...]:
+        return (self.kwargs["section"], self.kwargs["page"], self.request.get_host())
+
+    def generate(self, base_url: str) -> Iterator[str]:
+        section = self.section
+        start = (self.kwargs["page"] - 1) * settings.SITEMAP_PAGE_SIZE
+        block = section.get_queryset().filter(
+            id__gt=start, id__lte=start + settings.SITEMAP_PAGE_SIZE,
+        )
+        if self.kwargs["page"] < 1 or not block.exists():
+            raise Http404
+        rows = (
+            block.order_by("id")
+            .values_list("id", section.lastmod_field)
+            .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+        )
+        location = base_url + location_template(section.viewname, section.id_kwarg)
+        return self.render(location, rows)
+
+    def render(
+        self, location: str, rows: Iterator[tuple[int, datetime | None]],
+    ) -> Iterator[str]:
+        yield f'{XML_HEADER}<urlset xmlns="{SITEMAP_NS}">\n'
+        for chunk in chunked(rows, ITERATOR_CHUNK_SIZE):
+            yield "".join(
+                f"<url><loc>{location.format(pk)}</loc>"
+                f"{format_lastmod(lastmod)}</url>\n"
+                for pk, lastmod in chunk
+            )
+        yield "</urlset>\n"
@@ -0,0 +1,8 @@
+"""Background tasks of the recipes app, see tasks.queue."""
+from recipes import covers
+from tasks.queue import task
+
+
+@task(name=covers.PROCESS_COVER_TASK, max_attempts=covers.PROCESS_COVER_ATTEMPTS)
+def process_cover(recipe_id: int) -> None:
+    covers.process_cover(recipe_id)
@@ -0,0 +1,73 @@
+"""
+Renders recipe cards through a fragment cache.
+
+``{% recipe_cards recipes as cards %}`` looks every card of a page up with a
+single ``cache.get_many`` and only renders the misses, which are then stored
+with one ``cache.set_many``. A card's key changes whenever anything it shows
+changes: the recipe's ``updated_at`` moves on every save and cover update,
+and the category and author names are part of the key too.
+"""
+from collections.abc import Iterable
+from typing import Final
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import get_template
+from django.utils.safestring import SafeString, mark_safe
+
+from recipes.cache import make_recipes_key
+from recipes.models import Recipe
+from utils.instrumentation import record_cache_lookup
+
+CARD_TEMPLATE: Final[str] = "recipes/partials/recipe.html"
+# Bump when the card template changes to drop every cached card at once
+CARD_CACHE_VERSION: Final[int] = 1
+
+register = template.Library()
+
+
+def card_cache_key(recipe: Recipe, *, is_detail_page: bool) -> str:
+    author, category = recipe.author, recipe.category
+    return make_recipes_key(
+        "card", recipe.pk, recipe.updated_at, is_detail_page,
+        category.name if category else None,
+        (author.first_name, author.last_name, author.username) if author else None,
+        version=CARD_CACHE_VERSION,
+    )
+
+
+def render_cards(
+    recipes: Iterable[Recipe], *, is_detail_page: bool = False,
+) -> list[SafeString]:
+    recipes = list(recipes)
+    keys = [card_cache_key(recipe, is_detail_page=is_detail_page) for recipe in recipes]
+    cached = cache.get_many(keys)
+    record_cache_lookup(hits=len(cached), misses=len(keys) - len(cached))
+    missing = {}
+    card_template = None
+    cards = []
+    for key, recipe in zip(keys, recipes, strict=True):
+        card = cached.get(key)
+        if card is None:
+            card_template = card_template or get_template(CARD_TEMPLATE)
+            card = card_template.render(
+                {"recipe": recipe, "is_detail_page": is_detail_page},
+            )
+            missing[key] = card
+        cards.append(mark_safe(card))  # noqa: S308
+    if missing:
+        cache.set_many(missing, settings.CARD_CACHE_TIMEOUT)
+    return cards
+
+
+@register.simple_tag(takes_context=True)
+def recipe_cards(
+    context: template.Context, recipes: Iterable[Recipe],
+) -> list[SafeString]:
+    return render_cards(recipes, is_detail_page=bool(context.get("is_detail_page")))
+
+
+@register.simple_tag(takes_context=True)
+def recipe_card(context: template.Context, recipe: Recipe) -> SafeString:
+    return render_cards([recipe], is_detail_page=bool(context.get("is_detail_page")))[0]
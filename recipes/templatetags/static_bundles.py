@@ -0,0 +1,44 @@
+"""
+``{% static_bundle "global/css/site.css" %}`` links a ``STATIC_BUNDLES``
+entry: the one minified file ``collectstatic`` built in production, its
+sources one by one everywhere else.
+
+``{% vendor_stylesheets %}`` links the third party stylesheets from their
+CDNs until ``manage.py vendor_assets`` has stored them for the bundle.
+"""
+from django import template
+from django.conf import settings
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import SafeString
+
+from utils.staticfiles import bundle_urls
+from utils.vendor import VENDOR_STYLESHEETS, VendorStylesheet
+
+register = template.Library()
+
+
+@register.simple_tag
+def static_bundle(name: str) -> SafeString:
+    if name.endswith(".css"):
+        tag = '<link rel="stylesheet" href="{}">'
+    else:
+        # The site's scripts are modules, deferred until the page is parsed
+        tag = '<script type="module" src="{}"></script>'
+    return format_html_join("\n", tag, ((url,) for url in bundle_urls(name)))
+
+
+@register.simple_tag
+def vendor_stylesheets() -> SafeString:
+    if settings.VENDOR_ASSETS:
+        return SafeString()
+    return SafeString("\n".join(map(cdn_link, VENDOR_STYLESHEETS)))
+
+
+def cdn_link(stylesheet: VendorStylesheet) -> SafeString:
+    if not stylesheet.integrity:
+        return format_html('<link rel="stylesheet" href="{}">', stylesheet.url)
+    return format_html(
+        '<link rel="stylesheet" href="{}" integrity="{}" crossorigin="anonymous"'
+        ' referrerpolicy="no-referrer">',
+        stylesheet.url, stylesheet.integrity,
+    )
@@ -1,4 +1,8 @@
+from unittest.mock import patch
+
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from parameterized import parameterized
 
 from recipes.tests.test_recipe_base import Recipe, RecipeTestBase
@@ -61,3 +65,50 @@ class RecipeModelTest(RecipeTestBase):
             msg=f"Recipe string representation must be '{needed}' but"
                 f"'{self.recipe!s}' was received",
         )
+
+
+class RecipeSlugTest(RecipeTestBase):
+    def make_titled_recipe(self, title: str) -> Recipe:
+        return Recipe.objects.create(
+            title=title, description="d", preparation_time=1,
+            preparation_time_unit="Minutos", servings=1, servings_unit="Porções",
+            preparation_steps="s",
+        )
+
+    def test_recipe_slug_gets_next_free_suffix(self) -> None:
+        slugs = [self.make_titled_recipe("Bolo de chocolate").slug for _ in range(3)]
+        self.assertEqual(
+            slugs, ["bolo-de-chocolate", "bolo-de-chocolate-1", "bolo-de-chocolate-2"],
+        )
+
+    def test_recipe_slug_ignores_longer_slugs_sharing_the_prefix(self) -> None:
+        self.make_titled_recipe("Bolo de chocolate")
+        self.make_titled_recipe("Bolo")
+        self.assertEqual(self.make_titled_recipe("Bolo").slug, "bolo-1")
+
+    def test_recipe_slug_lookup_is_a_single_query(self) -> None:
+        for _ in range(10):
+            self.make_titled_recipe("Popular")
+        with CaptureQueriesContext(connection) as context:
+            recipe = self.make_titled_recipe("Popular")
+        slug_lookups = [
+            query for query in context.captured_queries
+            if query["sql"].startswith("SELECT") and '"slug"' in query["sql"]
+        ]
+        self.assertEqual(recipe.slug, "popular-10")
+        self.assertEqual(len(slug_lookups), 1)
+
+    def test_recipe_slug_fits_the_field_for_long_titles(self) -> None:
+        recipe = self.make_titled_recipe("A" * 65)
+        recipe_again = self.make_titled_recipe("A" * 65)
+        self.assertLessEqual(len(recipe.slug), 50)
+        self.assertLessEqual(len(recipe_again.slug), 50)
+
+    def test_recipe_slug_retries_when_a_concurrent_save_takes_it(self) -> None:
+        self.make_titled_recipe("Race")
+        with patch(
+            "recipes.models.unique_slug", side_effect=["race", "race-1"],
+        ) as allocate:
+            recipe = self.make_titled_recipe("Race")
+        self.assertEqual(recipe.slug, "race-1")
+        self.assertEqual(allocate.call_count, 2)
@@ -0,0 +1,77 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from recipes.models import Category, Recipe
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+
+class CategoryCountsTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.category = self.make_category(name="Bolos")
+        self.other = self.make_category(name="Doces")
+
+    def assertCounts(self, expected: dict[Category, int]) -> None:  # noqa: N802
+        for category, count in expected.items():
+            category.refresh_from_db()
+            self.assertEqual(category.published_recipe_count, count, category.name)
+
+    def make(self, slug: str, **kwargs: object) -> Recipe:
+        kwargs.setdefault("category", self.category)
+        return self.make_recipe(slug=slug, author={"username": slug}, **kwargs)
+
+    def test_publishing_and_unpublishing_move_the_count(self) -> None:
+        recipe = self.make("a", is_published=False)
+        self.assertCounts({self.category: 0})
+        recipe.is_published = True
+        recipe.save()
+        self.assertCounts({self.category: 1})
+        recipe.is_published = False
+        recipe.save()
+        self.assertCounts({self.category: 0})
+
+    def test_moving_a_published_recipe_moves_its_count(self) -> None:
+        recipe = self.make("a")
+        self.make("b")
+        recipe.category = self.other
+        recipe.save()
+        self.assertCounts({self.category: 1, self.other: 1})
+
+    def test_deleting_a_published_recipe_decrements_and_recomputes_latest(self) -> None:
+        older = self.make("a")
+        newer = self.make("b")
+        Recipe.objects.filter(pk=older.pk).update(
+            created_at=timezone.now() - timedelta(days=1),
+        )
+        older.refresh_from_db()
+        newer.delete()
+
+        self.assertCounts({self.category: 1})
+        self.assertEqual(self.category.latest_recipe_at, older.created_at)
+
+    def test_saving_a_deferred_instance_still_counts_right(self) -> None:
+        recipe = self.make("a", is_published=False)
+        deferred = Recipe.objects.only("title").get(pk=recipe.pk)
+        deferred.is_published = True
+        deferred.save()
+        self.assertCounts({self.category: 1})
+        Recipe.objects.only("title").get(pk=recipe.pk).delete()
+        self.assertCounts({self.category: 0})
+        self.assertIsNone(self.category.latest_recipe_at)
+
+    def test_edits_that_change_nothing_leave_the_count_alone(self) -> None:
+        recipe = self.make("a")
+        recipe.title = "Another title"
+        with self.assertNumQueries(3):  # UPDATE and FTS sync, no counts
+            recipe.save()
+        self.assertCounts({self.category: 1})
+
+    def test_refresh_command_repairs_drift(self) -> None:
+        self.make("a")
+        Category.objects.update(published_recipe_count=42, latest_recipe_at=None)
+        call_command("refresh_category_counts", stdout=StringIO())
+        self.assertCounts({self.category: 1, self.other: 0})
+        self.assertIsNotNone(self.category.latest_recipe_at)
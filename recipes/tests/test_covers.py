@@ -0,0 +1,131 @@
+import tempfile
+from io import BytesIO, StringIO
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from PIL import Image
+
+from recipes.images import render_variants
+from recipes.models import Recipe
+from recipes.tests.test_recipe_base import RecipeTestBase
+from tasks.models import Task
+from tasks.queue import run_pending
+
+
+def make_image(
+    size: tuple[int, int] = (2000, 1000), name: str = "cover.png",
+) -> SimpleUploadedFile:
+    buffer = BytesIO()
+    Image.new("RGB", size, (200, 80, 20)).save(buffer, format="PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class RecipeCoverVariantsTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        media = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=media))
+
+    def save_cover(self, recipe: Recipe, image: SimpleUploadedFile) -> None:
+        recipe.cover = image
+        recipe.save()
+        run_pending()
+        recipe.refresh_from_db()
+
+    def test_render_variants_scales_down_in_every_format(self) -> None:
+        name = default_storage.save("recipes/covers/bolo.png", make_image())
+        cover_variants = render_variants(default_storage, name)
+
+        self.assertEqual(
+            (cover_variants["width"], cover_variants["height"]), (2000, 1000),
+        )
+        self.assertEqual(
+            {
+                variant: (data["width"], data["height"])
+                for variant, data in cover_variants["variants"].items()
+            },
+            {"thumb": (320, 160), "card": (640, 320), "detail": (1280, 640)},
+        )
+        card = cover_variants["variants"]["card"]
+        self.assertEqual(card["webp"], "recipes/covers/bolo.card.webp")
+        with default_storage.open(card["webp"]) as webp:
+            self.assertEqual(webp.read(12)[8:], b"WEBP")
+        with default_storage.open(card["jpeg"]) as jpeg:
+            self.assertEqual(jpeg.read(2), b"\xff\xd8")
+
+    def test_small_covers_are_not_upscaled(self) -> None:
+        name = default_storage.save("recipes/covers/small.png", make_image((300, 200)))
+        variants = render_variants(default_storage, name)["variants"]
+        self.assertEqual(
+            {(data["width"], data["height"]) for data in variants.values()},
+            {(300, 200)},
+        )
+
+    def test_saving_a_cover_enqueues_its_processing(self) -> None:
+        recipe = self.make_recipe()
+        self.assertFalse(Task.objects.exists())
+        recipe.cover = make_image()
+        recipe.save()
+        task = Task.objects.get()
+        self.assertEqual(
+            (task.name, task.kwargs),
+            ("recipes.process_cover", {"recipe_id": recipe.pk}),
+        )
+        recipe.title = "Recipe title changed"
+        recipe.save()
+        self.assertEqual(Task.objects.count(), 2)  # still no variants to compare
+
+    def test_saving_a_cover_renders_variants_in_the_worker(self) -> None:
+        recipe = self.make_recipe()
+        updated_at = recipe.updated_at
+        self.save_cover(recipe, make_image())
+
+        self.assertEqual(recipe.cover_variants["source"], recipe.cover.name)
+        self.assertGreater(recipe.updated_at, updated_at)
+        response = self.client.get(reverse("recipes:home"))
+        self.assertContains(response, 'type="image/webp"')
+        self.assertContains(response, ".thumb.webp 320w")
+        self.assertContains(response, 'width="640" height="320"')
+
+    def test_cover_without_variants_falls_back_to_the_original(self) -> None:
+        recipe = self.make_recipe()
+        recipe.cover = make_image()
+        recipe.save()  # no worker runs the queued task
+        response = self.client.get(reverse("recipes:home"))
+        self.assertContains(response, f'src="{recipe.cover.url}"')
+        self.assertNotContains(response, "srcset")
+
+    def test_replacing_a_cover_removes_the_old_variants(self) -> None:
+        recipe = self.make_recipe()
+        self.save_cover(recipe, make_image(name="first.png"))
+        old = recipe.cover_variants["variants"]["card"]["webp"]
+        self.save_cover(recipe, make_image(name="second.png"))
+
+        self.assertIn("second", recipe.cover_variants["variants"]["card"]["webp"])
+        self.assertFalse(default_storage.exists(old))
+
+    def test_process_covers_backfills_bulk_inserted_recipes(self) -> None:
+        name = default_storage.save("recipes/covers/bulk.png", make_image())
+        recipe = self.make_recipe()
+        Recipe.objects.filter(pk=recipe.pk).update(cover=name)
+        out = StringIO()
+        call_command("process_covers", "--workers", "1", stdout=out)
+
+        self.assertIn("Processed 1 of 1 covers", out.getvalue())
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.cover_variants["source"], name)
+        call_command("process_covers", "--workers", "1", stdout=out)
+        self.assertIn("Processed 0 of 0 covers", out.getvalue())
+
+    def test_process_covers_can_leave_the_work_to_the_queue(self) -> None:
+        name = default_storage.save("recipes/covers/bulk.png", make_image())
+        recipe = self.make_recipe()
+        Recipe.objects.filter(pk=recipe.pk).update(cover=name)
+        call_command("process_covers", "--enqueue", stdout=StringIO())
+
+        self.assertEqual(run_pending(), 1)
+        recipe.refresh_from_db()
+        self.assertEqual(recipe.cover_variants["source"], name)
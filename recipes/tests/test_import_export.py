@@ -0,0 +1,145 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from recipes.models import Category, Recipe
+from recipes.search import search_recipes
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+
+class RecipeImportExportTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = Path(self.enterContext(tempfile.TemporaryDirectory()))
+
+    def write_jsonl(self, rows: list[dict[str, object]]) -> Path:
+        path = self.directory / "recipes.jsonl"
+        path.write_text("\n".join(json.dumps(row) for row in rows), encoding="utf-8")
+        return path
+
+    def import_recipes(self, path: Path, *args: str) -> str:
+        out = StringIO()
+        call_command("import_recipes", str(path), *args, stdout=out, stderr=out)
+        return out.getvalue()
+
+    def row(self, **kwargs: object) -> dict[str, object]:
+        return {
+            "title": "Bolo de fubá", "description": "Simples",
+            "preparation_time": 40, "preparation_time_unit": "Minutos",
+            "servings": 8, "servings_unit": "Pedaços",
+            "preparation_steps": "Misture e asse", "is_published": True,
+            "category": "Bolos", "author": "chef", **kwargs,
+        }
+
+    def test_import_resolves_relations_and_assigns_unique_slugs(self) -> None:
+        chef = self.make_author(username="chef")
+        path = self.write_jsonl([self.row() for _ in range(3)] + [
+            self.row(title="Pudim", category="Doces", author="nobody"),
+        ])
+        output = self.import_recipes(path, "--batch-size", "2")
+
+        self.assertIn("Imported 4 recipes, skipped 0", output)
+        recipes = list(Recipe.objects.order_by("id"))
+        self.assertEqual(
+            [r.slug for r in recipes],
+            ["bolo-de-fuba", "bolo-de-fuba-1", "bolo-de-fuba-2", "pudim"],
+        )
+        self.assertEqual(recipes[0].author, chef)
+        self.assertIsNone(recipes[3].author)
+        self.assertEqual(
+            sorted(Category.objects.values_list("name", flat=True)), ["Bolos", "Doces"],
+        )
+
+    def test_import_query_count_does_not_grow_per_row(self) -> None:
+        self.make_author(username="chef")
+        path = self.write_jsonl([self.row(title=f"Bolo {i}") for i in range(200)])
+        # Category map, savepoint, author lookup, category insert, slug lookup,
+        # four INSERTs (SQLite caps the parameters per statement), FTS sync,
+        # category counts refresh
+        with self.assertNumQueries(13):
+            self.import_recipes(path, "--batch-size", "500")
+        self.assertEqual(Recipe.objects.count(), 200)
+
+    def test_import_skips_invalid_rows(self) -> None:
+        path = self.write_jsonl([
+            self.row(), self.row(servings="many"), self.row(servings_unit="Kg"),
+        ])
+        output = self.import_recipes(path)
+        self.assertIn("Imported 1 recipes, skipped 2", output)
+        self.assertIn("Line 2 skipped", output)
+
+    def test_import_creates_no_category_for_skipped_rows(self) -> None:
+        path = self.write_jsonl([
+            self.row(category="Bolos"), self.row(category="Lixo", servings="many"),
+        ])
+        self.import_recipes(path)
+        self.assertEqual(
+            list(Category.objects.values_list("name", flat=True)), ["Bolos"],
+        )
+
+    def test_import_keeps_free_slugs_and_reallocates_taken_ones(self) -> None:
+        self.make_recipe(slug="taken")
+        long_slug = "bolo-de-fuba-com-goiabada-e-queijo-da-serra"
+        path = self.write_jsonl([
+            self.row(slug=long_slug), self.row(slug="taken"), self.row(slug=long_slug),
+            self.row(slug="Not a slug"),
+        ])
+        self.import_recipes(path)
+        self.assertEqual(
+            list(Recipe.objects.order_by("id").values_list("slug", flat=True)[1:]),
+            [long_slug, "taken-1", long_slug[:42], "not-a-slug"],
+        )
+
+    def test_import_skips_malformed_lines_and_mistyped_fields(self) -> None:
+        path = self.directory / "recipes.jsonl"
+        path.write_text("\n".join([
+            json.dumps(self.row()),
+            '{"title": "Broken',
+            json.dumps(self.row(title=None)),
+            json.dumps(self.row(author=["chef"])),
+            "[]",
+        ]), encoding="utf-8")
+        output = self.import_recipes(path)
+        self.assertIn("Imported 1 recipes, skipped 4", output)
+        for line in (2, 3, 4, 5):
+            self.assertIn(f"Line {line} skipped", output)
+
+    def test_import_keeps_created_at(self) -> None:
+        path = self.write_jsonl([
+            self.row(created_at="2021-03-04T05:06:07.000008+00:00"), self.row(),
+        ])
+        self.import_recipes(path)
+        dated, undated = Recipe.objects.order_by("id")
+        self.assertEqual(
+            dated.created_at.isoformat(), "2021-03-04T05:06:07.000008+00:00",
+        )
+        self.assertGreater(undated.created_at, dated.created_at)
+
+    def test_imported_recipes_are_searchable_and_listed(self) -> None:
+        self.make_recipe_in_batch(count=1)
+        self.client.get(reverse("recipes:home"))  # warm the page cache
+        self.import_recipes(self.write_jsonl([self.row(title="Quindim")]))
+        self.assertEqual(
+            [r.title for r in search_recipes(Recipe.objects.all(), "quind")],
+            ["Quindim"],
+        )
+        self.assertContains(self.client.get(reverse("recipes:home")), "Quindim")
+
+    def test_export_then_import_round_trips_through_csv(self) -> None:
+        self.make_recipe(title="Torta", slug="torta", category={"name": "Salgados"})
+        path = self.directory / "recipes.csv"
+        call_command("export_recipes", str(path), stdout=StringIO())
+        Recipe.objects.all().delete()
+
+        self.import_recipes(path)
+        recipe = Recipe.objects.get()
+        self.assertEqual(
+            (recipe.title, recipe.slug, recipe.category.name, recipe.servings),  # type: ignore  # noqa: E501, RUF100
+            ("Torta", "torta", "Salgados", 5),
+        )
+        self.assertTrue(recipe.is_published)
+        self.assertEqual(recipe.author.username, "username")  # type: ignore  # noqa: E501, RUF100
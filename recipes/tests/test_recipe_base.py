@@ -1,16 +1,20 @@
 from typing import Any
 from unittest.mock import patch
 
+from django.core.cache import cache
 from django.http.response import HttpResponse
 from django.test import TestCase
 from django.urls.base import reverse
 
+from recipes.factories import build_author, build_category, build_recipe
 from recipes.models import Category, Recipe, User
 
 
 class RecipeMixin:
     def make_category(self, name: str = "category") -> Category:
-        return Category.objects.create(name=name)
+        category = build_category(name=name)
+        category.save()
+        return category
 
     def make_author(
         self,
@@ -20,10 +24,12 @@ class RecipeMixin:
         password: str = "1234567",  # noqa: S107
         email: str = "username@gmail.com",
     ) -> User:
-        return User.objects.create_user(
+        author = build_author(
             first_name=first_name, last_name=last_name, username=username,
             password=password, email=email,
         )
+        author.save()
+        return author
 
     def make_recipe_in_batch(self, count: int = 8) -> list[Recipe]:
         return [
@@ -57,7 +63,7 @@ class RecipeMixin:
         author_instance = (
             author if isinstance(author, User) else self.make_author(**(author or {}))
         )
-        return Recipe.objects.create(
+        recipe = build_recipe(
             description=description, author=author_instance,
             preparation_time=preparation_time,
             preparation_time_unit=preparation_time_unit,
@@ -66,6 +72,8 @@ class RecipeMixin:
             preparation_steps_is_html=preparation_steps_is_html, slug=slug,
             category=cat_instance,
         )
+        recipe.save()
+        return recipe
 
     def create_recipes(self, total_items: int, recipe_kwargs: dict[str, Any]) -> None:
         for i in range(total_items):
@@ -126,4 +134,6 @@ class RecipeMixin:
 
 class RecipeTestBase(TestCase, RecipeMixin):
     def setUp(self) -> None:
+        # Cached counts and pages outlive each test's rolled back transaction
+        cache.clear()
         return super().setUp()
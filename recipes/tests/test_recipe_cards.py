@@ -0,0 +1,49 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from recipes.mixins import PageCacheMixin
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+CARD_TEMPLATE = "recipes/partials/recipe.html"
+
+
+@patch.object(PageCacheMixin, "can_use_page_cache", return_value=False)
+class RecipeCardCacheTest(RecipeTestBase):
+    def rendered_cards(self, url: str) -> int:
+        response = self.client.get(url)
+        return [t.name for t in response.templates].count(CARD_TEMPLATE)
+
+    def test_cards_are_fetched_with_one_get_many_per_page(self, _: object) -> None:
+        self.make_recipe_in_batch(count=4)
+        with patch.object(cache, "get_many", wraps=cache.get_many) as get_many:
+            self.client.get(reverse("recipes:home"))
+        get_many.assert_called_once()
+        self.assertEqual(len(get_many.call_args.args[0]), 4)
+
+    def test_only_missing_cards_are_rendered(self, _: object) -> None:
+        recipes = self.make_recipe_in_batch(count=3)
+        url = reverse("recipes:home")
+        self.assertEqual(self.rendered_cards(url), 3)
+        self.assertEqual(self.rendered_cards(url), 0)
+
+        recipes[0].title = "Edited title"
+        recipes[0].save()
+        self.assertEqual(self.rendered_cards(url), 1)
+        self.assertContains(self.client.get(url), "Edited title")
+
+    def test_renaming_a_category_refreshes_its_cards(self, _: object) -> None:
+        recipe = self.make_recipe(category={"name": "Bolos"})
+        url = reverse("recipes:home")
+        self.client.get(url)
+        recipe.category.name = "Tortas"  # type: ignore  # noqa: RUF100
+        recipe.category.save()  # type: ignore  # noqa: RUF100
+        self.assertContains(self.client.get(url), "Tortas")
+
+    def test_detail_and_list_cards_are_cached_apart(self, _: object) -> None:
+        recipe = self.make_recipe(preparation_steps="Bata tudo no liquidificador")
+        home = self.client.get(reverse("recipes:home"))
+        self.assertNotContains(home, "liquidificador")
+        detail = self.client.get(reverse("recipes:recipe", args=(recipe.pk,)))
+        self.assertContains(detail, "liquidificador")
@@ -0,0 +1,61 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+
+from recipes.models import Recipe
+from recipes.search import FTS_TABLE, search_recipes
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+
+class RecipeSearchBackendTest(RecipeTestBase):
+    def search(self, term: str) -> list[str]:
+        return [r.slug for r in search_recipes(Recipe.objects.all(), term)]
+
+    def test_search_matches_word_prefixes(self) -> None:
+        self.make_recipe(slug="bolo", title="Bolo de cenoura")
+        self.assertEqual(self.search("bol cen"), ["bolo"])
+
+    def test_search_ignores_accents(self) -> None:
+        self.make_recipe(slug="pao", title="Pão de queijo")
+        self.assertEqual(self.search("pao"), ["pao"])
+
+    def test_search_covers_preparation_steps(self) -> None:
+        self.make_recipe(slug="steps", preparation_steps="Asse por 40 minutos")
+        self.assertEqual(self.search("asse"), ["steps"])
+
+    def test_search_ranks_title_matches_above_description_matches(self) -> None:
+        self.make_recipe(
+            slug="description", title="Torta salgada",
+            description="Perfeita com chocolate quente",
+            author={"username": "one"},
+        )
+        self.make_recipe(
+            slug="title", title="Chocolate quente",
+            author={"username": "two"},
+        )
+        self.assertEqual(self.search("chocolate"), ["title", "description"])
+
+    def test_search_without_words_returns_nothing(self) -> None:
+        self.make_recipe()
+        self.assertEqual(self.search('"*()'), [])
+
+    def test_search_index_follows_recipe_edits_and_deletes(self) -> None:
+        recipe = self.make_recipe(slug="edit", title="Bolo simples")
+        recipe.title = "Pudim simples"
+        recipe.save()
+        self.assertEqual(self.search("bolo"), [])
+        self.assertEqual(self.search("pudim"), ["edit"])
+        recipe.delete()
+        self.assertEqual(self.search("pudim"), [])
+
+    def test_rebuild_search_index_command_reindexes_every_recipe(self) -> None:
+        self.make_recipe(slug="lost", title="Lasanha")
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")  # noqa: S608
+        self.assertEqual(self.search("lasanha"), [])
+
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("Indexed 1 recipes.", out.getvalue())
+        self.assertEqual(self.search("lasanha"), ["lost"])
@@ -0,0 +1,74 @@
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+
+from recipes.models import Category, Recipe, User
+from recipes.search import search_recipes
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+
+class SeedRecipesCommandTest(RecipeTestBase):
+    def seed(self, *args: str) -> str:
+        out = StringIO()
+        call_command("seed_recipes", *args, stdout=out)
+        return out.getvalue()
+
+    def snapshot(self) -> list[tuple[str, ...]]:
+        return list(
+            Recipe.objects.order_by("id").values_list(
+                "title", "slug", "description", "author__username", "category__name",
+            ),
+        )
+
+    def test_seed_creates_recipes_authors_and_categories(self) -> None:
+        output = self.seed(
+            "--count", "30", "--authors", "4", "--categories", "3",
+            "--batch-size", "7", "--workers", "1",
+        )
+
+        self.assertIn("Seeded 30 recipes, 4 authors and 3 categories", output)
+        self.assertEqual(Recipe.objects.count(), 30)
+        self.assertEqual(User.objects.count(), 4)
+        self.assertEqual(
+            sorted(Category.objects.values_list("name", flat=True)),
+            ["Bolos", "Doces", "Salgados"],
+        )
+        slugs = list(Recipe.objects.values_list("slug", flat=True))
+        self.assertEqual(len(set(slugs)), 30)
+        title = Recipe.objects.values_list("title", flat=True)[0]
+        self.assertTrue(
+            search_recipes(Recipe.objects.all(), title.split()[0]).exists(),
+        )
+
+    def test_same_seed_generates_the_same_data_with_any_worker_count(self) -> None:
+        args = ("--count", "24", "--authors", "5", "--batch-size", "5", "--seed", "7")
+        self.seed(*args, "--workers", "1")
+        first = self.snapshot()
+        Recipe.objects.all().delete()
+        User.objects.all().delete()
+
+        self.seed(*args, "--workers", "3")
+        self.assertEqual(self.snapshot(), first)
+
+    def test_reseeding_reuses_authors_and_categories(self) -> None:
+        args = ("--count", "5", "--authors", "2", "--workers", "1")
+        self.seed(*args)
+        self.seed(*args)
+        self.assertEqual(Recipe.objects.count(), 10)
+        self.assertEqual(User.objects.count(), 2)
+        self.assertEqual(Category.objects.count(), 12)
+
+    def test_placeholder_covers_are_shared_among_recipes(self) -> None:
+        with (
+            tempfile.TemporaryDirectory() as media,
+            override_settings(MEDIA_ROOT=media),
+        ):
+            self.seed("--count", "10", "--covers", "2", "--workers", "1")
+            covers = set(Recipe.objects.values_list("cover", flat=True))
+            self.assertLessEqual(len(covers), 2)
+            for cover in covers:
+                self.assertTrue(cover.startswith("recipes/covers/seed/"))
+                with Recipe.objects.filter(cover=cover)[0].cover.open() as image:
+                    self.assertEqual(image.read(2), b"\xff\xd8")
@@ -0,0 +1,152 @@
+from unittest.mock import Mock, patch
+
+from django.urls import reverse
+
+from recipes.mixins import PageCacheMixin
+from recipes.tests.test_recipe_base import RecipeTestBase
+from recipes.views import PER_PAGE
+from utils.pagination import encode_cursor
+
+TAMPERED_CURSORS = (
+    encode_cursor(["abc"]), encode_cursor([{"a": 1}]), encode_cursor([None]),
+)
+
+
+class RecipeApiTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.list_url = reverse("recipes:api_list")
+
+    def test_list_returns_published_recipes_newest_first(self) -> None:
+        recipes = self.make_recipe_in_batch(3)
+        self.make_recipe(slug="draft", author={"username": "d"}, is_published=False)
+        data = self.client.get(self.list_url).json()
+        self.assertEqual(
+            [recipe["id"] for recipe in data["results"]],
+            [recipe.pk for recipe in reversed(recipes)],
+        )
+        first = data["results"][0]
+        self.assertEqual(first["category"], "category")
+        self.assertEqual(first["author"], "u2")
+        self.assertNotIn("preparation_steps", first)
+        self.assertIsNone(data["next"])
+
+    def test_fields_limits_the_returned_fields(self) -> None:
+        self.make_recipe()
+        data = self.client.get(f"{self.list_url}?fields=title,slug").json()
+        self.assertEqual(
+            data["results"], [{"title": "Recipe title", "slug": "recipe-slug"}],
+        )
+
+    def test_unknown_fields_are_a_bad_request(self) -> None:
+        response = self.client.get(f"{self.list_url}?fields=title,password")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "Unknown fields: password"})
+
+    def test_cursor_pagination_walks_every_recipe_once(self) -> None:
+        recipes = self.make_recipe_in_batch(PER_PAGE * 2 + 1)
+        seen, url = [], f"{self.list_url}?fields=id"
+        while url:
+            data = self.client.get(url).json()
+            seen += [recipe["id"] for recipe in data["results"]]
+            url = data["next"]
+        self.assertEqual(seen, sorted((recipe.pk for recipe in recipes), reverse=True))
+        self.assertIn("fields=id", data["previous"])
+
+    def test_tampered_cursors_return_the_first_page(self) -> None:
+        recipe = self.make_recipe()
+        for cursor in TAMPERED_CURSORS:
+            with self.subTest(cursor=cursor):
+                response = self.client.get(f"{self.list_url}?fields=id&cursor={cursor}")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()["results"], [{"id": recipe.pk}])
+
+    @patch.object(PageCacheMixin, "can_use_page_cache", return_value=False)
+    def test_list_runs_a_single_query_without_count(self, _: Mock) -> None:
+        self.make_recipe_in_batch(PER_PAGE + 1)
+        with self.assertNumQueries(1):
+            self.client.get(self.list_url)
+
+    @patch.object(PageCacheMixin, "can_use_page_cache", return_value=False)
+    def test_matching_etag_returns_304(self, _: Mock) -> None:
+        recipe = self.make_recipe()
+        detail_url = reverse("recipes:api_detail", kwargs={"pk": recipe.pk})
+        for url in (self.list_url, detail_url):
+            with self.subTest(url=url):
+                etag = self.client.get(url)["ETag"]
+                response = self.client.get(url, headers={"if-none-match": etag})
+                self.assertEqual(response.status_code, 304)
+
+    def test_etag_differs_from_the_html_page_and_other_fields(self) -> None:
+        recipe = self.make_recipe()
+        api_url = reverse("recipes:api_detail", kwargs={"pk": recipe.pk})
+        html_url = reverse("recipes:recipe", kwargs={"pk": recipe.pk})
+        etags = {
+            self.client.get(html_url)["ETag"],
+            self.client.get(api_url)["ETag"],
+            self.client.get(f"{api_url}?fields=title")["ETag"],
+        }
+        self.assertEqual(len(etags), 3)
+
+    def test_detail_includes_the_preparation_steps(self) -> None:
+        recipe = self.make_recipe()
+        response = self.client.get(
+            reverse("recipes:api_detail", kwargs={"pk": recipe.pk}),
+        )
+        data = response.json()
+        self.assertEqual(data["id"], recipe.pk)
+        self.assertEqual(data["preparation_steps"], "Recipe Preparation Steps")
+        self.assertIsNone(data["cover"])
+
+    def test_missing_or_draft_recipe_is_a_json_404(self) -> None:
+        draft = self.make_recipe(is_published=False)
+        for pk in (draft.pk, draft.pk + 1):
+            with self.subTest(pk=pk):
+                response = self.client.get(
+                    reverse("recipes:api_detail", kwargs={"pk": pk}),
+                )
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json(), {"error": "Not found"})
+
+    def test_category_lists_only_its_recipes(self) -> None:
+        recipe = self.make_recipe()
+        self.make_recipe(
+            slug="other", author={"username": "other"}, category={"name": "other"},
+        )
+        url = reverse(
+            "recipes:api_category", kwargs={"category_id": recipe.category_id},
+        )
+        data = self.client.get(f"{url}?fields=id").json()
+        self.assertEqual(data["results"], [{"id": recipe.pk}])
+
+    def test_empty_category_is_a_json_404(self) -> None:
+        url = reverse("recipes:api_category", kwargs={"category_id": 1000})
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_search_pages_by_relevance(self) -> None:
+        for i in range(PER_PAGE + 2):
+            self.make_recipe(
+                slug=f"s{i}", author={"username": f"s{i}"},
+                title="Bolo de bolo" if i % 2 else f"Bolo {i}",
+            )
+        url = f"{reverse('recipes:api_search')}?q=bolo&fields=id,title"
+        first = self.client.get(url).json()
+        second = self.client.get(first["next"]).json()
+        ids = [recipe["id"] for recipe in first["results"] + second["results"]]
+        self.assertEqual(len(ids), PER_PAGE + 2)
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertNotIn("search_rank", first["results"][0])
+
+    def test_search_with_a_wrong_typed_cursor_returns_the_first_page(self) -> None:
+        recipe = self.make_recipe(title="Bolo")
+        url = f"{reverse('recipes:api_search')}?q=bolo&fields=id"
+        for values in (["abc", recipe.pk], [1.5, "abc"], [[1], {"a": 1}]):
+            with self.subTest(values=values):
+                response = self.client.get(f"{url}&cursor={encode_cursor(values)}")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()["results"], [{"id": recipe.pk}])
+
+    def test_search_without_term_is_a_json_404(self) -> None:
+        response = self.client.get(reverse("recipes:api_search"))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json(), {"error": "Not found"})
@@ -0,0 +1,128 @@
+from typing import Any
+from unittest.mock import patch
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.test import override_settings
+from django.urls import include, path, resolve, reverse
+
+from recipes import async_views
+from recipes.mixins import PageCacheMixin
+from recipes.tests.test_recipe_base import RecipeTestBase
+from recipes.urls import app_name, page_patterns
+from recipes.urls import urlpatterns as recipes_urlpatterns
+from recipes.views import PER_PAGE
+from utils.db import PrimaryReplicaRouter
+from utils.instrumentation import clear_recent_requests, recent_requests
+
+# The project's URLs with ASYNC_VIEWS on, the async pages match first
+urlpatterns = [
+    path("", include(([*page_patterns(async_views), *recipes_urlpatterns], app_name))),
+    path("authors/", include("authors.urls")),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncRecipeViewsTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.recipe = self.make_recipe()
+        self.home_url = reverse("recipes:home")
+        self.detail_url = reverse("recipes:recipe", kwargs={"pk": self.recipe.pk})
+        self.category_url = reverse(
+            "recipes:category", kwargs={"category_id": self.recipe.category_id},
+        )
+        self.search_url = reverse("recipes:search") + "?q=Recipe"
+
+    def test_public_pages_are_served_by_async_views(self) -> None:
+        for url in (self.home_url, self.category_url, self.detail_url):
+            with self.subTest(url=url):
+                view = resolve(url).func
+                self.assertTrue(view.view_class.view_is_async)
+
+    async def test_pages_render_like_the_sync_ones(self) -> None:
+        for url, template in (
+            (self.home_url, "recipes/pages/home.html"),
+            (self.category_url, "recipes/pages/category.html"),
+            (self.search_url, "recipes/pages/search.html"),
+            (self.detail_url, "recipes/pages/recipe-view.html"),
+        ):
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertTemplateUsed(response, template)
+                self.assertContains(response, "Recipe title")
+
+    async def test_missing_pages_are_404(self) -> None:
+        for url in (
+            reverse("recipes:category", kwargs={"category_id": 1000}),
+            reverse("recipes:recipe", kwargs={"pk": 1000}),
+            reverse("recipes:search"),
+        ):
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 404)
+
+    def test_pagination_counts_and_slices_asynchronously(self) -> None:
+        self.make_recipe_in_batch(PER_PAGE * 2)
+        response = self.client.get(f"{self.home_url}?page=3")
+        page_obj = response.context["recipes"]
+        self.assertEqual(page_obj.number, 3)
+        self.assertEqual(page_obj.paginator.count, PER_PAGE * 2 + 1)
+        self.assertEqual(len(page_obj), 1)
+        self.assertEqual(page_obj[0], self.recipe)
+
+    @patch.object(PageCacheMixin, "acan_use_page_cache", return_value=False)
+    async def test_list_and_detail_queries(self, _: Any) -> None:  # noqa: ANN401
+        # assertNumQueries can't be entered from async code, the middleware counts.
+        # Recipes plus their count, the category's denormalized count replaces it
+        for url, queries in (
+            (self.home_url, 2), (self.category_url, 2), (self.detail_url, 1),
+        ):
+            with self.subTest(url=url):
+                await self.async_client.get(url)
+                self.assertEqual(recent_requests()[-1].queries, queries)
+
+    @patch.object(PageCacheMixin, "acan_use_page_cache", return_value=False)
+    async def test_matching_etag_returns_304(self, _: Any) -> None:  # noqa: ANN401
+        for url in (self.home_url, self.detail_url):
+            with self.subTest(url=url):
+                etag = (await self.async_client.get(url))["ETag"]
+                response = await self.async_client.get(
+                    url, headers={"if-none-match": etag},
+                )
+                self.assertEqual(response.status_code, 304)
+
+    async def test_second_anonymous_request_is_a_page_cache_hit(self) -> None:
+        first = await self.async_client.get(self.detail_url)
+        second = await self.async_client.get(self.detail_url)
+        self.assertEqual(first["X-Page-Cache"], "miss")
+        self.assertEqual(second["X-Page-Cache"], "hit")
+        self.assertEqual(first.content, second.content)
+
+    def test_logged_in_users_bypass_the_page_cache(self) -> None:
+        self.client.force_login(self.recipe.author)
+        response = self.client.get(self.home_url)
+        self.assertEqual(response["X-Page-Cache"], "bypass")
+
+    async def test_middleware_counts_queries_of_async_views(self) -> None:
+        clear_recent_requests()
+        await self.async_client.get(self.detail_url)
+        metrics = recent_requests()[-1]
+        self.assertEqual(metrics.view, "recipes:recipe")
+        self.assertGreater(metrics.queries, 0)
+
+    @override_settings(DATABASE_REPLICAS=["replica_1"])
+    async def test_async_pages_read_from_the_replicas(self) -> None:
+        aliases: list[str] = []
+        db_for_read = PrimaryReplicaRouter.db_for_read
+
+        def record(
+            router: PrimaryReplicaRouter, model: type[Model], **hints: Any,  # noqa: ANN401
+        ) -> str:
+            aliases.append(db_for_read(router, model, **hints))
+            return DEFAULT_DB_ALIAS
+
+        with patch.object(PrimaryReplicaRouter, "db_for_read", record):
+            await self.async_client.get(self.home_url)
+        self.assertEqual(set(aliases), {"replica_1"})
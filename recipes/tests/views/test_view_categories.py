@@ -0,0 +1,48 @@
+from django.urls import resolve, reverse
+
+from recipes import views
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+
+class RecipeCategoryIndexViewTest(RecipeTestBase):
+    url = reverse("recipes:categories")
+
+    def test_category_index_view_is_correct(self) -> None:
+        self.assertIs(resolve(self.url).func.view_class, views.RecipeCategoryIndex)
+
+    def test_category_index_lists_categories_with_published_recipes(self) -> None:
+        bolos = self.make_category(name="Bolos")
+        self.create_recipes(3, recipe_kwargs={"category": bolos})
+        self.make_recipe(
+            slug="draft", author={"username": "draft"}, is_published=False,
+            category={"name": "Rascunhos"},
+        )
+        response = self.client.get(self.url)
+
+        self.assertEqual([c.name for c in response.context["categories"]], ["Bolos"])
+        self.assertContains(response, "Bolos")
+        self.assertContains(
+            response, '<div class="recipe-meta-text">3</div>', html=True,
+        )
+        self.assertNotContains(response, "Rascunhos")
+
+    def test_category_index_is_one_query_and_then_cached(self) -> None:
+        self.create_recipes(2, recipe_kwargs={})
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response["X-Page-Cache"], "hit")
+
+    def test_category_index_changes_when_a_recipe_is_published(self) -> None:
+        recipe = self.make_recipe(is_published=False, category={"name": "Bolos"})
+        self.assertNotContains(self.client.get(self.url), "Bolos")
+        recipe.is_published = True
+        recipe.save()
+        self.assertContains(self.client.get(self.url), "Bolos")
+
+    def test_category_index_answers_conditional_requests(self) -> None:
+        self.make_recipe()
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from django.urls import resolve, reverse
 
 from recipes import views
@@ -48,3 +50,21 @@ class RecipeCategoryViewTest(RecipeTestBase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("title", response.context)
         self.assertEqual(response.context["title"], "Sobremesas - Category")
+
+    def test_recipe_category_query_count_does_not_grow_with_recipes(self) -> None:
+        category = self.make_category(name="Sobremesas")
+        self.create_recipes(8, recipe_kwargs={"category": category})
+        url = reverse("recipes:category", kwargs={"category_id": category.pk})
+        # The category row carries the count, then one SELECT joining
+        # author/category, no EXISTS check and no COUNT(*)
+        with patch("recipes.views.PER_PAGE", new=6), self.assertNumQueries(2):
+            response = self.client.get(url)
+            self.assertEqual(len(response.context["recipes"]), 6)
+
+    def test_recipe_category_paginates_with_the_denormalized_count(self) -> None:
+        category = self.make_category(name="Sobremesas")
+        self.create_recipes(8, recipe_kwargs={"category": category})
+        url = reverse("recipes:category", kwargs={"category_id": category.pk})
+        with patch("recipes.views.PER_PAGE", new=3):
+            response = self.client.get(url)
+        self.assertEqual(response.context["recipes"].paginator.num_pages, 3)
@@ -0,0 +1,86 @@
+from unittest.mock import Mock, patch
+
+from django.urls import reverse
+
+from recipes.mixins import PageCacheMixin
+from recipes.models import Recipe
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+
+class RecipeConditionalGetTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.recipe = self.make_recipe()
+        self.home_url = reverse("recipes:home")
+        self.detail_url = reverse("recipes:recipe", kwargs={"pk": self.recipe.pk})
+
+    def test_detail_and_list_responses_carry_validators(self) -> None:
+        for url in (self.home_url, self.detail_url):
+            with self.subTest(url=url):
+                self.assertTrue(self.client.get(url).has_header("ETag"))
+        self.assertTrue(self.client.get(self.detail_url).has_header("Last-Modified"))
+
+    def test_lists_send_no_last_modified(self) -> None:
+        for url in (self.home_url, reverse("recipes:categories")):
+            with self.subTest(url=url):
+                self.assertFalse(self.client.get(url).has_header("Last-Modified"))
+
+    def test_if_modified_since_is_ignored_on_lists(self) -> None:
+        last_modified = self.client.get(self.detail_url)["Last-Modified"]
+        self.recipe.delete()
+        response = self.client.get(
+            self.home_url, headers={"if-modified-since": last_modified},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    @patch.object(PageCacheMixin, "can_use_page_cache", return_value=False)
+    def test_out_of_range_page_etag_is_the_last_pages(self, _: Mock) -> None:
+        etag = self.client.get(self.home_url, {"page": 1000})["ETag"]
+        response = self.client.get(
+            self.home_url, {"page": 1000}, headers={"if-none-match": etag},
+        )
+        self.assertEqual(response.status_code, 304)
+
+    @patch.object(PageCacheMixin, "can_use_page_cache", return_value=False)
+    def test_matching_etag_returns_304_before_rendering(self, _: Mock) -> None:
+        for url in (self.home_url, self.detail_url):
+            with self.subTest(url=url):
+                etag = self.client.get(url)["ETag"]
+                # Only the updated_at lookup runs, the page itself is not built
+                with self.assertNumQueries(1):
+                    response = self.client.get(url, headers={"if-none-match": etag})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b"")
+
+    def test_if_modified_since_returns_304_for_unchanged_recipe(self) -> None:
+        last_modified = self.client.get(self.detail_url)["Last-Modified"]
+        response = self.client.get(
+            self.detail_url, headers={"if-modified-since": last_modified},
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_cached_page_revalidates_without_queries(self) -> None:
+        etag = self.client.get(self.home_url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.home_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_editing_a_recipe_changes_its_etag(self) -> None:
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.recipe.title = "New title"
+        self.recipe.save()
+        response = self.client.get(self.detail_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "New title")
+
+    def test_deleting_a_recipe_changes_the_list_etag(self) -> None:
+        other = self.make_recipe(slug="other", author={"username": "other"})
+        etag = self.client.get(self.home_url)["ETag"]
+        Recipe.objects.get(pk=other.pk).delete()
+        response = self.client.get(self.home_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_conditional_request_for_missing_recipe_is_404(self) -> None:
+        url = reverse("recipes:recipe", kwargs={"pk": 1000})
+        response = self.client.get(url, headers={"if-none-match": '"anything"'})
+        self.assertEqual(response.status_code, 404)
@@ -31,3 +31,11 @@ class RecipeDetailViewTest(RecipeTestBase):
             reverse("recipes:recipe", kwargs={"pk": recipe.id}),
         )
         self.assertEqual(response.status_code, 404)
+
+    def test_recipe_detail_loads_author_and_category_in_one_query(self) -> None:
+        recipe = self.make_recipe()
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("recipes:recipe", kwargs={"pk": recipe.id}),
+            )
+            self.assertContains(response, recipe.category.name)  # type: ignore  # noqa: E501, RUF100
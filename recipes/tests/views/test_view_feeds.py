@@ -0,0 +1,117 @@
+import xml.etree.ElementTree as ET
+from unittest.mock import Mock, patch
+
+from django.test import override_settings
+from django.urls import reverse
+
+from recipes.mixins import PageCacheMixin
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+ATOM = {"atom": "http://www.w3.org/2005/Atom"}
+
+
+def parse(content: bytes) -> ET.Element:
+    # The view's own output, not untrusted input
+    return ET.fromstring(content)  # noqa: S314
+
+
+class RecipeFeedTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.rss_url = reverse("recipes:feed", kwargs={"feed_format": "rss"})
+
+    def rss_titles(self, url: str) -> list[str | None]:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        root = parse(response.content)
+        return [title.text for title in root.findall("channel/item/title")]
+
+    @override_settings(FEED_ITEMS=2)
+    def test_feed_lists_the_newest_published_recipes_up_to_the_limit(self) -> None:
+        self.make_recipe_in_batch(3)
+        self.make_recipe(
+            slug="draft", title="Draft", author={"username": "d"}, is_published=False,
+        )
+        self.assertEqual(
+            self.rss_titles(self.rss_url), ["Recipe title 2", "Recipe title 1"],
+        )
+
+    def test_items_carry_link_author_category_and_dates(self) -> None:
+        recipe = self.make_recipe(author={"username": "chef", "first_name": "Ana"})
+        [item] = parse(self.client.get(self.rss_url).content).findall("channel/item")
+        self.assertEqual(
+            item.findtext("link"),
+            "http://testserver" + reverse("recipes:recipe", kwargs={"pk": recipe.pk}),
+        )
+        creator = item.findtext("{http://purl.org/dc/elements/1.1/}creator")
+        self.assertIn("Ana name", creator)
+        self.assertEqual(item.findtext("category"), "category")
+
+    def test_atom_feed(self) -> None:
+        self.make_recipe()
+        atom_url = reverse("recipes:feed", kwargs={"feed_format": "atom"})
+        response = self.client.get(atom_url)
+        self.assertEqual(
+            response["Content-Type"], "application/atom+xml; charset=utf-8",
+        )
+        root = parse(response.content)
+        self.assertEqual(
+            [title.text for title in root.findall("atom:entry/atom:title", ATOM)],
+            ["Recipe title"],
+        )
+
+    def test_category_and_author_feeds_are_filtered(self) -> None:
+        recipe = self.make_recipe(title="Mine", author={"username": "chef"})
+        self.make_recipe(
+            slug="other", title="Other", author={"username": "other"},
+            category={"name": "other"},
+        )
+        category_url = reverse("recipes:category_feed", kwargs={
+            "category_id": recipe.category_id, "feed_format": "rss",
+        })
+        author_url = reverse("recipes:author_feed", kwargs={
+            "username": "chef", "feed_format": "rss",
+        })
+        self.assertEqual(self.rss_titles(category_url), ["Mine"])
+        self.assertEqual(self.rss_titles(author_url), ["Mine"])
+
+    def test_unknown_formats_categories_and_authors_are_404(self) -> None:
+        for url in (
+            reverse("recipes:feed", kwargs={"feed_format": "json"}),
+            reverse("recipes:category_feed", kwargs={
+                "category_id": 1000, "feed_format": "rss",
+            }),
+            reverse("recipes:author_feed", kwargs={
+                "username": "nobody", "feed_format": "rss",
+            }),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_polling_with_the_etag_is_a_304_without_queries(self) -> None:
+        self.make_recipe()
+        etag = self.client.get(self.rss_url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.rss_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    @patch.object(PageCacheMixin, "can_use_page_cache", return_value=False)
+    def test_the_etag_comes_from_the_newest_updated_at(self, _: Mock) -> None:
+        recipe = self.make_recipe()
+        response = self.client.get(self.rss_url)
+        self.assertFalse(response.has_header("Last-Modified"))
+        with self.assertNumQueries(1):
+            not_modified = self.client.get(
+                self.rss_url, headers={"if-none-match": response["ETag"]},
+            )
+        self.assertEqual(not_modified.status_code, 304)
+        recipe.title = "Changed"
+        recipe.save()
+        response = self.client.get(
+            self.rss_url, headers={"if-none-match": response["ETag"]},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_pages_link_to_the_feeds(self) -> None:
+        response = self.client.get(reverse("recipes:home"))
+        self.assertContains(response, f'href="{self.rss_url}"')
@@ -5,6 +5,7 @@ from django.urls import resolve, reverse
 
 from recipes import views
 from recipes.tests.test_recipe_base import RecipeTestBase
+from utils.pagination import CURSOR_MODE, CURSOR_PREVIOUS, encode_cursor
 
 
 class RecipeHomeViewTest(RecipeTestBase):
@@ -70,3 +71,107 @@ class RecipeHomeViewTest(RecipeTestBase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Home | Recipes")
+
+    def test_recipe_home_query_count_does_not_grow_with_recipes(self) -> None:
+        self.make_recipe_in_batch()  # creates 8 recipes by default
+        # One COUNT(*) for the paginator and one SELECT joining author/category
+        with patch("recipes.views.PER_PAGE", new=6), self.assertNumQueries(2):
+            response = self.client.get(self.url)
+            self.assertEqual(len(response.context["recipes"]), 6)
+
+    def test_recipe_home_cursor_mode_walks_pages_without_counting(self) -> None:
+        recipes = self.make_recipe_in_batch()  # creates 8 recipes by default
+        expected_ids = [r.id for r in reversed(recipes)]
+        with (
+            patch("recipes.views.PER_PAGE", new=3),
+            patch.object(views.RecipeListViewHome, "pagination_mode", CURSOR_MODE),
+        ):
+            with self.assertNumQueries(1):
+                response = self.client.get(self.url)
+            first_page = response.context["recipes"]
+            self.assertEqual([r.id for r in first_page], expected_ids[:3])
+            self.assertFalse(first_page.has_previous())
+
+            response = self.client.get(
+                f"{self.url}?cursor={first_page.next_cursor}",
+            )
+            second_page = response.context["recipes"]
+            self.assertEqual([r.id for r in second_page], expected_ids[3:6])
+            self.assertContains(response, "Go to previous page")
+            self.assertContains(response, "Go to next page")
+
+            response = self.client.get(
+                f"{self.url}?cursor={second_page.next_cursor}",
+            )
+            last_page = response.context["recipes"]
+            self.assertEqual([r.id for r in last_page], expected_ids[6:])
+            self.assertFalse(last_page.has_next())
+
+            response = self.client.get(
+                f"{self.url}?cursor={last_page.previous_cursor}",
+            )
+            self.assertEqual(
+                [r.id for r in response.context["recipes"]], expected_ids[3:6],
+            )
+
+    def test_recipe_home_cursor_mode_seeks_on_created_at_and_id(self) -> None:
+        recipes = self.make_recipe_in_batch(count=5)
+        expected_ids = [r.id for r in reversed(recipes)]
+        with (
+            patch("recipes.views.PER_PAGE", new=2),
+            patch.object(views.RecipeListViewHome, "pagination_mode", CURSOR_MODE),
+            patch.object(
+                views.RecipeListViewHome, "cursor_ordering", ("-created_at", "-id"),
+            ),
+        ):
+            seen: list[int] = []
+            url = self.url
+            while True:
+                page = self.client.get(url).context["recipes"]
+                seen.extend(r.id for r in page)
+                if not page.has_next():
+                    break
+                url = f"{self.url}?cursor={page.next_cursor}"
+            self.assertEqual(seen, expected_ids)
+
+    def test_recipe_home_tampered_cursor_shows_the_first_page(self) -> None:
+        recipes = self.make_recipe_in_batch(count=3)
+        expected_ids = [r.id for r in reversed(recipes)]
+        cursors = [
+            encode_cursor(["abc"]),
+            encode_cursor([None], CURSOR_PREVIOUS),
+            encode_cursor(["2025-01-01", {"a": 1}]),
+        ]
+        with (
+            patch.object(views.RecipeListViewHome, "pagination_mode", CURSOR_MODE),
+            patch.object(
+                views.RecipeListViewHome, "cursor_ordering", ("-created_at", "-id"),
+            ),
+        ):
+            for cursor in cursors:
+                with self.subTest(cursor=cursor):
+                    response = self.client.get(f"{self.url}?cursor={cursor}")
+                    self.assertEqual(response.status_code, 200)
+                    page = response.context["recipes"]
+                    self.assertEqual([r.id for r in page], expected_ids)
+                    self.assertFalse(page.has_previous())
+
+    def test_recipe_home_reuses_cached_count_until_a_recipe_changes(self) -> None:
+        self.make_recipe_in_batch(count=4)
+        with patch("recipes.views.PER_PAGE", new=2):
+            self.client.get(self.url)
+            # The COUNT(*) is cached, only the page SELECT runs for page 2
+            with self.assertNumQueries(1):
+                response = self.client.get(self.url + "?page=2")
+            self.assertEqual(response.context["recipes"].paginator.count, 4)
+
+            self.make_recipe(slug="new", author={"username": "new"})
+            response = self.client.get(self.url + "?page=2")
+            self.assertEqual(response.context["recipes"].paginator.count, 5)
+
+    def test_recipe_home_page_query_beyond_last_page_shows_last_page(self) -> None:
+        self.make_recipe_in_batch()  # creates 8 recipes by default
+        with patch("recipes.views.PER_PAGE", new=3):
+            response = self.client.get(self.url + "?page=99")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context["recipes"].number, 3)
@@ -0,0 +1,130 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+
+from recipes.cache import get_page_cache_stats
+from recipes.models import Category, Recipe
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+
+class RecipePageCacheTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.recipe = self.make_recipe(title="Cached recipe")
+        self.home_url = reverse("recipes:home")
+        self.detail_url = reverse("recipes:recipe", kwargs={"pk": self.recipe.pk})
+
+    def assertCacheStatus(self, url: str, status: str) -> None:  # noqa: N802
+        response = self.client.get(url)
+        self.assertEqual(response["X-Page-Cache"], status)
+
+    def test_anonymous_repeat_request_is_served_from_cache(self) -> None:
+        self.assertCacheStatus(self.home_url, "miss")
+        with self.assertNumQueries(0):
+            response = self.client.get(self.home_url)
+        self.assertEqual(response["X-Page-Cache"], "hit")
+        self.assertContains(response, "Cached recipe")
+        self.assertEqual(get_page_cache_stats()["hits"], 1)
+        self.assertEqual(get_page_cache_stats()["misses"], 1)
+
+    def test_pages_are_keyed_by_query_string(self) -> None:
+        self.assertCacheStatus(self.home_url, "miss")
+        self.assertCacheStatus(self.home_url + "?page=1", "miss")
+        self.assertCacheStatus(self.home_url + "?page=1&utm=x", "hit")
+
+    @override_settings(CACHES={
+        **settings.CACHES,
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    })
+    def test_pages_render_without_a_storing_cache(self) -> None:
+        self.assertCacheStatus(self.home_url, "miss")
+        self.assertCacheStatus(self.home_url, "miss")
+
+    def test_authenticated_users_bypass_the_cache(self) -> None:
+        User.objects.create_user(username="reader", password="Str0ngP@ss")  # noqa: S106
+        self.client.login(username="reader", password="Str0ngP@ss")  # noqa: S106
+        self.assertCacheStatus(self.home_url, "bypass")
+        self.assertCacheStatus(self.home_url, "bypass")
+
+    def test_unpublishing_a_recipe_invalidates_list_and_detail(self) -> None:
+        self.assertCacheStatus(self.home_url, "miss")
+        self.assertCacheStatus(self.detail_url, "miss")
+        self.recipe.is_published = False
+        self.recipe.save()
+        response = self.client.get(self.home_url)
+        self.assertNotContains(response, "Cached recipe")
+        self.assertEqual(self.client.get(self.detail_url).status_code, 404)
+
+    def test_editing_a_published_recipe_invalidates_its_pages(self) -> None:
+        self.assertCacheStatus(self.detail_url, "miss")
+        self.recipe.title = "Edited recipe"
+        self.recipe.save()
+        self.assertContains(self.client.get(self.detail_url), "Edited recipe")
+
+    def test_renaming_its_category_invalidates_the_detail_page(self) -> None:
+        self.assertCacheStatus(self.detail_url, "miss")
+        category = Category.objects.get(recipe=self.recipe)
+        category.name = "Renamed category"
+        category.save()
+        self.assertContains(self.client.get(self.detail_url), "Renamed category")
+
+    def test_renaming_its_author_invalidates_the_detail_page(self) -> None:
+        self.assertCacheStatus(self.detail_url, "miss")
+        author = User.objects.get(recipe=self.recipe)
+        author.first_name = "Renamed"
+        author.save()
+        self.assertContains(self.client.get(self.detail_url), "Renamed")
+
+    def test_author_logins_keep_the_detail_page(self) -> None:
+        self.assertCacheStatus(self.detail_url, "miss")
+        author = User.objects.get(recipe=self.recipe)
+        author.save(update_fields=["last_login"])
+        self.assertCacheStatus(self.detail_url, "hit")
+
+    def test_deleting_a_published_recipe_invalidates_list(self) -> None:
+        self.assertCacheStatus(self.home_url, "miss")
+        Recipe.objects.get(pk=self.recipe.pk).delete()
+        self.assertNotContains(self.client.get(self.home_url), "Cached recipe")
+
+    def test_saving_a_draft_keeps_cached_pages(self) -> None:
+        self.assertCacheStatus(self.home_url, "miss")
+        self.make_recipe(
+            title="Draft", slug="draft", author={"username": "drafter"},
+            category=self.recipe.category, is_published=False,
+        )
+        self.assertCacheStatus(self.home_url, "hit")
+
+    def test_editing_one_recipe_keeps_other_detail_pages(self) -> None:
+        other = self.make_recipe(slug="other", author={"username": "other"})
+        other_url = reverse("recipes:recipe", kwargs={"pk": other.pk})
+        self.assertCacheStatus(self.detail_url, "miss")
+        self.assertCacheStatus(other_url, "miss")
+        other.title = "Changed"
+        other.save()
+        self.assertCacheStatus(self.detail_url, "hit")
+        self.assertCacheStatus(other_url, "miss")
+
+    def test_admin_list_editable_publish_toggle_invalidates_list(self) -> None:
+        draft = self.make_recipe(
+            title="Soon public", slug="soon", author={"username": "soon"},
+            is_published=False,
+        )
+        self.assertNotContains(self.client.get(self.home_url), "Soon public")
+        User.objects.create_superuser(username="admin", password="Str0ngP@ss")  # noqa: S106
+        admin_client = self.client_class()
+        admin_client.login(username="admin", password="Str0ngP@ss")  # noqa: S106
+        changelist = reverse("admin:recipes_recipe_changelist")
+        recipes = list(Recipe.objects.order_by("-id"))
+        data = {
+            "form-TOTAL_FORMS": str(len(recipes)),
+            "form-INITIAL_FORMS": str(len(recipes)),
+            "_save": "Save",
+        }
+        for index, recipe in enumerate(recipes):
+            data[f"form-{index}-id"] = str(recipe.pk)
+            if recipe.pk == draft.pk or recipe.is_published:
+                data[f"form-{index}-is_published"] = "on"
+        response = admin_client.post(changelist, data)
+        self.assertEqual(response.status_code, 302)
+        self.assertContains(self.client.get(self.home_url), "Soon public")
@@ -0,0 +1,113 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+from unittest.mock import patch
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.test import override_settings
+from django.urls import reverse
+
+from recipes.tests.test_recipe_base import RecipeTestBase
+from utils.db import PRIMARY_PIN_COOKIE, PrimaryReplicaRouter
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaRoutingViewTest(RecipeTestBase):
+    """Records where the router sends reads, then runs them on the primary."""
+
+    @contextmanager
+    def recording_reads(self) -> Iterator[list[str]]:
+        aliases: list[str] = []
+        db_for_read = PrimaryReplicaRouter.db_for_read
+
+        def record(
+            router: PrimaryReplicaRouter, model: type[Model], **hints: Any,  # noqa: ANN401
+        ) -> str:
+            aliases.append(db_for_read(router, model, **hints))
+            return DEFAULT_DB_ALIAS
+
+        with patch.object(PrimaryReplicaRouter, "db_for_read", record):
+            yield aliases
+
+    def read_aliases(self, url: str) -> set[str]:
+        with self.recording_reads() as aliases:
+            self.client.get(url)
+        return set(aliases)
+
+    def test_public_pages_read_from_the_replicas(self) -> None:
+        recipe = self.make_recipe()
+        urls = [
+            reverse("recipes:home"),
+            reverse("recipes:category", kwargs={"category_id": recipe.category_id}),
+            reverse("recipes:search") + "?q=Recipe",
+            reverse("recipes:categories"),
+            reverse("recipes:recipe", kwargs={"pk": recipe.pk}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.read_aliases(url), {"replica_1"})
+
+    def test_clients_that_just_wrote_read_from_the_primary(self) -> None:
+        self.make_recipe()
+        self.client.cookies[PRIMARY_PIN_COOKIE] = "1"
+        self.assertEqual(self.read_aliases(reverse("recipes:home")), {DEFAULT_DB_ALIAS})
+
+    def test_pages_read_from_a_replica_are_not_cached(self) -> None:
+        recipe = self.make_recipe()
+        urls = [
+            reverse("recipes:home"),
+            reverse("recipes:recipe", kwargs={"pk": recipe.pk}),
+            reverse("recipes:feed", args=["rss"]),
+        ]
+        with self.recording_reads():
+            for url in urls:
+                with self.subTest(url=url):
+                    self.client.get(url)
+                    self.assertEqual(self.client.get(url)["X-Page-Cache"], "miss")
+
+    def test_pages_read_from_the_primary_are_cached(self) -> None:
+        self.make_recipe()
+        self.client.cookies[PRIMARY_PIN_COOKIE] = "1"
+        url = reverse("recipes:home")
+        with self.recording_reads():
+            self.client.get(url)
+            self.assertEqual(self.client.get(url)["X-Page-Cache"], "hit")
+
+    def test_counts_read_from_a_replica_are_not_cached(self) -> None:
+        self.make_recipe_in_batch(count=2)
+        url = reverse("recipes:home") + "?page=2"
+        with patch("recipes.views.PER_PAGE", new=1), self.recording_reads():
+            self.client.get(url)
+            # The COUNT(*) and the page SELECT, again
+            with self.assertNumQueries(2):
+                self.client.get(url)
+
+    def test_sitemaps_read_from_a_replica_are_not_cached(self) -> None:
+        self.make_recipe()
+        url = reverse("recipes:sitemap")
+        with self.recording_reads():
+            for _ in range(2):
+                response = self.client.get(url)
+                self.assertTrue(response.streaming)
+                b"".join(response.streaming_content)
+
+    def test_dashboard_reads_from_the_primary(self) -> None:
+        self.client.force_login(self.make_author(username="chef"))
+        aliases = self.read_aliases(reverse("authors:dashboard"))
+        self.assertEqual(aliases, {DEFAULT_DB_ALIAS})
+
+    def test_logging_in_pins_the_client_to_the_primary(self) -> None:
+        self.make_author(username="chef")
+        response = self.client.post(
+            reverse("authors:login_create"),
+            {"username": "chef", "password": "1234567"},
+        )
+        cookie = response.cookies[PRIMARY_PIN_COOKIE]
+        self.assertEqual(cookie["max-age"], 5)
+        self.assertTrue(cookie["httponly"])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_plain_reads_do_not_pin(self) -> None:
+        response = self.client.get(reverse("recipes:home"))
+        self.assertNotIn(PRIMARY_PIN_COOKIE, response.cookies)
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from django.urls import resolve, reverse
 
 from recipes import views
@@ -64,3 +66,11 @@ class RecipeSearchViewTest(RecipeTestBase):
             "Search for 'bolo'",
         )
         self.assertContains(response, "Search for &#x27;bolo&#x27; | Recipes")
+
+    def test_recipe_search_query_count_does_not_grow_with_recipes(self) -> None:
+        self.create_recipes(8, recipe_kwargs={"title": "bolo incrível"})
+        url = reverse("recipes:search") + "?q=bolo"
+        # One COUNT(*) for the paginator and one SELECT joining author/category
+        with patch("recipes.views.PER_PAGE", new=6), self.assertNumQueries(2):
+            response = self.client.get(url)
+            self.assertEqual(len(response.context["recipes"]), 6)
@@ -0,0 +1,103 @@
+import xml.etree.ElementTree as ET
+
+from django.http import StreamingHttpResponse
+from django.test import override_settings
+from django.urls import reverse
+
+from recipes.sitemaps import SITEMAP_NS
+from recipes.tests.test_recipe_base import RecipeTestBase
+
+NS = {"sm": SITEMAP_NS}
+
+
+def sitemap_page_url(section: str, page: int) -> str:
+    return reverse(
+        "recipes:sitemap_section", kwargs={"section": section, "page": page},
+    )
+
+
+@override_settings(SITEMAP_PAGE_SIZE=3)
+class SitemapViewTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.recipes = self.make_recipe_in_batch(4)
+
+    def read(self, url: str) -> ET.Element:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/xml; charset=utf-8")
+        # Parses the view's own output, not untrusted input
+        return ET.fromstring(b"".join(response))  # noqa: S314
+
+    def test_index_lists_a_sitemap_per_block_of_ids(self) -> None:
+        index = self.read(reverse("recipes:sitemap"))
+        locations = [loc.text for loc in index.findall("sm:sitemap/sm:loc", NS)]
+        # Ids 1 to 4 fall in the blocks 1-3 and 4-6
+        self.assertEqual(locations, [
+            f"http://testserver{sitemap_page_url(section, page)}"
+            for section in ("recipes", "categories") for page in (1, 2)
+        ])
+        lastmod = index.findtext("sm:sitemap/sm:lastmod", namespaces=NS)
+        self.assertEqual(
+            lastmod, self.recipes[2].updated_at.isoformat(timespec="seconds"),
+        )
+
+    def test_sitemap_lists_published_recipes_of_its_block(self) -> None:
+        self.recipes[0].is_published = False
+        self.recipes[0].save()
+        urlset = self.read(sitemap_page_url("recipes", 1))
+        locations = [loc.text for loc in urlset.findall("sm:url/sm:loc", NS)]
+        self.assertEqual(locations, [
+            f"http://testserver{reverse('recipes:recipe', kwargs={'pk': recipe.pk})}"
+            for recipe in self.recipes[1:3]
+        ])
+        lastmods = [node.text for node in urlset.findall("sm:url/sm:lastmod", NS)]
+        self.assertEqual(lastmods, [
+            recipe.updated_at.isoformat(timespec="seconds")
+            for recipe in self.recipes[1:3]
+        ])
+
+    def test_category_sitemap_lists_categories_with_recipes(self) -> None:
+        self.make_category("empty")
+        urlset = self.read(sitemap_page_url("categories", 2))
+        locations = [loc.text for loc in urlset.findall("sm:url/sm:loc", NS)]
+        category_id = self.recipes[3].category_id
+        self.assertEqual(locations, [
+            "http://testserver"
+            + reverse("recipes:category", kwargs={"category_id": category_id}),
+        ])
+
+    def test_missing_sections_and_pages_are_404(self) -> None:
+        for url in (
+            sitemap_page_url("authors", 1),
+            sitemap_page_url("recipes", 0),
+            sitemap_page_url("recipes", 3),
+        ):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_sitemap_is_streamed_then_served_from_the_cache(self) -> None:
+        url = sitemap_page_url("recipes", 1)
+        first = self.client.get(url)
+        self.assertIsInstance(first, StreamingHttpResponse)
+        content = b"".join(first)
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertNotIsInstance(second, StreamingHttpResponse)
+        self.assertEqual(second.content, content)
+
+    def test_publishing_a_recipe_invalidates_the_cached_sitemaps(self) -> None:
+        draft = self.make_recipe(
+            slug="draft", author={"username": "draft"}, is_published=False,
+        )
+        index_url, page_url = reverse("recipes:sitemap"), sitemap_page_url("recipes", 2)
+        b"".join(self.client.get(index_url))
+        b"".join(self.client.get(page_url))
+        draft.is_published = True
+        draft.save()
+        detail_url = reverse("recipes:recipe", kwargs={"pk": draft.pk})
+        self.assertIn(detail_url.encode(), b"".join(self.client.get(page_url)))
+        self.assertIn(
+            sitemap_page_url("recipes", 2).encode(),
+            b"".join(self.client.get(index_url)),
+        )
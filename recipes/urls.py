@@ -1,16 +1,52 @@
-from django.urls import path
+from types import ModuleType
 
-from recipes import views
+from django.conf import settings
+from django.urls import URLPattern, path
+
+from recipes import api, async_views, feeds, sitemaps, views
 
 app_name = "recipes"
 
 
+def page_patterns(pages: ModuleType) -> list[URLPattern]:
+    """The public pages, from ``recipes.views`` or ``recipes.async_views``."""
+    return [
+        path("", pages.RecipeListViewHome.as_view(), name="home"),
+        path("recipes/search/", pages.RecipeListViewSearch.as_view(), name="search"),
+        path(
+            "recipes/category/<int:category_id>/",
+            pages.RecipeListViewCategory.as_view(), name="category",
+        ),
+        path("recipes/<int:pk>/", pages.RecipeDetail.as_view(), name="recipe"),
+    ]
+
+
 urlpatterns = [
-    path("", views.RecipeListViewHome.as_view(), name="home"),
-    path("recipes/search/", views.RecipeListViewSearch.as_view(), name="search"),
+    *page_patterns(async_views if settings.ASYNC_VIEWS else views),
+    path(
+        "recipes/categories/", views.RecipeCategoryIndex.as_view(), name="categories",
+    ),
+    path("api/recipes/", api.RecipeListApi.as_view(), name="api_list"),
+    path("api/recipes/search/", api.RecipeSearchApi.as_view(), name="api_search"),
+    path(
+        "api/recipes/category/<int:category_id>/", api.RecipeCategoryApi.as_view(),
+        name="api_category",
+    ),
+    path("api/recipes/<int:pk>/", api.RecipeDetailApi.as_view(), name="api_detail"),
+    path("feeds/<slug:feed_format>/", feeds.RecipeFeedView.as_view(), name="feed"),
+    path(
+        "feeds/category/<int:category_id>/<slug:feed_format>/",
+        feeds.RecipeFeedView.as_view(feed_class=feeds.CategoryRecipeFeed),
+        name="category_feed",
+    ),
+    path(
+        "feeds/author/<str:username>/<slug:feed_format>/",
+        feeds.RecipeFeedView.as_view(feed_class=feeds.AuthorRecipeFeed),
+        name="author_feed",
+    ),
+    path("sitemap.xml", sitemaps.SitemapIndex.as_view(), name="sitemap"),
     path(
-        "recipes/category/<int:category_id>/", views.RecipeListViewCategory.as_view(),
-        name="category",
+        "sitemap-<slug:section>-<int:page>.xml", sitemaps.SitemapSectionView.as_view(),
+        name="sitemap_section",
     ),
-    path("recipes/<int:pk>/", views.RecipeDetail.as_view(), name="recipe"),
 ]
@@ -1,34 +1,100 @@
+from datetime import datetime
 from functools import cached_property
 from typing import Any, Final
 
 from decouple import config
-from django.db.models import Q
+from django.db.models import Max
 from django.db.models.query import QuerySet
 from django.http.response import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.cache import quote_etag
 from django.utils.http import urlencode
 from django.views.generic import DetailView, ListView
 
-from recipes.models import Recipe
-from utils.pagination import make_pagination
+from recipes.cache import get_recipes_version, make_recipes_key
+from recipes.mixins import (
+    ConditionalGetMixin,
+    PageCacheMixin,
+    ReplicaReadMixin,
+    page_query,
+)
+from recipes.models import Category, Recipe
+from recipes.search import search_recipes
+from utils.pagination import PAGE_MODE, make_pagination, page_window
 
-PER_PAGE: Final[int] = config("PER_PAGE", default=6)
+PER_PAGE: Final[int] = config("PER_PAGE", default=6, cast=int)
 
 
-class RecipeListViewBase(ListView):
+class RecipeListViewBase(
+    ReplicaReadMixin, PageCacheMixin, ConditionalGetMixin, ListView,
+):
     model = Recipe
     context_object_name = "recipes"
     ordering = ("-id")
+    # PAGE_MODE renders numbered pages; CURSOR_MODE seeks on cursor_ordering and
+    # skips the COUNT(*), at the cost of only offering previous/next links.
+    pagination_mode = PAGE_MODE
+    cursor_ordering: tuple[str, ...] = ("-id",)
+    # Deleting or unpublishing a recipe moves no shown date forward
+    send_last_modified = False
 
     def get_queryset(self, *args, **kwargs) -> QuerySet[Recipe]:
         qs = super().get_queryset(*args, **kwargs)
-        return qs.filter(is_published=True)
+        return qs.published().for_listing()
+
+    def get_cursor_ordering(self) -> tuple[str, ...]:
+        return self.cursor_ordering
+
+    def get_count_cache_parts(self) -> tuple[Any, ...]:
+        """Everything besides the view itself that narrows the listing."""
+        return ()
+
+    def get_known_count(self) -> int | None:
+        """The listing's size if it is kept somewhere cheaper than a COUNT(*)."""
+        return None
+
+    def get_count_cache_key(self) -> str:
+        return make_recipes_key(
+            "count", type(self).__name__, *self.get_count_cache_parts(),
+        )
+
+    def get_updated_at_queryset(self) -> QuerySet[Recipe, datetime]:
+        window = page_window(
+            self.request, self.get_queryset(), PER_PAGE,
+            mode=self.pagination_mode, cursor_ordering=self.get_cursor_ordering(),
+            count_cache_key=self.get_count_cache_key(),
+            known_count=self.get_known_count(),
+        )
+        return window.values_list("updated_at", flat=True)
+
+    def get_last_modified(self) -> datetime | None:
+        return max(self.get_updated_at_queryset(), default=None)
+
+    def get_etag(self, last_modified: datetime | None) -> str | None:
+        return self.make_etag(last_modified, get_recipes_version())
+
+    def make_etag(self, last_modified: datetime | None, version: int) -> str:
+        # The recipes version covers deletions, which never move updated_at
+        return quote_etag(make_recipes_key(
+            "etag", type(self).__name__, self.request.path,
+            page_query(self.request), last_modified, version=version,
+        ))
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        page_obj, pagination_range = make_pagination(
-            self.request, context.get("recipes"), PER_PAGE,
+        # Async views paginate ahead and pass the page in
+        if "pagination_range" not in kwargs:
+            page_obj, pagination_range = make_pagination(
+                self.request, context.get("recipes"), PER_PAGE,
+                mode=self.pagination_mode, cursor_ordering=self.get_cursor_ordering(),
+                count_cache_key=self.get_count_cache_key(),
+                known_count=self.get_known_count(),
+            )
+            context.update({"recipes": page_obj, "pagination_range": pagination_range})
+        page_obj = context["recipes"]
+        self.rendered_last_modified = max(
+            (recipe.updated_at for recipe in page_obj), default=None,
         )
-        context.update({"recipes": page_obj, "pagination_range": pagination_range})
         return context
 
 
@@ -39,24 +105,63 @@ class RecipeListViewHome(RecipeListViewBase):
 class RecipeListViewCategory(RecipeListViewBase):
     template_name = "recipes/pages/category.html"
 
+    def get_category_queryset(self) -> QuerySet[Category]:
+        # The denormalized count answers both "is there anything to list" and
+        # the paginator's total, no EXISTS or COUNT(*) over the recipes
+        return Category.objects.only("name", "published_recipe_count").filter(
+            pk=self.kwargs.get("category_id"), published_recipe_count__gt=0,
+        )
+
+    @cached_property
+    def category(self) -> Category:
+        return get_object_or_404(self.get_category_queryset())
+
     def get_queryset(self, *args, **kwargs) -> QuerySet[Recipe]:
-        category_id = self.kwargs.get("category_id")
-        qs = (super().get_queryset(*args, **kwargs))
-        qs = qs.filter(is_published=True, category__id=category_id)
-        if not qs.exists():
-            msg = "No recipes found in this category"
-            raise Http404(msg)
-        return qs
+        qs = super().get_queryset(*args, **kwargs)
+        return qs.filter(category=self.category)
+
+    def get_count_cache_parts(self) -> tuple[Any, ...]:
+        return (self.kwargs.get("category_id"),)
+
+    def get_known_count(self) -> int | None:
+        return self.category.published_recipe_count
+
+    def get_context_data(self, **kwargs) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context["title"] = f"{self.category.name} - Category"
+        return context
+
+
+class RecipeCategoryIndex(
+    ReplicaReadMixin, PageCacheMixin, ConditionalGetMixin, ListView,
+):
+    template_name = "recipes/pages/categories.html"
+    context_object_name = "categories"
+    # Unpublishing a category's newest recipe moves its date backwards
+    send_last_modified = False
+
+    def get_queryset(self) -> QuerySet[Category]:
+        return (
+            Category.objects.filter(published_recipe_count__gt=0)
+            .only("name", "published_recipe_count", "latest_recipe_at")
+            .order_by("name", "id")
+        )
+
+    def get_last_modified(self) -> datetime | None:
+        return self.get_queryset().aggregate(
+            last_modified=Max("latest_recipe_at"),
+        )["last_modified"]
+
+    def get_etag(self, last_modified: datetime | None) -> str | None:
+        # Unpublishing moves no date forward, the recipes version does change
+        return quote_etag(make_recipes_key("etag", type(self).__name__, last_modified))
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
-        recipes = context["recipes"]
-        if not recipes:
-            context["title"] = "Unknown Category"
-            return context
-        category_obj = recipes[0].category
-        category_name = category_obj.name if category_obj else "Desconhecido"
-        context["title"] = f"{category_name} - Category"
+        self.rendered_last_modified = max(
+            (category.latest_recipe_at for category in context["categories"]),
+            default=None,
+        )
         return context
 
 
@@ -72,10 +177,10 @@ class RecipeListViewSearch(RecipeListViewBase):
         if not search_term:
             raise Http404
         qs = super().get_queryset()
-        return qs.filter(
-            Q(title__icontains=search_term) | Q(description__icontains=search_term),
-            is_published=True,
-        )
+        return search_recipes(qs, search_term)
+
+    def get_count_cache_parts(self) -> tuple[Any, ...]:
+        return (" ".join(self.search_term.lower().split()),)
 
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
@@ -91,16 +196,42 @@ class RecipeListViewSearch(RecipeListViewBase):
         return context
 
 
-class RecipeDetail(DetailView):
+class RecipeDetail(
+    ReplicaReadMixin, PageCacheMixin, ConditionalGetMixin, DetailView,
+):
     model = Recipe
     context_object_name = "recipe"
     template_name = "recipes/pages/recipe-view.html"
 
+    def get_page_cache_version(self) -> int:
+        return get_recipes_version(self.kwargs["pk"])
+
+    def get_updated_at_queryset(self) -> QuerySet[Recipe]:
+        return (
+            Recipe.objects.published()
+            .filter(pk=self.kwargs["pk"])
+            .values_list("updated_at", flat=True)
+        )
+
+    def get_last_modified(self) -> datetime | None:
+        return self.get_updated_at_queryset().first()
+
+    def get_etag(self, last_modified: datetime | None) -> str | None:
+        if last_modified is None:
+            return None
+        return self.make_etag(last_modified, get_recipes_version(self.kwargs["pk"]))
+
+    def make_etag(self, last_modified: datetime, version: int) -> str:
+        return quote_etag(make_recipes_key(
+            "etag", self.kwargs["pk"], last_modified, version=version,
+        ))
+
     def get_context_data(self, **kwargs) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
         context["is_detail_page"] = True
+        self.rendered_last_modified = self.object.updated_at
         return context
 
     def get_queryset(self) -> QuerySet[Recipe]:
         qs = super().get_queryset()
-        return qs.filter(is_published=True)
+        return qs.published().for_detail()
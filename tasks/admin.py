@@ -0,0 +1,14 @@
+from django.contrib import admin
+
+from tasks.models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "status", "attempts", "run_at", "finished_at")
+    list_display_links = ("name",)
+    list_filter = ("status", "name")
+    search_fields = ("name", "last_error")
+    list_per_page = 50
+    ordering = ("-id",)
+    readonly_fields = ("started_at", "finished_at", "created_at", "locked_by")
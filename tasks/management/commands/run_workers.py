@@ -0,0 +1,86 @@
+import multiprocessing
+import os
+import signal
+import socket
+from types import FrameType
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connections
+
+from tasks.queue import work
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs queued tasks in a pool of worker processes. SIGINT or SIGTERM "
+        "lets every worker finish its current task before exiting."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--processes", type=int, default=os.cpu_count() or 1,
+                            help="Worker processes, 1 works in this process.")
+        parser.add_argument("--poll-interval", type=float,
+                            default=settings.TASKS_POLL_INTERVAL)
+        parser.add_argument("--batch-size", type=int, default=1,
+                            help="Tasks claimed per round trip.")
+        parser.add_argument("--burst", action="store_true",
+                            help="Exit once the queue is empty.")
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        worker_options = {
+            "poll_interval": options["poll_interval"],
+            "batch_size": options["batch_size"],
+            "burst": options["burst"],
+        }
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        if options["processes"] <= 1:
+            done = run_worker(f"{prefix}:0", worker_options)
+            self.stdout.write(f"Ran {done} tasks.")
+            return
+
+        # Forked workers skip Django setup, the parent's connections must not
+        # be shared with them
+        connections.close_all()
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("fork" if "fork" in methods else None)
+        processes = [
+            context.Process(
+                target=run_worker, args=(f"{prefix}:{number}", worker_options),
+                name=f"task-worker-{number}",
+            )
+            for number in range(options["processes"])
+        ]
+        for process in processes:
+            process.start()
+        self.stdout.write(f"Started {len(processes)} workers.")
+
+        def forward(signum: int, frame: FrameType | None) -> None:
+            for process in processes:
+                if process.pid is not None and process.is_alive():
+                    os.kill(process.pid, signal.SIGTERM)
+
+        signal.signal(signal.SIGINT, forward)
+        signal.signal(signal.SIGTERM, forward)
+        for process in processes:
+            process.join()
+
+
+def run_worker(worker: str, options: dict[str, Any]) -> int:
+    stopping = False
+
+    def stop(signum: int, frame: FrameType | None) -> None:
+        nonlocal stopping
+        stopping = True
+
+    previous = {
+        signum: signal.signal(signum, stop)
+        for signum in (signal.SIGINT, signal.SIGTERM)
+    }
+    try:
+        return work(worker, should_stop=lambda: stopping, **options)
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+        connections.close_all()
@@ -0,0 +1,23 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from tasks.queue import queue_stats
+
+
+class Command(BaseCommand):
+    help = "Shows the task queue depth, lag and outcomes per task."
+
+    def handle(self, *args: Any, **options: Any) -> None:  # noqa: ANN401
+        stats = queue_stats()
+        self.stdout.write(
+            f"queued={stats['queued']} running={stats['running']} "
+            f"succeeded={stats['succeeded']} failed={stats['failed']} "
+            f"lag={stats['lag_seconds']:.1f}s",
+        )
+        for name, counts in sorted(stats["by_name"].items()):
+            details = " ".join(
+                f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+                for key, value in sorted(counts.items())
+            )
+            self.stdout.write(f"  {name}: {details}")
@@ -0,0 +1,49 @@
+from django.db import models
+from django.utils import timezone
+
+
+class TaskQuerySet(models.QuerySet["Task"]):
+    def ready(self) -> "TaskQuerySet":
+        return self.filter(status=Task.QUEUED, run_at__lte=timezone.now())
+
+
+class Task(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    )
+
+    name = models.CharField(max_length=200)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True, default="")
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            # Workers poll WHERE status = 'queued' AND run_at <= ? ORDER BY run_at
+            models.Index(
+                "run_at", "id",
+                name="task_queued_run_at_idx",
+                condition=models.Q(status="queued"),
+            ),
+            # Finding tasks whose worker died, and the metrics per status
+            models.Index(fields=("status", "started_at"), name="task_status_idx"),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.name}#{self.pk} ({self.status})"
@@ -0,0 +1,262 @@
+"""
+A small task queue kept in the database, no broker needed.
+
+Functions decorated with ``@task`` are registered by name. ``enqueue`` only
+inserts a row, in the caller's transaction, so work scheduled by a save shows
+up for the workers exactly when that save commits and vanishes if it rolls
+back. ``manage.py run_workers`` claims ready rows, runs them and retries
+failures with exponential backoff.
+"""
+import logging
+import time
+import traceback
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Avg, Count, F, Min
+from django.utils import timezone
+
+from tasks.models import Task
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 5
+# Enough of a traceback to debug from the admin, short enough for every row
+ERROR_MAX_LENGTH = 4000
+
+
+@dataclass(frozen=True)
+class TaskFunction:
+    name: str
+    func: Callable[..., Any]
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+
+    def __call__(self, **kwargs: Any) -> Any:  # noqa: ANN401
+        return self.func(**kwargs)
+
+    def enqueue(self, *, run_at: datetime | None = None, **kwargs: Any) -> Task:  # noqa: ANN401
+        return enqueue(
+            self.name, kwargs, run_at=run_at, max_attempts=self.max_attempts,
+        )
+
+
+REGISTRY: dict[str, TaskFunction] = {}
+
+
+def task(
+    func: Callable[..., Any] | None = None,
+    *,
+    name: str | None = None,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> Any:  # noqa: ANN401
+    """
+    Registers ``func`` as a task. Its keyword arguments must be JSON
+    serializable, pass ids rather than model instances.
+    """
+    def register(func: Callable[..., Any]) -> TaskFunction:
+        task_function = TaskFunction(
+            name or f"{func.__module__}.{func.__qualname__}", func, max_attempts,
+        )
+        REGISTRY[task_function.name] = task_function
+        return task_function
+
+    return register(func) if func is not None else register
+
+
+def enqueue(
+    name: str,
+    kwargs: dict[str, Any] | None = None,
+    *,
+    run_at: datetime | None = None,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> Task:
+    return Task.objects.create(
+        name=name, kwargs=kwargs or {}, run_at=run_at or timezone.now(),
+        max_attempts=max_attempts,
+    )
+
+
+def enqueue_many(
+    name: str,
+    kwargs_list: list[dict[str, Any]],
+    *,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    batch_size: int = 1000,
+) -> int:
+    """Queues one task per kwargs with bulk inserts, e.g. for backfills."""
+    now = timezone.now()
+    created = Task.objects.bulk_create(
+        [
+            Task(name=name, kwargs=kwargs, run_at=now, max_attempts=max_attempts)
+            for kwargs in kwargs_list
+        ],
+        batch_size=batch_size,
+    )
+    return len(created)
+
+
+def retry_delay(
+    attempt: int, base: float | None = None, cap: float | None = None,
+) -> timedelta:
+    """
+    Waits twice as long after every failed attempt, up to ``cap`` seconds.
+
+    >>> [retry_delay(n, base=5, cap=60).seconds for n in range(1, 6)]
+    [5, 10, 20, 40, 60]
+    """
+    base = settings.TASKS_RETRY_BACKOFF if base is None else base
+    cap = settings.TASKS_RETRY_BACKOFF_MAX if cap is None else cap
+    return timedelta(seconds=min(cap, base * 2 ** (attempt - 1)))
+
+
+def claim(worker: str, limit: int = 1) -> list[Task]:
+    """Marks up to ``limit`` ready tasks as running by ``worker``."""
+    using = router.db_for_write(Task)
+    now = timezone.now()
+    ready = Task.objects.using(using).ready().order_by("run_at", "id")
+    running = {
+        "status": Task.RUNNING, "locked_by": worker, "started_at": now,
+        "attempts": F("attempts") + 1,
+    }
+    if connections[using].features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=using):
+            ids = list(
+                ready.select_for_update(skip_locked=True)
+                .values_list("id", flat=True)[:limit],
+            )
+            Task.objects.using(using).filter(id__in=ids).update(**running)
+    else:
+        # SQLite serializes writers, a compare and set per row is enough to
+        # keep two workers from running the same task
+        ids = [
+            task_id
+            for task_id in ready.values_list("id", flat=True)[:limit]
+            if Task.objects.using(using)
+            .filter(id=task_id, status=Task.QUEUED)
+            .update(**running)
+        ]
+    return list(Task.objects.using(using).filter(id__in=ids).order_by("run_at", "id"))
+
+
+def run_task(task: Task) -> bool:
+    """Runs a claimed task and records the outcome, returns whether it worked."""
+    queryset = Task.objects.filter(pk=task.pk, locked_by=task.locked_by)
+    try:
+        task_function = REGISTRY.get(task.name)
+        if task_function is None:
+            msg = f"No task registered as {task.name!r}"
+            raise LookupError(msg)  # noqa: TRY301
+        task_function(**task.kwargs)
+    except Exception:
+        error = traceback.format_exc()[-ERROR_MAX_LENGTH:]
+        now = timezone.now()
+        if task.attempts >= task.max_attempts:
+            logger.exception("Task %s failed for good", task)
+            queryset.update(status=Task.FAILED, finished_at=now, last_error=error)
+        else:
+            logger.warning("Task %s failed, retrying", task, exc_info=True)
+            queryset.update(
+                status=Task.QUEUED, locked_by="", last_error=error,
+                run_at=now + retry_delay(task.attempts),
+            )
+        return False
+    queryset.update(status=Task.SUCCEEDED, finished_at=timezone.now())
+    return True
+
+
+def requeue_stale(timeout: float | None = None) -> int:
+    """Hands tasks whose worker died mid-run back to the queue."""
+    timeout = settings.TASKS_LOCK_TIMEOUT if timeout is None else timeout
+    stale = Task.objects.filter(
+        status=Task.RUNNING,
+        started_at__lt=timezone.now() - timedelta(seconds=timeout),
+    )
+    now = timezone.now()
+    stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Task.FAILED, finished_at=now, last_error="Worker lost",
+    )
+    return stale.update(status=Task.QUEUED, locked_by="", run_at=now)
+
+
+def purge_finished(older_than: float | None = None) -> int:
+    older_than = settings.TASKS_KEEP_SUCCEEDED if older_than is None else older_than
+    deleted, _ = Task.objects.filter(
+        status=Task.SUCCEEDED,
+        finished_at__lt=timezone.now() - timedelta(seconds=older_than),
+    ).delete()
+    return deleted
+
+
+def run_pending(worker: str = "inline", limit: int | None = None) -> int:
+    """Runs ready tasks in this process until none are left, or ``limit``."""
+    done = 0
+    while limit is None or done < limit:
+        claimed = claim(worker)
+        if not claimed:
+            break
+        run_task(claimed[0])
+        done += 1
+    return done
+
+
+def work(
+    worker: str,
+    *,
+    poll_interval: float | None = None,
+    batch_size: int = 1,
+    burst: bool = False,
+    should_stop: Callable[[], bool] = lambda: False,
+) -> int:
+    """
+    The loop of one worker. Polls every ``poll_interval`` seconds while the
+    queue is empty, ``burst`` returns instead once nothing is ready.
+    """
+    if poll_interval is None:
+        poll_interval = settings.TASKS_POLL_INTERVAL
+    done = 0
+    next_maintenance = 0.0
+    while not should_stop():
+        if time.monotonic() >= next_maintenance:
+            requeue_stale()
+            purge_finished()
+            next_maintenance = time.monotonic() + settings.TASKS_LOCK_TIMEOUT / 10
+        claimed = claim(worker, batch_size)
+        for task in claimed:
+            run_task(task)
+            done += 1
+        if not claimed:
+            if burst:
+                break
+            time.sleep(poll_interval)
+    return done
+
+
+def queue_stats() -> dict[str, Any]:
+    """Counts per task name and status, plus how late the oldest ready task is."""
+    by_name: dict[str, dict[str, Any]] = {}
+    for row in Task.objects.values("name", "status").annotate(total=Count("id")):
+        by_name.setdefault(row["name"], {})[row["status"]] = row["total"]
+    durations = Task.objects.filter(status=Task.SUCCEEDED).values("name").annotate(
+        average=Avg(F("finished_at") - F("started_at")),
+    )
+    for duration in durations:
+        average = duration["average"]
+        by_name[duration["name"]]["average_seconds"] = (
+            average.total_seconds() if isinstance(average, timedelta)
+            # SQLite returns the interval in microseconds
+            else (average or 0) / 1_000_000
+        )
+    oldest = Task.objects.ready().aggregate(oldest=Min("run_at"))["oldest"]
+    totals = {status: 0 for status, _ in Task.STATUS_CHOICES}
+    for counts in by_name.values():
+        for status in totals:
+            totals[status] += counts.get(status, 0)
+    return {
+        **totals,
+        "lag_seconds": (timezone.now() - oldest).total_seconds() if oldest else 0.0,
+        "by_name": by_name,
+    }
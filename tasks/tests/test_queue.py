@@ -0,0 +1,117 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.queue import (
+    claim,
+    enqueue,
+    queue_stats,
+    requeue_stale,
+    run_pending,
+    task,
+)
+
+calls: list[int] = []
+
+
+@task(name="tests.record")
+def record(value: int) -> None:
+    calls.append(value)
+
+
+@task(name="tests.explode", max_attempts=2)
+def explode() -> None:
+    msg = "boom"
+    raise RuntimeError(msg)
+
+
+@override_settings(TASKS_RETRY_BACKOFF=5, TASKS_RETRY_BACKOFF_MAX=60)
+class TaskQueueTest(TestCase):
+    def setUp(self) -> None:
+        calls.clear()
+        return super().setUp()
+
+    def test_enqueued_task_runs_once_and_succeeds(self) -> None:
+        record.enqueue(value=3)
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(run_pending(), 0)
+
+        self.assertEqual(calls, [3])
+        done = Task.objects.get()
+        self.assertEqual((done.status, done.attempts), (Task.SUCCEEDED, 1))
+        self.assertIsNotNone(done.finished_at)
+
+    def test_tasks_enqueued_in_a_rolled_back_transaction_never_run(self) -> None:
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            record.enqueue(value=1)
+            raise RuntimeError
+        self.assertEqual(run_pending(), 0)
+
+    def test_tasks_scheduled_in_the_future_wait(self) -> None:
+        record.enqueue(value=1, run_at=timezone.now() + timedelta(minutes=1))
+        self.assertEqual(run_pending(), 0)
+
+    def test_claimed_task_is_not_handed_to_another_worker(self) -> None:
+        record.enqueue(value=1)
+        self.assertEqual(len(claim("first")), 1)
+        self.assertEqual(claim("second"), [])
+
+    def test_failed_task_is_retried_with_backoff_then_given_up(self) -> None:
+        explode.enqueue()
+        before = timezone.now()
+        run_pending()
+        retried = Task.objects.get()
+        self.assertEqual((retried.status, retried.attempts), (Task.QUEUED, 1))
+        self.assertIn("RuntimeError: boom", retried.last_error)
+        self.assertGreaterEqual(retried.run_at, before + timedelta(seconds=5))
+        self.assertEqual(run_pending(), 0)
+
+        Task.objects.update(run_at=timezone.now())
+        run_pending()
+        failed = Task.objects.get()
+        self.assertEqual((failed.status, failed.attempts), (Task.FAILED, 2))
+
+    def test_unknown_task_names_fail(self) -> None:
+        enqueue("tests.missing", max_attempts=1)
+        run_pending()
+        failed = Task.objects.get(status=Task.FAILED)
+        self.assertIn("No task registered", failed.last_error)
+
+    def test_tasks_of_lost_workers_are_requeued(self) -> None:
+        record.enqueue(value=1)
+        claim("lost")
+        Task.objects.update(started_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(requeue_stale(timeout=60), 1)
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(calls, [1])
+
+    def test_queue_stats_count_outcomes_per_task(self) -> None:
+        record.enqueue(value=1)
+        record.enqueue(value=2)
+        enqueue("tests.missing", max_attempts=1)
+        run_pending(limit=2)
+        record.enqueue(value=3)
+
+        stats = queue_stats()
+        self.assertEqual(
+            (stats["queued"], stats["succeeded"], stats["failed"]), (2, 2, 0),
+        )
+        self.assertEqual(stats["by_name"]["tests.record"]["succeeded"], 2)
+        self.assertGreaterEqual(stats["by_name"]["tests.record"]["average_seconds"], 0)
+        self.assertGreaterEqual(stats["lag_seconds"], 0)
+
+    def test_run_workers_burst_drains_the_queue(self) -> None:
+        for value in range(3):
+            record.enqueue(value=value)
+        out = StringIO()
+        call_command("run_workers", "--processes", "1", "--burst", stdout=out)
+        self.assertIn("Ran 3 tasks.", out.getvalue())
+        self.assertEqual(calls, [0, 1, 2])
+
+        call_command("task_stats", stdout=out)
+        self.assertIn("tests.record:", out.getvalue())
@@ -0,0 +1,191 @@
+"""
+Home page throughput under WSGI and ASGI at increasing concurrency.
+
+Seeds ``--rows`` recipes like ``bench_views`` and, at every concurrency level,
+sends ``--requests`` home page requests three ways, all in process so that no
+server is needed:
+
+- ``wsgi``: the sync views, a thread per concurrent client like a threaded
+  WSGI worker.
+- ``asgi-sync``: the same views through the async handler, which runs each of
+  them in a thread.
+- ``asgi-async``: ``recipes.async_views`` through the async handler.
+
+Every request gets its own thread sensitive context, as under ``core.asgi``,
+and closes its connections when done. ``--db-latency-ms`` sleeps before each
+query to stand in for a database across the network, the waits async views
+can overlap; SQLite answers too fast to show them. Caches are off.
+
+    python -m tests.benchmarks.bench_asgi --rows 10000 --concurrency 1,10,50
+"""
+import argparse
+import asyncio
+import json
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+from tests.benchmarks.bench_views import (
+    RESULTS_DIR,
+    latency_stats,
+    seed,
+    setup_django,
+    use_database,
+)
+
+MODES = ("wsgi", "asgi-sync", "asgi-async")
+
+
+def make_urlconf(*, use_async: bool) -> ModuleType:
+    """The project's URLs, with the public pages of the wanted flavour first."""
+    from django.urls import include, path
+
+    from recipes import async_views, views
+    from recipes.urls import app_name, page_patterns, urlpatterns
+
+    pages = async_views if use_async else views
+    urlconf = ModuleType(f"bench_urls_{pages.__name__}")
+    urlconf.urlpatterns = [
+        path("", include(([*page_patterns(pages), *urlpatterns], app_name))),
+        path("authors/", include("authors.urls")),
+    ]
+    return urlconf
+
+
+def add_query_latency(seconds: float) -> None:
+    from django.db.backends.signals import connection_created
+
+    def slow_execute(
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,  # noqa: ANN401
+        many: bool,  # noqa: FBT001
+        context: dict[str, Any],
+    ) -> Any:  # noqa: ANN401
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender: Any, connection: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        connection.execute_wrappers.append(slow_execute)
+
+    connection_created.connect(install, weak=False)
+
+
+def _check(url: str, status_code: int) -> None:
+    if status_code != 200:
+        msg = f"{url} answered {status_code}"
+        raise RuntimeError(msg)
+
+
+def run_wsgi(url: str, requests: int, concurrency: int) -> tuple[list[float], float]:
+    from django.db import connections
+    from django.test import Client
+
+    local = threading.local()
+
+    def request(_: int) -> float:
+        if not hasattr(local, "client"):
+            local.client = Client()
+        start = time.perf_counter()
+        response = local.client.get(url)
+        elapsed = time.perf_counter() - start
+        connections.close_all()
+        _check(url, response.status_code)
+        return elapsed
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        start = time.perf_counter()
+        timings = list(pool.map(request, range(requests)))
+        return timings, time.perf_counter() - start
+
+
+async def run_asgi(
+    url: str, requests: int, concurrency: int,
+) -> tuple[list[float], float]:
+    from asgiref.sync import ThreadSensitiveContext, sync_to_async
+    from django.db import connections
+    from django.test import AsyncClient
+
+    client = AsyncClient()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request() -> float:
+        async with semaphore, ThreadSensitiveContext():
+            start = time.perf_counter()
+            response = await client.get(url)
+            elapsed = time.perf_counter() - start
+            await sync_to_async(connections.close_all)()
+        _check(url, response.status_code)
+        return elapsed
+
+    start = time.perf_counter()
+    timings = await asyncio.gather(*(request() for _ in range(requests)))
+    return list(timings), time.perf_counter() - start
+
+
+def bench(mode: str, requests: int, concurrency: int, warmup: int) -> dict[str, float]:
+    from django.test import override_settings
+    from django.urls import reverse
+
+    urlconf = make_urlconf(use_async=mode == "asgi-async")
+    with override_settings(ROOT_URLCONF=urlconf):
+        url = reverse("recipes:home")
+        if mode == "wsgi":
+            run_wsgi(url, warmup, concurrency)
+            timings, wall = run_wsgi(url, requests, concurrency)
+        else:
+            asyncio.run(run_asgi(url, warmup, concurrency))
+            timings, wall = asyncio.run(run_asgi(url, requests, concurrency))
+    # Requests overlap, throughput comes from the wall clock
+    return {**latency_stats(timings), "rps": round(requests / wall, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--concurrency", default="1,10,50",
+                        help="Comma separated numbers of concurrent clients.")
+    parser.add_argument("--requests", type=int, default=200,
+                        help="Measured requests per mode and concurrency.")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--db-latency-ms", type=float, default=0.0,
+                        help="Added before every query.")
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "asgi.json")
+    args = parser.parse_args()
+
+    setup_django(cached=False)
+    if args.db_latency_ms:
+        add_query_latency(args.db_latency_ms / 1000)
+
+    results: dict[str, dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        use_database(Path(directory) / "bench_asgi.sqlite3")
+        seed(args.rows)
+        print(f"{args.rows} recipes, {args.db_latency_ms} ms added per query")  # noqa: T201
+        print(f"{'clients':<9}{'mode':<12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")  # noqa: T201
+        for concurrency in map(int, args.concurrency.split(",")):
+            results[str(concurrency)] = {}
+            for mode in MODES:
+                stats = bench(mode, args.requests, concurrency, args.warmup)
+                results[str(concurrency)][mode] = stats
+                print(  # noqa: T201
+                    f"{concurrency:<9}{mode:<12}{stats['rps']:>10}"
+                    f"{stats['p50_ms']:>10}{stats['p99_ms']:>10}",
+                )
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps({
+        "meta": {"rows": args.rows, "db_latency_ms": args.db_latency_ms,
+                 "requests": args.requests},
+        "results": results,
+    }, indent=2))
+    print(f"\nWrote {args.output}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
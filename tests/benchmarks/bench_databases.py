@@ -0,0 +1,186 @@
+"""
+Measures concurrent read and write throughput under each database profile.
+
+Forks reader processes running the home page listing query and writer
+processes updating recipes, for a fixed time, against a fresh test database.
+SQLite runs twice, with its defaults (rollback journal, full sync) and with
+``settings.SQLITE_PRAGMAS``. Set ``DATABASE_ENGINE=postgresql`` (and
+``DATABASE_POOL=True`` or ``DATABASE_CONN_MAX_AGE``) to add the configured
+PostgreSQL server. Readers open a connection per operation unless
+``--persistent`` is given, as a worker does per request without
+``CONN_MAX_AGE`` or a pool.
+
+    python -m tests.benchmarks.bench_databases --readers 4 --writers 2
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+CATEGORIES = 10
+ROWS = 5000
+PER_PAGE = 9
+
+
+@dataclass
+class Profile:
+    name: str
+    pragmas: dict[str, Any] | None = None
+
+
+@dataclass
+class Result:
+    reads: int = 0
+    writes: int = 0
+    errors: int = 0
+
+
+def setup_django() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    os.environ.setdefault("DEBUG", "False")
+    import django
+
+    django.setup()
+
+
+def profiles() -> list[Profile]:
+    from django.conf import settings
+    from django.db import connection
+
+    if connection.vendor != "sqlite":
+        return [Profile(connection.vendor)]
+    return [
+        Profile("sqlite-default", {"journal_mode": "DELETE", "synchronous": "FULL"}),
+        Profile("sqlite-tuned", dict(settings.SQLITE_PRAGMAS)),
+    ]
+
+
+def create_database(directory: Path, profile: Profile) -> str:
+    from django.conf import settings
+    from django.db import connection, connections
+
+    connections.close_all()
+    if profile.pragmas is not None:
+        settings.SQLITE_PRAGMAS = profile.pragmas
+        test_name = str(directory / f"{profile.name}.sqlite3")
+        connection.settings_dict["TEST"]["NAME"] = test_name
+    return connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+
+def seed() -> None:
+    from django.contrib.auth.models import User
+
+    from recipes.factories import build_author, build_category, build_recipe
+    from recipes.models import Category, Recipe
+
+    categories = Category.objects.bulk_create(
+        [build_category(f"Category {i}") for i in range(CATEGORIES)],
+    )
+    author = User.objects.bulk_create([build_author(username="bench")])[0]
+    now = datetime.now(UTC)
+    Recipe.objects.bulk_create(
+        [
+            build_recipe(
+                title=f"Recipe {i}", slug=f"recipe-{i}", author=author,
+                category=categories[i % CATEGORIES], created_at=now, updated_at=now,
+            )
+            for i in range(ROWS)
+        ],
+        batch_size=500,
+    )
+
+
+def run_worker(role: str, seconds: float, persistent: bool, index: int) -> Result:  # noqa: FBT001
+    from django.db import OperationalError, close_old_connections, connections
+    from django.utils import timezone
+
+    from recipes.models import Recipe
+
+    rng = random.Random(index)  # noqa: S311
+    result = Result()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        try:
+            if role == "reader":
+                offset = rng.randrange(0, ROWS - PER_PAGE)
+                list(Recipe.objects.published().for_listing()[offset:offset + PER_PAGE])
+                result.reads += 1
+            else:
+                Recipe.objects.filter(pk=rng.randint(1, ROWS)).update(
+                    updated_at=timezone.now(),
+                )
+                result.writes += 1
+        except OperationalError:
+            result.errors += 1
+        if not persistent:
+            # What the end of a request does with CONN_MAX_AGE = 0
+            connections["default"].close()
+        else:
+            close_old_connections()
+    return result
+
+
+def run_profile(readers: int, writers: int, seconds: float, persistent: bool) -> Result:  # noqa: FBT001
+    from django.db import connections
+
+    # Children open their own connections, the parent's can't be shared
+    connections.close_all()
+    for connection in connections.all():
+        # Pools hold sockets and threads that a fork can't share
+        getattr(connection, "close_pool", lambda: None)()
+    roles = ["reader"] * readers + ["writer"] * writers
+    context = multiprocessing.get_context("fork")
+    with context.Pool(len(roles)) as pool:
+        results = pool.starmap(
+            run_worker,
+            [(role, seconds, persistent, i) for i, role in enumerate(roles)],
+        )
+    return Result(
+        reads=sum(result.reads for result in results),
+        writes=sum(result.writes for result in results),
+        errors=sum(result.errors for result in results),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--persistent", action="store_true",
+                        help="Keep each worker's connection between operations.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+
+    print(  # noqa: T201
+        f"{args.readers} readers, {args.writers} writers, {args.seconds:g}s, "
+        f"{'persistent' if args.persistent else 'per operation'} connections\n",
+    )
+    print(f"{'profile':<16}{'reads/s':>10}{'writes/s':>10}{'errors':>8}")  # noqa: T201
+    with tempfile.TemporaryDirectory() as directory:
+        for profile in profiles():
+            old_name = connection.settings_dict["NAME"]
+            create_database(Path(directory), profile)
+            try:
+                seed()
+                result = run_profile(
+                    args.readers, args.writers, args.seconds, args.persistent,
+                )
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+            print(  # noqa: T201
+                f"{profile.name:<16}{result.reads / args.seconds:>10.0f}"
+                f"{result.writes / args.seconds:>10.0f}{result.errors:>8}",
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Shows how the Recipe indexes change the plans of the hot queries.
+
+Seeds a throwaway SQLite database (1M recipes by default) at the migration
+before the access pattern indexes, prints ``EXPLAIN QUERY PLAN`` and timings
+for every query the public views and the dashboard run, applies the index
+migration and prints them again.
+
+    python -m tests.benchmarks.bench_query_plans --rows 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+BEFORE_MIGRATION = "0007_recipe_search_index"
+AFTER_MIGRATION = "0008_recipe_access_pattern_indexes"
+CATEGORIES = 50
+AUTHORS = 1000
+PUBLISHED_RATIO = 0.9
+PER_PAGE = 6
+
+
+def setup_django(db_path: Path) -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    os.environ.setdefault("DEBUG", "False")
+    import django
+    from django.conf import settings
+
+    django.setup()
+    settings.DATABASES["default"]["NAME"] = db_path
+
+
+def migrate(target: str) -> None:
+    from django.core.management import call_command
+
+    call_command("migrate", verbosity=0)
+    call_command("migrate", "recipes", target, verbosity=0)
+
+
+def seed(rows: int, batch_size: int = 50_000) -> None:
+    """Inserts rows with raw SQL, the ORM would take longer than the benchmark."""
+    from django.db import connection, transaction
+
+    rng = random.Random(1)  # noqa: S311
+    now = datetime.now(UTC)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO recipes_category (id, name) VALUES (%s, %s)",
+            [(i, f"Category {i}") for i in range(1, CATEGORIES + 1)],
+        )
+        cursor.executemany(
+            "INSERT INTO auth_user (id, password, is_superuser, username, first_name,"
+            " last_name, email, is_staff, is_active, date_joined)"
+            " VALUES (%s, '!', 0, %s, '', '', '', 0, 1, %s)",
+            [(i, f"author{i}", now) for i in range(1, AUTHORS + 1)],
+        )
+        for start in range(0, rows, batch_size):
+            batch = []
+            for i in range(start, min(start + batch_size, rows)):
+                created_at = now - timedelta(minutes=rows - i)
+                batch.append((
+                    f"Recipe {i}", "Description", f"recipe-{i}", 10, "Minutos", 4,
+                    "Porções", "Steps", False, created_at, created_at,
+                    rng.random() < PUBLISHED_RATIO, "",
+                    rng.randint(1, CATEGORIES), rng.randint(1, AUTHORS),
+                ))
+            cursor.executemany(
+                "INSERT INTO recipes_recipe (title, description, slug,"
+                " preparation_time, preparation_time_unit, servings, servings_unit,"
+                " preparation_steps, preparation_steps_is_html, created_at,"
+                " updated_at, is_published, cover, category_id, author_id)"
+                " VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                batch,
+            )
+        cursor.execute("ANALYZE")
+
+
+def count_sql(queryset: Any) -> tuple[str, Any]:  # noqa: ANN401
+    """Captures the ``COUNT(*)`` the paginator would run for ``queryset``."""
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    with CaptureQueriesContext(connection) as context:
+        queryset.count()
+    return context.captured_queries[-1]["sql"], ()
+
+
+def hot_queries(rows: int) -> dict[str, tuple[str, Any]]:
+    """The SQL of each access pattern, built the same way the views build it."""
+    from django.test import RequestFactory
+
+    from recipes.models import Recipe
+    from utils.pagination import CURSOR_MODE, encode_cursor, page_window
+
+    published = Recipe.objects.published()
+    listing = published.for_listing()
+    middle = rows // 2
+    created_at, middle_id = published.order_by("-id").values_list(
+        "created_at", "id",
+    )[middle]
+    querysets = {
+        "home page 1": listing.order_by("-id")[:PER_PAGE],
+        "home deep page (OFFSET)": listing.order_by("-id")[middle:middle + PER_PAGE],
+        "home deep page (cursor on id)": listing.filter(id__lt=middle_id).order_by(
+            "-id",
+        )[:PER_PAGE],
+        "home deep page (cursor on created_at, id)": page_window(
+            RequestFactory().get(
+                "/", {"cursor": encode_cursor([created_at, middle_id])},
+            ),
+            listing, PER_PAGE, mode=CURSOR_MODE, cursor_ordering=("-created_at", "-id"),
+        ),
+        "category page 1": listing.filter(category_id=7).order_by("-id")[:PER_PAGE],
+        "dashboard drafts": Recipe.objects.filter(is_published=False, author_id=7),
+    }
+    queries = {name: qs.query.sql_with_params() for name, qs in querysets.items()}
+    queries["home count"] = count_sql(published)
+    queries["category count"] = count_sql(published.filter(category_id=7))
+    return queries
+
+
+def measure(run: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def report(label: str, queries: dict[str, tuple[str, Any]], repeat: int) -> None:
+    from django.db import connection
+
+    print(f"\n=== {label} ===")  # noqa: T201
+    with connection.cursor() as cursor:
+        for name, (sql, params) in queries.items():
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = [row[-1] for row in cursor.fetchall()]
+
+            def run(sql: str = sql, params: Any = params) -> None:  # noqa: ANN401
+                cursor.execute(sql, params)
+                cursor.fetchall()
+
+            elapsed = measure(run, repeat)
+            print(f"\n{name}: {elapsed:.2f} ms (median of {repeat})")  # noqa: T201
+            for step in plan:
+                print(f"    {step}")  # noqa: T201
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--db", type=Path,
+        default=Path(tempfile.gettempdir()) / "recipes_query_plans.sqlite3",
+    )
+    args = parser.parse_args()
+
+    args.db.unlink(missing_ok=True)
+    setup_django(args.db)
+    migrate(BEFORE_MIGRATION)
+    start = time.perf_counter()
+    seed(args.rows)
+    print(f"Seeded {args.rows} recipes in {time.perf_counter() - start:.1f}s")  # noqa: T201
+
+    queries = hot_queries(args.rows)
+    report(f"before {AFTER_MIGRATION}", queries, args.repeat)
+    migrate(AFTER_MIGRATION)
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    report(f"after {AFTER_MIGRATION}", queries, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Compares cold and warm template renders under the production settings.
+
+A cold render starts from an empty cached loader, as the first request of a
+fresh worker would without ``WARM_TEMPLATES_AT_BOOT``, and pays for reading
+and compiling every template the page touches. A warm render reuses the
+compiled templates. Card fragment caching is disabled so both measure the
+full render. Neither a database nor a collectstatic run is needed.
+
+    python -m tests.benchmarks.bench_templates --repeat 50
+"""
+import argparse
+import os
+import statistics
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from functools import partial
+from typing import Any
+
+CARDS = 9
+
+
+def setup_django() -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings_production")
+    os.environ["CACHE_BACKEND"] = "django.core.cache.backends.dummy.DummyCache"
+    import django
+    from django.conf import settings
+    from django.test import override_settings
+
+    django.setup()
+    # Links the static files by name, the manifest only exists once collected
+    override_settings(STORAGES={
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+        },
+    }).enable()
+
+
+def pages() -> dict[str, tuple[str, dict[str, Any]]]:
+    """Template and context of each public page, built from unsaved objects."""
+    from django.contrib.auth.models import User
+    from django.core.paginator import Paginator
+
+    from recipes.factories import build_category, build_recipe
+    from utils.pagination import make_pagination_range
+
+    category = build_category("Bolos")
+    category.pk = 1
+    author = User(pk=1, username="chef", first_name="Ana", last_name="Silva")
+    now = datetime.now(UTC)
+    recipes = []
+    for pk in range(1, CARDS + 1):
+        recipe = build_recipe(
+            pk=pk, title=f"Bolo de milho {pk}", slug=f"bolo-{pk}",
+            preparation_steps="Misture tudo.\n" * 20, category=category,
+            author=author, created_at=now, updated_at=now,
+        )
+        recipes.append(recipe)
+    paginator = Paginator(recipes, CARDS)
+    listing = {
+        "recipes": paginator.get_page(1),
+        "pagination_range": make_pagination_range(paginator.page_range, 4, 1),
+    }
+    return {
+        "home": ("recipes/pages/home.html", listing),
+        "category": (
+            "recipes/pages/category.html", {**listing, "title": "Bolos - Category"},
+        ),
+        "search": (
+            "recipes/pages/search.html",
+            {**listing, "search_term": "bolo", "page_title": "Search for 'bolo'"},
+        ),
+        "detail": (
+            "recipes/pages/recipe-view.html",
+            {"recipe": recipes[0], "is_detail_page": True},
+        ),
+    }
+
+
+def measure(run: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import AnonymousUser
+    from django.template import engines
+    from django.template.loader import render_to_string
+    from django.test import RequestFactory
+
+    from utils.templates import warm_templates
+
+    cached_loader = engines["django"].engine.template_loaders[0]
+    request = RequestFactory().get("/")
+    request.user = AnonymousUser()
+
+    def cold(name: str, context: dict[str, Any]) -> None:
+        cached_loader.reset()
+        render_to_string(name, context, request)
+
+    start = time.perf_counter()
+    report = warm_templates()
+    boot = (time.perf_counter() - start) * 1000
+    print(f"Warming {len(report.compiled)} templates at boot: {boot:.2f} ms")  # noqa: T201
+
+    print(f"\n{'page':<10}{'cold ms':>10}{'warm ms':>10}{'speedup':>10}")  # noqa: T201
+    for page, (name, context) in pages().items():
+        cold_ms = measure(partial(cold, name, context), args.repeat)
+        render_to_string(name, context, request)
+        warm_ms = measure(
+            partial(render_to_string, name, context, request), args.repeat,
+        )
+        print(f"{page:<10}{cold_ms:>10.2f}{warm_ms:>10.2f}{cold_ms / warm_ms:>9.1f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+Throughput and latency of the public pages at realistic data sizes.
+
+For every size (10k, 100k and 1M recipes by default) seeds a throwaway SQLite
+database, then requests the home page, a deep page, a category, a search and
+recipe details through the Django test client and reports requests per
+second with p50/p99 latency. ``make_pagination_range`` is timed on its own.
+
+Caches are off unless ``--cached`` is given, so every request pays for its
+queries and renders. Results are written as JSON and compared with a baseline
+saved earlier with ``--save-baseline``: latencies more than ``--threshold``
+slower are flagged and the exit status is 1. Baselines only compare runs on
+the same machine.
+
+    python -m tests.benchmarks.bench_views --sizes 10000,100000 --requests 200
+    python -m tests.benchmarks.bench_views --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+CATEGORIES = 50
+AUTHORS = 1000
+PUBLISHED_RATIO = 0.9
+SEARCH_TERM = "lasanha"
+DISHES = (
+    "bolo", "torta", "lasanha", "risoto", "sopa", "salada", "pudim", "frango",
+    "pão", "moqueca", "feijoada", "panqueca",
+)
+STYLES = ("caseiro", "rápido", "de domingo", "da vó", "vegano", "sem glúten")
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def setup_django(*, cached: bool) -> None:
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    os.environ.setdefault("DEBUG", "False")
+    if not cached:
+        os.environ["CACHE_BACKEND"] = "django.core.cache.backends.dummy.DummyCache"
+    import django
+    from django.test.utils import setup_test_environment
+
+    django.setup()
+    # Allows the test client's host
+    setup_test_environment()
+
+
+def use_database(path: Path) -> None:
+    from django.core.management import call_command
+    from django.db import connection
+
+    connection.close()
+    connection.settings_dict["NAME"] = path
+    call_command("migrate", verbosity=0)
+
+
+def seed(rows: int, batch_size: int = 50_000) -> None:
+    """Inserts rows with raw SQL, the ORM would take longer than the benchmark."""
+    from django.db import connection, transaction
+
+    from recipes.counts import refresh_category_counts
+    from recipes.search import rebuild_search_index
+
+    rng = random.Random(rows)  # noqa: S311
+    now = datetime.now(UTC)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO recipes_category (id, name, published_recipe_count)"
+            " VALUES (%s, %s, 0)",
+            [(i, f"Category {i}") for i in range(1, CATEGORIES + 1)],
+        )
+        cursor.executemany(
+            "INSERT INTO auth_user (id, password, is_superuser, username, first_name,"
+            " last_name, email, is_staff, is_active, date_joined)"
+            " VALUES (%s, '!', 0, %s, 'Chef', %s, '', 0, 1, %s)",
+            [(i, f"author{i}", str(i), now) for i in range(1, AUTHORS + 1)],
+        )
+        for start in range(0, rows, batch_size):
+            batch = []
+            for i in range(start, min(start + batch_size, rows)):
+                created_at = now - timedelta(minutes=rows - i)
+                title = f"{rng.choice(DISHES).capitalize()} {rng.choice(STYLES)} {i}"
+                batch.append((
+                    title, f"Como fazer {title.lower()}", f"recipe-{i}", 30,
+                    "Minutos", 4, "Porções", "Misture tudo e leve ao forno.\n" * 10,
+                    False, created_at, created_at, rng.random() < PUBLISHED_RATIO,
+                    "", "{}", rng.randint(1, CATEGORIES), rng.randint(1, AUTHORS),
+                ))
+            cursor.executemany(
+                "INSERT INTO recipes_recipe (title, description, slug,"
+                " preparation_time, preparation_time_unit, servings, servings_unit,"
+                " preparation_steps, preparation_steps_is_html, created_at,"
+                " updated_at, is_published, cover, cover_variants, category_id,"
+                " author_id) VALUES"
+                " (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)",
+                batch,
+            )
+    refresh_category_counts()
+    rebuild_search_index()
+    connection.cursor().execute("ANALYZE")
+
+
+def scenarios(rows: int) -> dict[str, Callable[[random.Random], str]]:
+    """URL makers of every measured request, detail picks a random recipe."""
+    from django.urls import reverse
+
+    from recipes.models import Recipe
+    from recipes.views import PER_PAGE
+
+    published_ids = list(
+        Recipe.objects.published().order_by("?").values_list("id", flat=True)[:1000],
+    )
+    pages = max(1, int(rows * PUBLISHED_RATIO) // int(PER_PAGE))
+    return {
+        "home": lambda rng: reverse("recipes:home"),
+        "deep_page": lambda rng: f"{reverse('recipes:home')}?page={pages // 2}",
+        "category": lambda rng: reverse(
+            "recipes:category", kwargs={"category_id": rng.randint(1, CATEGORIES)},
+        ),
+        "search": lambda rng: f"{reverse('recipes:search')}?q={SEARCH_TERM}",
+        "detail": lambda rng: reverse(
+            "recipes:recipe", kwargs={"pk": rng.choice(published_ids)},
+        ),
+    }
+
+
+def latency_stats(timings: list[float]) -> dict[str, float]:
+    """
+    >>> latency_stats([0.001] * 90 + [0.011] * 10)
+    {'requests': 100, 'rps': 500.0, 'p50_ms': 1.0, 'p99_ms': 11.0}
+    """
+    percentiles = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "requests": len(timings),
+        "rps": round(len(timings) / sum(timings), 1),
+        "p50_ms": round(percentiles[49] * 1000, 2),
+        "p99_ms": round(percentiles[98] * 1000, 2),
+    }
+
+
+def bench_requests(rows: int, requests: int, warmup: int) -> dict[str, Any]:
+    from django.test import Client
+
+    client = Client()
+    results = {}
+    for name, make_url in scenarios(rows).items():
+        rng = random.Random(name)  # noqa: S311
+        for _ in range(warmup):
+            client.get(make_url(rng))
+        timings = []
+        for _ in range(requests):
+            url = make_url(rng)
+            start = time.perf_counter()
+            response = client.get(url)
+            timings.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                msg = f"{url} answered {response.status_code}"
+                raise RuntimeError(msg)
+        results[name] = latency_stats(timings)
+    return results
+
+
+def bench_pagination_range(repeat: int = 7, number: int = 20_000) -> dict[str, Any]:
+    from utils.pagination import make_pagination_range
+
+    results = {}
+    for pages in (10, 10_000, 100_000):
+        page_range = range(1, pages + 1)
+        best = min(timeit.repeat(
+            partial(make_pagination_range, page_range, 4, pages // 2),
+            repeat=repeat, number=number,
+        ))
+        results[f"{pages}_pages"] = {"us_per_call": round(best / number * 1e6, 3)}
+    return results
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], threshold: float,
+) -> list[str]:
+    """
+    Latencies (``*_ms``, ``us_per_call``) more than ``threshold`` slower than
+    the baseline, measurements missing from either side are skipped.
+
+    >>> compare(
+    ...     {"10000": {"home": {"p50_ms": 5.0, "p99_ms": 9.0, "rps": 150}}},
+    ...     {"10000": {"home": {"p50_ms": 4.0, "p99_ms": 8.9, "rps": 200}}},
+    ...     threshold=0.2,
+    ... )
+    ['10000 home p50_ms: 4.0 -> 5.0 (+25%)']
+    """
+    regressions = []
+    for group, measurements in results.items():
+        for name, metrics in measurements.items():
+            before = baseline.get(group, {}).get(name, {})
+            for metric, value in metrics.items():
+                if not (metric.endswith("_ms") or metric == "us_per_call"):
+                    continue
+                old = before.get(metric)
+                if old and value > old * (1 + threshold):
+                    regressions.append(
+                        f"{group} {name} {metric}: {old} -> {value} "
+                        f"(+{(value / old - 1) * 100:.0f}%)",
+                    )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000,1000000",
+                        help="Comma separated recipe counts.")
+    parser.add_argument("--requests", type=int, default=200,
+                        help="Measured requests per page and size.")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--cached", action="store_true",
+                        help="Keep the page, card and count caches on.")
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "latest.json")
+    parser.add_argument("--baseline", type=Path, default=RESULTS_DIR / "baseline.json")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the baseline.")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Slowdown flagged as a regression, 0.2 is 20%%.")
+    args = parser.parse_args()
+
+    setup_django(cached=args.cached)
+    import django
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in sizes:
+            use_database(Path(directory) / f"bench_{rows}.sqlite3")
+            start = time.perf_counter()
+            seed(rows)
+            print(f"\nSeeded {rows} recipes in {time.perf_counter() - start:.1f}s")  # noqa: T201
+            results[str(rows)] = bench_requests(rows, args.requests, args.warmup)
+            print(f"{'page':<12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")  # noqa: T201
+            for name, stats in results[str(rows)].items():
+                print(  # noqa: T201
+                    f"{name:<12}{stats['rps']:>10}{stats['p50_ms']:>10}"
+                    f"{stats['p99_ms']:>10}",
+                )
+    results["pagination_range"] = bench_pagination_range()
+    print("\nmake_pagination_range")  # noqa: T201
+    for name, stats in results["pagination_range"].items():
+        print(f"{name:<14}{stats['us_per_call']:>8} us")  # noqa: T201
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(UTC).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "machine": platform.node(),
+            "cached": args.cached,
+            "requests": args.requests,
+        },
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nWrote {args.output}")  # noqa: T201
+    if args.save_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Saved the baseline to {args.baseline}")  # noqa: T201
+        return
+    if not args.baseline.exists():
+        print("No baseline to compare with, save one with --save-baseline")  # noqa: T201
+        return
+    baseline = json.loads(args.baseline.read_text())
+    if baseline["meta"].get("cached") != args.cached:
+        print("The baseline was taken with other cache settings, not comparing")  # noqa: T201
+        return
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regressions over {args.threshold:.0%}:")  # noqa: T201
+        for regression in regressions:
+            print(f"  {regression}")  # noqa: T201
+        sys.exit(1)
+    print(f"No regressions over {args.threshold:.0%} against {args.baseline}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import time
 
 from django.contrib.staticfiles.testing import StaticLiveServerTestCase
+from django.core.cache import cache
 from django.urls import reverse
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webelement import WebElement
@@ -12,6 +13,8 @@ from utils.browser import make_chrome_browser
 
 class AuthorsBaseTest(StaticLiveServerTestCase):
     def setUp(self) -> None:
+        # Cached pages outlive the database flush between live server tests
+        cache.clear()
         self.browser = make_chrome_browser()
         return super().setUp()
 
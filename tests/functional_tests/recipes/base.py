@@ -1,12 +1,15 @@
 import time
 
 from django.contrib.staticfiles.testing import StaticLiveServerTestCase
+from django.core.cache import cache
 
 from utils.browser import make_chrome_browser
 
 
 class RecipeBasePageFunctionalTest(StaticLiveServerTestCase):
     def setUp(self) -> None:
+        # Cached pages outlive the database flush between live server tests
+        cache.clear()
         self.browser = make_chrome_browser()
 
     def tearDown(self) -> None:
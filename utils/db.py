@@ -0,0 +1,185 @@
+"""
+Per connection database tuning and primary/replica routing.
+
+SQLite keeps most of its settings per connection, so ``configure_connection``
+runs on ``connection_created`` (connected in ``RecipesConfig.ready``) and
+applies ``settings.SQLITE_PRAGMAS``: WAL lets readers carry on while a write
+commits, ``synchronous=NORMAL`` only syncs on checkpoints, which WAL makes
+safe, ``mmap_size`` reads pages without copying them and ``busy_timeout``
+waits for the write lock instead of failing straight away.
+
+``PrimaryReplicaRouter`` spreads the reads of the public pages over the
+replicas, see ``recipes.mixins.ReplicaReadMixin``.
+"""
+import random
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.db.models import Model
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+
+PRIMARY_PIN_COOKIE = "db_primary"
+
+# The values each pragma accepts, values come from the environment
+SQLITE_PRAGMA_VALUES: dict[str, type | tuple[str, ...]] = {
+    "journal_mode": ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"),
+    "synchronous": ("OFF", "NORMAL", "FULL", "EXTRA"),
+    "mmap_size": int,
+    "busy_timeout": int,
+    "cache_size": int,
+    "temp_store": ("DEFAULT", "FILE", "MEMORY"),
+}
+
+
+def pragma_statement(name: str, value: str | int) -> str:
+    """
+    >>> pragma_statement("journal_mode", "wal")
+    'PRAGMA journal_mode = WAL'
+    >>> pragma_statement("mmap_size", "1024")
+    'PRAGMA mmap_size = 1024'
+    >>> pragma_statement("journal_mode", "wal; DROP TABLE x")
+    Traceback (most recent call last):
+    ...
+    ValueError: Invalid value for PRAGMA journal_mode: 'wal; DROP TABLE x'
+    """
+    accepted = SQLITE_PRAGMA_VALUES.get(name)
+    if accepted is None:
+        msg = f"Unsupported PRAGMA {name!r}"
+        raise ValueError(msg)
+    try:
+        if accepted is int:
+            value = int(value)
+        elif str(value).upper() in accepted:  # type: ignore[operator]
+            value = str(value).upper()
+        else:
+            raise ValueError  # noqa: TRY301
+    except ValueError:
+        msg = f"Invalid value for PRAGMA {name}: {value!r}"
+        raise ValueError(msg) from None
+    return f"PRAGMA {name} = {value}"
+
+
+def configure_connection(
+    sender: type[BaseDatabaseWrapper], connection: BaseDatabaseWrapper, **kwargs: Any,  # noqa: ANN401
+) -> None:
+    if connection.vendor != "sqlite":
+        return
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        # The raw connection, so the pragmas don't count as queries in
+        # assertNumQueries or the debug toolbar
+        connection.connection.execute(pragma_statement(name, value))
+
+
+@dataclass
+class RoutingState:
+    """What ``PrimaryReplicaRouter`` knows about the current request."""
+
+    # The client wrote recently and must read its own writes
+    pinned: bool = False
+    # Set by views whose reads may lag behind the primary
+    use_replicas: bool = False
+    # A read went to a replica, so what was read may lag behind the primary
+    read_replica: bool = False
+    wrote: bool = False
+
+
+_routing: ContextVar[RoutingState | None] = ContextVar("db_routing", default=None)
+
+
+@contextmanager
+def routing(*, pinned: bool = False) -> Iterator[RoutingState]:
+    state = RoutingState(pinned=pinned)
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+def read_from_replicas() -> None:
+    """Lets the rest of the current request read from the replicas."""
+    state = _routing.get()
+    if state is not None:
+        state.use_replicas = True
+
+
+def may_cache_reads() -> bool:
+    """
+    Whether what the current request read may be cached. Replica reads can
+    predate the write that just bumped a cache version, and would then be
+    kept under the new version for the whole timeout, not for the lag.
+    """
+    state = _routing.get()
+    return state is None or not state.read_replica
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends reads to one of ``settings.DATABASE_REPLICAS`` in requests that
+    opted in with ``read_from_replicas``, everything else to the primary.
+
+    Any write marks the request so ``ReplicaPinningMiddleware`` keeps that
+    client on the primary for ``DATABASE_REPLICA_PIN_SECONDS``, long enough
+    for the replicas to catch up with it.
+    """
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> str:  # noqa: ANN401
+        state = _routing.get()
+        replicas = settings.DATABASE_REPLICAS
+        if state is None or not state.use_replicas or state.pinned or not replicas:
+            return DEFAULT_DB_ALIAS
+        state.read_replica = True
+        return random.choice(replicas)  # noqa: S311
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str:  # noqa: ANN401
+        state = _routing.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool | None:  # noqa: ANN401
+        # Replicas hold the same rows as the primary
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        return (obj1._state.db in aliases and obj2._state.db in aliases) or None  # noqa: SLF001
+
+
+class ReplicaPinningMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with routing(pinned=PRIMARY_PIN_COOKIE in request.COOKIES) as state:
+            response = self.get_response(request)
+        self.pin(request, response, state)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        # The state is shared, not copied, with the threads the ORM runs in
+        with routing(pinned=PRIMARY_PIN_COOKIE in request.COOKIES) as state:
+            response = await self.get_response(request)
+        self.pin(request, response, state)
+        return response
+
+    def pin(
+        self, request: HttpRequest, response: HttpResponseBase, state: RoutingState,
+    ) -> None:
+        if state.wrote or request.method not in ("GET", "HEAD", "OPTIONS"):
+            response.set_cookie(
+                PRIMARY_PIN_COOKIE, "1", max_age=settings.DATABASE_REPLICA_PIN_SECONDS,
+                httponly=True, samesite="Lax",
+            )
@@ -0,0 +1,293 @@
+"""
+What each request costs: wall time, queries and their time, template render
+time and cache lookups.
+
+``InstrumentationMiddleware`` collects the numbers of a request in a context
+variable, adds them to the response as ``Server-Timing`` (when
+``SERVER_TIMING_HEADER`` is on) and keeps the last
+``INSTRUMENTATION_BUFFER_SIZE`` requests in memory for ``metrics_view``.
+Requests over their ``PERFORMANCE_BUDGETS`` are logged and sent with
+``budget_exceeded``, which ``utils.pytest_budgets`` turns into test failures.
+
+The buffer is per process, each worker reports its own requests.
+"""
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import connections
+from django.dispatch import Signal
+from django.http import HttpRequest, JsonResponse
+from django.http.response import HttpResponseBase
+
+logger = logging.getLogger(__name__)
+
+# Sent with metrics= and violations= for every request over its budget
+budget_exceeded = Signal()
+
+TIME_METRICS = frozenset({"total_ms", "db_ms", "template_ms"})
+
+
+@dataclass
+class RequestMetrics:
+    method: str
+    path: str
+    view: str = ""
+    status: int = 0
+    total_ms: float = 0.0
+    queries: int = 0
+    db_ms: float = 0.0
+    template_ms: float = 0.0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    started_at: float = field(default_factory=time.time)
+    # Renders in progress, only the outermost one is timed
+    template_depth: int = field(default=0, repr=False, compare=False)
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        del data["template_depth"]
+        return data
+
+
+@dataclass(frozen=True)
+class BudgetViolation:
+    metric: str
+    limit: float
+    actual: float
+
+    def __str__(self) -> str:
+        return f"{self.metric} {self.actual:g} > {self.limit:g}"
+
+
+_current: ContextVar[RequestMetrics | None] = ContextVar(
+    "request_metrics", default=None,
+)
+_recent: deque[RequestMetrics] = deque(maxlen=settings.INSTRUMENTATION_BUFFER_SIZE)
+_recent_lock = threading.Lock()
+
+
+def record_cache_lookup(*, hits: int = 0, misses: int = 0) -> None:
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.cache_hits += hits
+        metrics.cache_misses += misses
+
+
+@contextmanager
+def timed_render() -> Iterator[None]:
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    metrics.template_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.template_depth -= 1
+        # Cards rendered from inside the page are already part of its time
+        if not metrics.template_depth:
+            metrics.template_ms += (time.perf_counter() - start) * 1000
+
+
+class QueryTimer:
+    """A ``connection.execute_wrapper`` counting queries into ``metrics``."""
+
+    def __init__(self, metrics: RequestMetrics) -> None:
+        self.metrics = metrics
+
+    def __call__(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,  # noqa: ANN401
+        many: bool,  # noqa: FBT001
+        context: dict[str, Any],
+    ) -> Any:  # noqa: ANN401
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.metrics.queries += 1
+            self.metrics.db_ms += (time.perf_counter() - start) * 1000
+
+
+def check_budget(metrics: RequestMetrics) -> list[BudgetViolation]:
+    """
+    >>> from django.test import override_settings
+    >>> metrics = RequestMetrics("GET", "/", view="recipes:home", queries=5)
+    >>> with override_settings(PERFORMANCE_BUDGETS={"recipes:home": {"queries": 4}}):
+    ...     [str(violation) for violation in check_budget(metrics)]
+    ['queries 5 > 4']
+    """
+    budget = settings.PERFORMANCE_BUDGETS.get(metrics.view, {})
+    return [
+        BudgetViolation(metric, limit, getattr(metrics, metric))
+        for metric, limit in budget.items()
+        if getattr(metrics, metric) > limit
+    ]
+
+
+def server_timing(metrics: RequestMetrics) -> str:
+    """
+    >>> print(server_timing(RequestMetrics(
+    ...     "GET", "/", total_ms=12.5, queries=2, db_ms=1.5, template_ms=4,
+    ...     cache_hits=3, cache_misses=1,
+    ... )))  # doctest: +NORMALIZE_WHITESPACE
+    total;dur=12.5, db;dur=1.5;desc="2 queries", tpl;dur=4.0,
+    cache;desc="3 hits, 1 misses"
+    """
+    return ", ".join([
+        f"total;dur={metrics.total_ms:.1f}",
+        f'db;dur={metrics.db_ms:.1f};desc="{metrics.queries} queries"',
+        f"tpl;dur={metrics.template_ms:.1f}",
+        f'cache;desc="{metrics.cache_hits} hits, {metrics.cache_misses} misses"',
+    ])
+
+
+def record(metrics: RequestMetrics) -> None:
+    with _recent_lock:
+        _recent.append(metrics)
+
+
+def recent_requests(limit: int | None = None) -> list[RequestMetrics]:
+    with _recent_lock:
+        requests = list(_recent)
+    return requests[-limit:] if limit else requests
+
+
+def clear_recent_requests() -> None:
+    with _recent_lock:
+        _recent.clear()
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def summarize(requests: list[RequestMetrics]) -> dict[str, dict[str, float]]:
+    """Per view count, latency percentiles, queries and cache hit ratio."""
+    by_view: dict[str, list[RequestMetrics]] = {}
+    for metrics in requests:
+        by_view.setdefault(metrics.view, []).append(metrics)
+    summary = {}
+    for view, views_requests in sorted(by_view.items()):
+        totals = [metrics.total_ms for metrics in views_requests]
+        queries = [metrics.queries for metrics in views_requests]
+        hits = sum(metrics.cache_hits for metrics in views_requests)
+        lookups = hits + sum(metrics.cache_misses for metrics in views_requests)
+        summary[view] = {
+            "requests": len(views_requests),
+            "p50_ms": _percentile(totals, 50),
+            "p95_ms": _percentile(totals, 95),
+            "max_ms": max(totals),
+            "avg_queries": statistics.fmean(queries),
+            "max_queries": max(queries),
+            "avg_db_ms": statistics.fmean(m.db_ms for m in views_requests),
+            "avg_template_ms": statistics.fmean(m.template_ms for m in views_requests),
+            "cache_hit_ratio": hits / lookups if lookups else 0.0,
+            "over_budget": sum(bool(check_budget(m)) for m in views_requests),
+        }
+    return summary
+
+
+def _time_queries(stack: ExitStack, metrics: RequestMetrics) -> None:
+    timer = QueryTimer(metrics)
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(timer))
+
+
+class InstrumentationMiddleware:
+    """Goes first in ``MIDDLEWARE`` so it sees the whole request."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics(request.method or "", request.path)
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                _time_queries(stack, metrics)
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, metrics, start)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        metrics = RequestMetrics(request.method or "", request.path)
+        token = _current.set(metrics)
+        start = time.perf_counter()
+        stack = ExitStack()
+        try:
+            # Connections belong to the thread the async ORM runs queries in
+            await sync_to_async(_time_queries)(stack, metrics)
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+            _current.reset(token)
+        self.finish(request, response, metrics, start)
+        return response
+
+    def finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponseBase,
+        metrics: RequestMetrics,
+        start: float,
+    ) -> None:
+        metrics.total_ms = (time.perf_counter() - start) * 1000
+        metrics.status = response.status_code
+        if request.resolver_match is not None:
+            metrics.view = request.resolver_match.view_name
+        self.check(metrics)
+        record(metrics)
+        if settings.SERVER_TIMING_HEADER:
+            response["Server-Timing"] = server_timing(metrics)
+
+    def check(self, metrics: RequestMetrics) -> None:
+        violations = check_budget(metrics)
+        if not violations:
+            return
+        logger.warning(
+            "%s %s (%s) over budget: %s", metrics.method, metrics.path,
+            metrics.view, ", ".join(map(str, violations)),
+        )
+        budget_exceeded.send(sender=type(self), metrics=metrics, violations=violations)
+
+
+@staff_member_required
+def metrics_view(request: HttpRequest) -> JsonResponse:
+    """The per view summary and the last ``?limit=`` requests of this process."""
+    try:
+        limit = max(int(request.GET.get("limit", 50)), 0)
+    except ValueError:
+        limit = 50
+    requests = recent_requests()
+    return JsonResponse({
+        "summary": summarize(requests),
+        "recent": [metrics.as_dict() for metrics in requests[-limit:]] if limit else [],
+        "budgets": settings.PERFORMANCE_BUDGETS,
+    })
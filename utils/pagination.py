@@ -1,14 +1,39 @@
+import base64
+import binascii
+import json
 import math
-from typing import Any
+from collections.abc import Iterator, Sequence
+from datetime import datetime, time
+from functools import cached_property
+from typing import Any, Final
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.core.paginator import Page, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Field, Q
 from django.db.models.query import QuerySet
 from django.http.request import HttpRequest
 
+from utils.db import may_cache_reads
+from utils.instrumentation import record_cache_lookup
+
+PAGE_MODE: Final[str] = "page"
+CURSOR_MODE: Final[str] = "cursor"
+CURSOR_NEXT: Final[str] = "n"
+CURSOR_PREVIOUS: Final[str] = "p"
+
 
 def make_pagination_range(
-    page_range: list[int], range_size: int, current_page: int
-) -> dict[str, bool | int | list[int]]:
+    page_range: Sequence[int], range_size: int, current_page: int,
+) -> dict[str, Any]:
+    """
+    Works on any sliceable sequence, so passing ``Paginator.page_range`` (a
+    ``range``) keeps this O(range_size) no matter how many pages there are.
+    """
     if not page_range:
         return {
             "pagination": [],
@@ -39,7 +64,7 @@ def make_pagination_range(
     if end_index >= (total_pages := len(page_range)):
         start_index = max(0, start_index - (end_index - total_pages))
         end_index = total_pages
-    pagination = page_range[start_index:end_index]
+    pagination = list(page_range[start_index:end_index])
     return {
         "pagination": pagination,
         "page_range": page_range,
@@ -53,17 +78,424 @@ def make_pagination_range(
     }
 
 
-def make_pagination(
-    request: HttpRequest, queryset: QuerySet[Any], per_page: int, range_size: int = 4
-) -> tuple[Page, int]:
+def estimate_count(queryset: QuerySet[Any]) -> int | None:
+    """
+    Returns the planner's row estimate for ``queryset``, or ``None`` when the
+    database cannot provide a cheap one (only PostgreSQL can).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator that keeps ``count`` in Django's cache under ``count_cache_key``.
+
+    When ``approximate_count_threshold`` is set and the planner estimates at
+    least that many rows, the estimate is used instead of a ``COUNT(*)``.
+    A ``known_count`` kept elsewhere, e.g. denormalized, skips both.
+    """
+
+    def __init__(
+        self,
+        object_list: QuerySet[Any],
+        per_page: int,
+        *,
+        count_cache_key: str | None = None,
+        count_cache_timeout: int | None = None,
+        approximate_count_threshold: int = 0,
+        known_count: int | None = None,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_cache_key = count_cache_key
+        self.count_cache_timeout = count_cache_timeout
+        self.approximate_count_threshold = approximate_count_threshold
+        if known_count is not None:
+            self.__dict__["count"] = known_count
+
+    @cached_property
+    def count(self) -> int:
+        if self.count_cache_key is None:
+            return self.compute_count()
+        count = cache.get(self.count_cache_key)
+        record_cache_lookup(hits=int(count is not None), misses=int(count is None))
+        if count is None:
+            count = self.compute_count()
+            if may_cache_reads():
+                cache.set(self.count_cache_key, count, self.count_cache_timeout)
+        return count
+
+    def compute_count(self) -> int:
+        if self.approximate_count_threshold and isinstance(self.object_list, QuerySet):
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate >= self.approximate_count_threshold:
+                return estimate
+        return Paginator.count.func(self)  # type: ignore[attr-defined]
+
+    async def acount(self) -> int:
+        """Fills ``count`` without blocking the event loop, for async views."""
+        if "count" in self.__dict__:
+            return self.count
+        if self.count_cache_key is None:
+            count = await self.acompute_count()
+        else:
+            count = await cache.aget(self.count_cache_key)
+            record_cache_lookup(hits=int(count is not None), misses=int(count is None))
+            if count is None:
+                count = await self.acompute_count()
+                if may_cache_reads():
+                    await cache.aset(
+                        self.count_cache_key, count, self.count_cache_timeout,
+                    )
+        self.__dict__["count"] = count
+        return count
+
+    async def acompute_count(self) -> int:
+        if not isinstance(self.object_list, QuerySet):
+            return self.compute_count()
+        if self.approximate_count_threshold:
+            estimate = await sync_to_async(estimate_count)(self.object_list)
+            if estimate is not None and estimate >= self.approximate_count_threshold:
+                return estimate
+        return await self.object_list.acount()
+
+
+class CursorPage(Sequence[Any]):
+    """A page of results addressed by opaque cursors instead of page numbers."""
+
+    def __init__(
+        self,
+        object_list: list[Any],
+        next_cursor: str | None,
+        previous_cursor: str | None,
+    ) -> None:
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self) -> str:
+        return f"<CursorPage of {len(self)} items>"
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index: Any) -> Any:  # noqa: ANN401
+        return self.object_list[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    """
+    Keeps the microseconds ``DjangoJSONEncoder`` drops, a cursor on a
+    truncated datetime would skip or repeat rows.
+
+    >>> CursorJSONEncoder().encode(datetime(2025, 1, 1, 10, 0, 0, 123456))
+    '"2025-01-01T10:00:00.123456"'
+    """
+
+    def default(self, o: Any) -> Any:  # noqa: ANN401
+        if isinstance(o, datetime | time):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values: Sequence[Any], direction: str = CURSOR_NEXT) -> str:
+    payload = json.dumps({"v": list(values), "d": direction}, cls=CursorJSONEncoder)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str | None) -> tuple[list[Any] | None, str]:
+    """
+    Returns the seek values and direction stored in ``token``.
+
+    Malformed or missing tokens fall back to the first page.
+
+    >>> decode_cursor(encode_cursor([42], CURSOR_PREVIOUS))
+    ([42], 'p')
+    >>> decode_cursor("not a cursor")
+    (None, 'n')
+    """
+    if not token:
+        return None, CURSOR_NEXT
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values, direction = payload["v"], payload["d"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None, CURSOR_NEXT
+    if not isinstance(values, list) or direction not in (CURSOR_NEXT, CURSOR_PREVIOUS):
+        return None, CURSOR_NEXT
+    return values, direction
+
+
+def _parse_ordering(ordering: Sequence[str]) -> list[tuple[str, bool]]:
+    return [(field.lstrip("-"), field.startswith("-")) for field in ordering]
+
+
+def _seek_filter(
+    ordering: list[tuple[str, bool]], values: Sequence[Any], *, forward: bool,
+) -> Q:
+    """Builds ``(a, b) < (x, y)`` style row comparisons out of plain lookups."""
+    seek = Q()
+    for index, (field, descending) in enumerate(ordering):
+        lookup = "lt" if descending == forward else "gt"
+        clause = Q(**{f"{field}__{lookup}": values[index]})
+        equals = zip(ordering[:index], values, strict=False)
+        for (equal_field, _), equal_value in equals:
+            clause &= Q(**{equal_field: equal_value})
+        seek |= clause
+    if len(ordering) > 1:
+        # Redundant bound on the leading column, the OR alone can't be used to
+        # seek into an index on (a, b) and would scan it from the start.
+        field, descending = ordering[0]
+        lookup = "lte" if descending == forward else "gte"
+        seek = Q(**{f"{field}__{lookup}": values[0]}) & seek
+    return seek
+
+
+def _ordering_field(queryset: QuerySet[Any], name: str) -> "Field[Any, Any]":
+    if name in queryset.query.annotations:
+        return queryset.query.annotations[name].output_field
+    field = queryset.model._meta.get_field(name)  # noqa: SLF001
+    if not isinstance(field, Field):
+        msg = f"Can't seek on the relation {name!r}."
+        raise TypeError(msg)
+    return field
+
+
+def _clean_cursor_values(
+    queryset: QuerySet[Any],
+    fields: list[tuple[str, bool]],
+    values: list[Any] | None,
+) -> list[Any] | None:
+    """
+    Converts the decoded ``values`` with their ordering fields. A tampered
+    cursor whose values don't fit them starts over from the first page.
+    """
+    if values is None or len(values) != len(fields):
+        return None
+    cleaned = []
+    for (name, _), value in zip(fields, values, strict=True):
+        try:
+            converted = _ordering_field(queryset, name).to_python(value)
+        except (ValidationError, ValueError, TypeError):
+            return None
+        if converted is None:
+            return None
+        cleaned.append(converted)
+    return cleaned
+
+
+def _cursor_values(row: Any, ordering: list[tuple[str, bool]]) -> list[Any]:  # noqa: ANN401
+    if isinstance(row, dict):
+        return [row[field] for field, _ in ordering]
+    return [getattr(row, field) for field, _ in ordering]
+
+
+def _cursor_window(
+    request: HttpRequest, queryset: QuerySet[Any], ordering: Sequence[str],
+) -> tuple[QuerySet[Any], list[tuple[str, bool]], list[Any] | None, bool]:
+    fields = _parse_ordering(ordering)
+    values, direction = decode_cursor(request.GET.get("cursor"))
+    values = _clean_cursor_values(queryset, fields, values)
+    forward = values is None or direction == CURSOR_NEXT
+
+    if forward:
+        qs = queryset.order_by(*ordering)
+    else:
+        qs = queryset.order_by(
+            *(field if descending else f"-{field}" for field, descending in fields),
+        )
+    if values is not None:
+        qs = qs.filter(_seek_filter(fields, values, forward=forward))
+    return qs, fields, values, forward
+
+
+def make_cursor_pagination(
+    request: HttpRequest,
+    queryset: QuerySet[Any],
+    per_page: int,
+    ordering: Sequence[str] = ("-id",),
+) -> tuple[CursorPage, dict[str, Any]]:
+    """
+    Keyset pagination: seeks past the last seen ``ordering`` values instead of
+    using ``OFFSET`` and never runs a ``COUNT(*)``. ``ordering`` must end with a
+    unique column so that every row has a distinct position.
+    """
+    qs, fields, values, forward = _cursor_window(request, queryset, ordering)
+    rows = list(qs[: per_page + 1])
+    return _cursor_page(rows, per_page, fields, values, forward=forward)
+
+
+async def amake_cursor_pagination(
+    request: HttpRequest,
+    queryset: QuerySet[Any],
+    per_page: int,
+    ordering: Sequence[str] = ("-id",),
+) -> tuple[CursorPage, dict[str, Any]]:
+    qs, fields, values, forward = _cursor_window(request, queryset, ordering)
+    rows = [row async for row in qs[: per_page + 1]]
+    return _cursor_page(rows, per_page, fields, values, forward=forward)
+
+
+def _cursor_page(
+    rows: list[Any],
+    per_page: int,
+    fields: list[tuple[str, bool]],
+    values: list[Any] | None,
+    *,
+    forward: bool,
+) -> tuple[CursorPage, dict[str, Any]]:
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if not forward:
+        rows.reverse()
+
+    has_next = has_more if forward else values is not None
+    has_previous = values is not None if forward else has_more
+    next_cursor = previous_cursor = None
+    if rows and has_next:
+        next_cursor = encode_cursor(_cursor_values(rows[-1], fields), CURSOR_NEXT)
+    if rows and has_previous:
+        previous_cursor = encode_cursor(
+            _cursor_values(rows[0], fields), CURSOR_PREVIOUS,
+        )
+
+    page_obj = CursorPage(rows, next_cursor, previous_cursor)
+    pagination_range = {
+        "is_cursor": True,
+        "pagination": [],
+        "next_cursor": next_cursor,
+        "previous_cursor": previous_cursor,
+        "first_page_out_of_range": False,
+        "last_page_out_of_range": False,
+    }
+    return page_obj, pagination_range
+
+
+def parse_page_number(request: HttpRequest) -> int:
     try:
-        page_number = int(request.GET.get("page", 1))
+        return int(request.GET.get("page", 1))
     except ValueError:
-        page_number = 1
-    paginator = Paginator(queryset, per_page)
-    page_obj = paginator.get_page(page_number)
+        return 1
+
+
+def page_window(
+    request: HttpRequest,
+    queryset: QuerySet[Any],
+    per_page: int,
+    *,
+    mode: str = PAGE_MODE,
+    cursor_ordering: Sequence[str] = ("-id",),
+    count_cache_key: str | None = None,
+    known_count: int | None = None,
+) -> QuerySet[Any]:
+    """
+    Returns the unevaluated slice of ``queryset`` that ``make_pagination``
+    would show for ``request``. Handy for cheap per-page lookups such as the
+    newest ``updated_at``.
+
+    Pages past the last one are clamped to it, as ``Paginator.get_page``
+    does, so only those after the first take the (cached) count.
+    """
+    if mode == CURSOR_MODE:
+        return _cursor_window(request, queryset, cursor_ordering)[0][:per_page]
+    number = parse_page_number(request)
+    if number <= 1:
+        return queryset[:per_page]
+    paginator = _make_paginator(queryset, per_page, count_cache_key, known_count)
+    return paginator.get_page(number).object_list
+
+
+def make_pagination(
+    request: HttpRequest,
+    queryset: QuerySet[Any],
+    per_page: int,
+    range_size: int = 4,
+    *,
+    mode: str = PAGE_MODE,
+    cursor_ordering: Sequence[str] = ("-id",),
+    count_cache_key: str | None = None,
+    known_count: int | None = None,
+) -> tuple[Page | CursorPage, dict[str, Any]]:
+    if mode == CURSOR_MODE:
+        return make_cursor_pagination(request, queryset, per_page, cursor_ordering)
+    if mode != PAGE_MODE:
+        msg = f"Unknown pagination mode: {mode!r}"
+        raise ValueError(msg)
+    paginator = _make_paginator(queryset, per_page, count_cache_key, known_count)
+    page_obj = paginator.get_page(parse_page_number(request))
+
+    pagination_range = make_pagination_range(
+        paginator.page_range, range_size, page_obj.number,
+    )
+    return page_obj, pagination_range
+
+
+async def amake_pagination(
+    request: HttpRequest,
+    queryset: QuerySet[Any],
+    per_page: int,
+    range_size: int = 4,
+    *,
+    mode: str = PAGE_MODE,
+    cursor_ordering: Sequence[str] = ("-id",),
+    count_cache_key: str | None = None,
+    known_count: int | None = None,
+) -> tuple[Page | CursorPage, dict[str, Any]]:
+    """``make_pagination`` for async views, counts and fetches with the async ORM."""
+    if mode == CURSOR_MODE:
+        return await amake_cursor_pagination(
+            request, queryset, per_page, cursor_ordering,
+        )
+    if mode != PAGE_MODE:
+        msg = f"Unknown pagination mode: {mode!r}"
+        raise ValueError(msg)
+    paginator = _make_paginator(queryset, per_page, count_cache_key, known_count)
+    await paginator.acount()
+    # Knowing the count, get_page only slices the queryset
+    page_obj = paginator.get_page(parse_page_number(request))
+    page_obj.object_list = [obj async for obj in page_obj.object_list]
 
     pagination_range = make_pagination_range(
-        list(paginator.page_range), range_size, page_number
+        paginator.page_range, range_size, page_obj.number,
     )
     return page_obj, pagination_range
+
+
+def _make_paginator(
+    queryset: QuerySet[Any],
+    per_page: int,
+    count_cache_key: str | None,
+    known_count: int | None,
+) -> CachedCountPaginator:
+    return CachedCountPaginator(
+        queryset,
+        per_page,
+        count_cache_key=count_cache_key,
+        count_cache_timeout=getattr(settings, "PAGINATION_COUNT_CACHE_TIMEOUT", 300),
+        approximate_count_threshold=getattr(
+            settings, "PAGINATION_APPROXIMATE_COUNT_THRESHOLD", 0,
+        ),
+        known_count=known_count,
+    )
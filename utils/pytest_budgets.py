@@ -0,0 +1,55 @@
+"""
+Fails tests whose requests go over ``settings.PERFORMANCE_BUDGETS``.
+
+Loaded from the root ``conftest.py``. Query budgets are always enforced,
+time budgets only with ``--time-budgets`` since timings depend on the
+machine. Tests that go over on purpose are marked ``no_budgets``.
+"""
+from typing import Any
+
+import pytest
+
+from utils.instrumentation import TIME_METRICS, BudgetViolation, budget_exceeded
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--time-budgets", action="store_true",
+        help="Also fail tests over the time budgets of PERFORMANCE_BUDGETS.",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "no_budgets: don't fail on requests over PERFORMANCE_BUDGETS",
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item) -> Any:  # noqa: ANN401
+    if item.get_closest_marker("no_budgets"):
+        return (yield)
+    enforce_times = item.config.getoption("time_budgets")
+    failures: list[str] = []
+
+    def collect(
+        metrics: Any, violations: list[BudgetViolation], **kwargs: Any,  # noqa: ANN401
+    ) -> None:
+        enforced = [
+            str(violation) for violation in violations
+            if enforce_times or violation.metric not in TIME_METRICS
+        ]
+        if enforced:
+            failures.append(
+                f"{metrics.method} {metrics.path} ({metrics.view}): "
+                + ", ".join(enforced),
+            )
+
+    budget_exceeded.connect(collect)
+    try:
+        result = yield
+    finally:
+        budget_exceeded.disconnect(collect)
+    if failures:
+        pytest.fail("Over budget:\n" + "\n".join(failures), pytrace=False)
+    return result
@@ -0,0 +1,157 @@
+import re
+from collections.abc import Iterable
+from typing import Any
+
+from django.db import connections
+from django.db.models import BigIntegerField, Count, Max, Q
+from django.db.models.functions import Cast, Substr
+from django.db.models.query import QuerySet
+from django.utils.text import slugify
+
+# Room kept at the end of a truncated base for a "-<n>" suffix
+SUFFIX_RESERVE = 8
+FALLBACK_BASE = "item"
+
+
+def slug_base(text: str, max_length: int = 50) -> str:
+    """
+    Slugifies ``text`` and truncates it so that a numeric suffix still fits.
+
+    >>> slug_base("Bolo de Chocolate")
+    'bolo-de-chocolate'
+    >>> len(slug_base("a" * 80))
+    42
+    >>> slug_base("!!!")
+    'item'
+    """
+    base = slugify(text)[: max_length - SUFFIX_RESERVE].strip("-")
+    return base or FALLBACK_BASE
+
+
+def _family_filter(queryset: QuerySet[Any], field: str, base: str) -> Q:
+    if connections[queryset.db].vendor == "postgresql":
+        # Its linguistic collations skip punctuation, so a range would miss
+        # "base-2", but slug columns get a pattern_ops index for prefix LIKEs.
+        # Longer slugs such as "basement" are told apart by the other filters.
+        return Q(**{f"{field}__startswith": base})
+    # Slugs only use [-_0-9a-z], so under a binary collation ["base", "base.")
+    # holds exactly "base" and "base-..." and the unique index answers it with
+    # a range scan, where SQLite's case-insensitive LIKE scans the table
+    return Q(**{f"{field}__gte": base, f"{field}__lt": f"{base}."})
+
+
+def _suffixed(base: str, suffix: int) -> str:
+    return base if suffix == 0 else f"{base}-{suffix}"
+
+
+def unique_slug(
+    queryset: QuerySet[Any], base: str, field: str = "slug",
+) -> str:
+    """
+    Returns ``base`` or ``base-<n>`` with ``n`` one above the highest suffix
+    in use, found with a single aggregate query however many exist.
+    """
+    stats = queryset.filter(_family_filter(queryset, field, base)).aggregate(
+        base_taken=Count("pk", filter=Q(**{field: base})),
+        max_suffix=Max(
+            Cast(Substr(field, len(base) + 2), BigIntegerField()),
+            filter=Q(**{f"{field}__regex": rf"^{re.escape(base)}-[0-9]+$"}),
+        ),
+    )
+    if not stats["base_taken"] and stats["max_suffix"] is None:
+        return base
+    return _suffixed(base, (stats["max_suffix"] or 0) + 1)
+
+
+class SlugAllocator:
+    """
+    Hands out unique slugs for many rows at once, e.g. for bulk imports.
+
+    Existing slugs are loaded once per batch of new bases and suffixes are
+    then counted in memory, so thousands of titles cost a handful of queries.
+    """
+
+    def __init__(
+        self,
+        queryset: QuerySet[Any],
+        field: str = "slug",
+        max_length: int = 50,
+        batch_size: int = 200,
+    ) -> None:
+        self.queryset = queryset
+        self.field = field
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self._next_suffix: dict[str, int] = {}
+        self._taken: set[str] = set()
+
+    def allocate(self, texts: Iterable[str]) -> list[str]:
+        bases = [slug_base(text, self.max_length) for text in texts]
+        self._load(
+            base for base in dict.fromkeys(bases) if base not in self._next_suffix
+        )
+        slugs = []
+        for base in bases:
+            suffix = self._next_suffix[base]
+            # "recipe-1" may already be handed out as the base of "Recipe 1"
+            while (slug := _suffixed(base, suffix)) in self._taken:
+                suffix += 1
+            self._next_suffix[base] = suffix + 1
+            self._taken.add(slug)
+            slugs.append(slug)
+        return slugs
+
+    def keep_or_allocate(self, slugs: Iterable[str], texts: Iterable[str]) -> list[str]:
+        """
+        Keeps each of ``slugs`` that is a slug as ``slug_base`` would make
+        one and still free, e.g. on a re-import, and allocates the others
+        from the matching text like ``allocate``.
+        """
+        pairs = list(zip(slugs, texts, strict=True))
+        candidates = {
+            slug for slug, _ in pairs
+            if slug and slug == slugify(slug) and len(slug) <= self.max_length
+        }
+        self._load_exact(candidates - self._taken)
+        kept: list[str | None] = []
+        pending = []
+        for slug, text in pairs:
+            if slug in candidates and slug not in self._taken:
+                self._taken.add(slug)
+                self._reserve(slug)
+                kept.append(slug)
+            else:
+                kept.append(None)
+                pending.append(slug or text)
+        allocated = iter(self.allocate(pending))
+        return [slug or next(allocated) for slug in kept]
+
+    def _load_exact(self, slugs: Iterable[str]) -> None:
+        pending = list(slugs)
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            taken = self.queryset.filter(
+                **{f"{self.field}__in": chunk},
+            ).values_list(self.field, flat=True)
+            self._taken.update(taken)
+
+    def _load(self, bases: Iterable[str]) -> None:
+        pending = list(bases)
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            condition = Q()
+            for base in chunk:
+                condition |= _family_filter(self.queryset, self.field, base)
+            taken = self.queryset.filter(condition).values_list(self.field, flat=True)
+            for base in chunk:
+                self._next_suffix[base] = 0
+            for slug in taken:
+                self._taken.add(slug)
+                self._reserve(slug)
+
+    def _reserve(self, slug: str) -> None:
+        base, _, suffix = slug.rpartition("-")
+        if suffix.isdigit() and base in self._next_suffix:
+            self._next_suffix[base] = max(self._next_suffix[base], int(suffix) + 1)
+        if slug in self._next_suffix:
+            self._next_suffix[slug] = max(self._next_suffix[slug], 1)
@@ -0,0 +1,298 @@
+"""
+The production static pipeline: bundling, hashing, precompression and an
+in-process server for the result.
+
+``collectstatic`` with ``CompressedManifestStaticFilesStorage`` first builds
+the ``STATIC_BUNDLES``, each a minified concatenation of collected files,
+then hashes every file name for far-future caching, then writes a ``.gz``
+(and ``.br`` when the ``brotli`` package is installed) next to every text
+file that compresses. ``StaticFilesMiddleware`` serves ``STATIC_ROOT`` with
+those variants picked by ``Accept-Encoding``, for deployments without a web
+server or CDN in front of the app.
+"""
+import gzip
+import mimetypes
+import posixpath
+import re
+from collections.abc import Callable, Iterator
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Final
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage,
+    staticfiles_storage,
+)
+from django.core.exceptions import MiddlewareNotUsed, SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage
+from django.http import FileResponse, HttpRequest
+from django.http.response import HttpResponseBase
+from django.templatetags.static import static
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+COMPRESSIBLE_SUFFIXES: Final[tuple[str, ...]] = (
+    ".css", ".js", ".mjs", ".map", ".json", ".svg", ".txt", ".xml", ".html",
+    ".ttf", ".eot", ".otf", ".ico",
+)
+# Content-Encoding and file suffix, in order of preference
+ENCODINGS: Final[tuple[tuple[str, str], ...]] = (("br", ".br"), ("gzip", ".gz"))
+IMMUTABLE_CACHE_CONTROL: Final[str] = "public, max-age=31536000, immutable"
+# Unhashed names can change content under the same URL
+UNHASHED_CACHE_CONTROL: Final[str] = "public, max-age=60"
+
+_CSS_TOKENS: Final[re.Pattern[str]] = re.compile(
+    r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')"""  # strings, kept as they are
+    r"|(/\*!.*?\*/)"  # license comments, kept
+    r"|/\*.*?\*/"  # other comments, dropped
+    r"|\s*([{};,>])\s*"  # no space is needed around these
+    r"|\s+",
+    re.DOTALL,
+)
+CSS_URL: Final[re.Pattern[str]] = re.compile(
+    r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""",
+)
+
+
+def minify_css(css: str) -> str:
+    """
+    >>> minify_css('a > b,  i { color: red ; /* x */ }\\n p { content: "a  b" }')
+    'a>b,i{color: red;}p{content: "a  b"}'
+    """
+    def replace(match: re.Match[str]) -> str:
+        if match[1] or match[2]:
+            return match[1] or match[2]
+        if match[3]:
+            return match[3]
+        return " " if match[0].isspace() else ""
+
+    return _CSS_TOKENS.sub(replace, css).strip()
+
+
+def minify_js(js: str) -> str:
+    """
+    Drops indentation, blank lines and whole line comments, nothing that
+    needs a parser. Template literals keep their whitespace, a file with one
+    is left as it is.
+
+    >>> minify_js("function f() {\\n  // note\\n\\n  return 1;\\n}\\n")
+    'function f() {\\nreturn 1;\\n}'
+    """
+    if "`" in js:
+        return js
+    lines = (line.strip() for line in js.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def rebase_css_urls(css: str, source: str, target: str) -> str:
+    """
+    Rewrites the relative ``url()``s of the stylesheet ``source`` for it to
+    be served as ``target``.
+
+    >>> rebase_css_urls("src: url('../webfonts/a.woff2')", "vendor/fa/css/a.css",
+    ...                 "global/css/site.css")
+    "src: url('../../vendor/fa/webfonts/a.woff2')"
+    """
+    def replace(match: re.Match[str]) -> str:
+        quote, url = match[1], match[2].strip()
+        if url.startswith(("/", "#", "data:")) or urlsplit(url).scheme:
+            return match[0]
+        path = posixpath.normpath(posixpath.join(posixpath.dirname(source), url))
+        rebased = posixpath.relpath(path, posixpath.dirname(target) or ".")
+        return f"url({quote}{rebased}{quote})"
+
+    return CSS_URL.sub(replace, css)
+
+
+def build_bundle(name: str, sources: list[str], read: Callable[[str], str]) -> str:
+    """The minified concatenation of ``sources``, as read by ``read``."""
+    if name.endswith(".css"):
+        return minify_css("\n".join(
+            rebase_css_urls(read(source), source, name) for source in sources
+        ))
+    # A file without a trailing semicolon can't run into the next one
+    return minify_js(";\n".join(read(source) for source in sources))
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(
+        self, paths: dict[str, tuple[Storage, str]], dry_run: bool = False,  # noqa: FBT001, FBT002
+        **options: Any,  # noqa: ANN401
+    ) -> Iterator[tuple[str, str, bool] | tuple[str, None, RuntimeError]]:
+        if dry_run:
+            return
+        try:
+            self.build_bundles(paths)
+        except KeyError as exc:
+            name = exc.args[0]
+            msg = f"The bundled file {name!r} wasn't collected."
+            yield name, None, RuntimeError(msg)
+            return
+        names: set[str] = set()
+        for result in super().post_process(paths, **options):
+            yield result
+            name, hashed_name, processed = result
+            if isinstance(processed, Exception):
+                return
+            names.update(filter(None, (name, hashed_name)))
+        for name in sorted(names):
+            self.compress(name)
+
+    def build_bundles(self, paths: dict[str, tuple[Storage, str]]) -> None:
+        def read(name: str) -> str:
+            storage, path = paths[name]
+            with storage.open(path) as file:
+                return file.read().decode()
+
+        for name, sources in settings.STATIC_BUNDLES.items():
+            self.replace(name, build_bundle(name, sources, read).encode())
+            # Hashed, and its urls rewritten, with the collected files
+            paths[name] = (self, name)
+
+    def compress(self, name: str) -> None:
+        if not name.endswith(COMPRESSIBLE_SUFFIXES):
+            return
+        with self.open(name) as file:
+            content = file.read()
+        variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants[".br"] = brotli.compress(content)
+        for suffix, compressed in variants.items():
+            # Small files can grow, then the original is served
+            if len(compressed) < len(content):
+                self.replace(name + suffix, compressed)
+
+    def replace(self, name: str, content: bytes) -> None:
+        if self.exists(name):
+            self.delete(name)
+        self._save(name, ContentFile(content))
+
+
+def bundle_urls(name: str) -> list[str]:
+    """
+    The URL of the bundle ``name`` when the storage builds it, else those
+    of its sources, as served by ``runserver``.
+    """
+    if isinstance(staticfiles_storage, CompressedManifestStaticFilesStorage):
+        return [static(name)]
+    return [static(source) for source in settings.STATIC_BUNDLES[name]]
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """
+    >>> sorted(accepted_encodings("gzip, deflate, br;q=0"))
+    ['deflate', 'gzip']
+    """
+    encodings = set()
+    for part in header.lower().split(","):
+        encoding, _, params = part.partition(";")
+        quality = params.strip().removeprefix("q=")
+        try:
+            accepted = float(quality) > 0 if quality else True
+        except ValueError:
+            accepted = False
+        if accepted and encoding.strip():
+            encodings.add(encoding.strip())
+    return encodings
+
+
+class StaticFilesMiddleware:
+    """
+    Serves ``STATIC_ROOT`` when ``SERVE_STATIC`` is on, ahead of the session
+    and auth middlewares a static file has no use for.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        if not settings.SERVE_STATIC:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = urlsplit(settings.STATIC_URL).path
+        self.root = Path(settings.STATIC_ROOT)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    @cached_property
+    def hashed_names(self) -> set[str]:
+        return set(getattr(staticfiles_storage, "hashed_files", {}).values())
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.serve(request) or self.get_response(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        return self.serve(request) or await self.get_response(request)
+
+    def serve(self, request: HttpRequest) -> HttpResponseBase | None:
+        if request.method not in ("GET", "HEAD") or not request.path.startswith(
+            self.prefix,
+        ):
+            return None
+        name = request.path.removeprefix(self.prefix)
+        try:
+            path = Path(safe_join(self.root, name))
+        except SuspiciousFileOperation:
+            return None
+        if not name or not path.is_file():
+            return None
+        stat = path.stat()
+        encoding, variant = self.choose_variant(request, path)
+        # Each encoding is its own representation and needs its own validator
+        suffix = f"-{encoding}" if encoding else ""
+        etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}{suffix}"'
+        cache_control = (
+            IMMUTABLE_CACHE_CONTROL if name in self.hashed_names
+            else UNHASHED_CACHE_CONTROL
+        )
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=int(stat.st_mtime),
+        )
+        response: HttpResponseBase
+        if not_modified is None:
+            response = self.file_response(path, variant, encoding)
+            response["Last-Modified"] = http_date(stat.st_mtime)
+        else:
+            response = not_modified
+        response["ETag"] = etag
+        response["Cache-Control"] = cache_control
+        if name.endswith(COMPRESSIBLE_SUFFIXES):
+            patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+
+    def choose_variant(
+        self, request: HttpRequest, path: Path,
+    ) -> tuple[str | None, Path]:
+        """The precompressed variant of ``path`` the client accepts, if any."""
+        accepted = accepted_encodings(request.headers.get("accept-encoding", ""))
+        for encoding, suffix in ENCODINGS:
+            variant = path.with_name(path.name + suffix)
+            if encoding in accepted and variant.is_file():
+                return encoding, variant
+        return None, path
+
+    def file_response(
+        self, path: Path, variant: Path, encoding: str | None,
+    ) -> FileResponse:
+        content_type, _ = mimetypes.guess_type(path.name)
+        response = FileResponse(
+            variant.open("rb"),
+            content_type=content_type or "application/octet-stream",
+        )
+        # FileResponse names the file it read, which may be the variant
+        del response["Content-Disposition"]
+        if encoding:
+            response["Content-Encoding"] = encoding
+        return response
@@ -0,0 +1,94 @@
+"""
+Compiles the project's templates ahead of the first request.
+
+With the cached loader every process parses a template the first time it is
+rendered. ``warm_templates`` loads them all up front, at worker boot (see
+``core.wsgi``) or from ``manage.py warm_templates`` to fail a deploy early
+on a template that doesn't compile.
+
+``InstrumentedDjangoTemplates`` is the Django backend with its renders timed
+for ``utils.instrumentation``.
+"""
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.http import HttpRequest
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates, Template
+from django.template.loaders.base import Loader
+from django.utils.safestring import SafeString
+
+from utils.instrumentation import timed_render
+
+TEMPLATE_SUFFIXES = (".html", ".txt", ".xml")
+
+
+@dataclass
+class WarmReport:
+    compiled: list[str] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def _loaders(loaders: list[Loader]) -> Iterator[Loader]:
+    for loader in loaders:
+        # The cached loader wraps the ones that know the directories
+        yield loader
+        yield from _loaders(getattr(loader, "loaders", []))
+
+
+def project_template_names(
+    backend: DjangoTemplates, root: Path | None = None,
+) -> list[str]:
+    """
+    Names of the templates found under ``root``, the project directory by
+    default, so Django's own admin templates are left to load on demand.
+    """
+    root = Path(root or settings.BASE_DIR).resolve()
+    names: set[str] = set()
+    for loader in _loaders(backend.engine.template_loaders):
+        if not hasattr(loader, "get_dirs"):
+            continue
+        for directory in map(Path, loader.get_dirs()):
+            directory = directory.resolve()
+            if not directory.is_dir() or not directory.is_relative_to(root):
+                continue
+            names.update(
+                path.relative_to(directory).as_posix()
+                for path in directory.rglob("*")
+                if path.suffix in TEMPLATE_SUFFIXES
+            )
+    return sorted(names)
+
+
+def warm_templates(root: Path | None = None) -> WarmReport:
+    report = WarmReport()
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        for name in project_template_names(backend, root):
+            try:
+                backend.get_template(name)
+            except TemplateSyntaxError as error:
+                report.errors[name] = str(error)
+            else:
+                report.compiled.append(name)
+    return report
+
+
+class TimedTemplate(Template):
+    def render(
+        self, context: dict[str, Any] | None = None, request: HttpRequest | None = None,
+    ) -> SafeString:
+        with timed_render():
+            return super().render(context, request)
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    def from_string(self, template_code: str) -> TimedTemplate:
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name: str) -> TimedTemplate:
+        return TimedTemplate(super().get_template(template_name).template, self)
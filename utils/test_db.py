@@ -0,0 +1,63 @@
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from recipes.models import Recipe
+from utils.db import (
+    PrimaryReplicaRouter,
+    configure_connection,
+    read_from_replicas,
+    routing,
+)
+
+
+class ConfigureConnectionTest(TestCase):
+    def pragma(self, name: str) -> int | str:
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_new_connections_get_the_pragmas(self) -> None:
+        self.assertEqual(self.pragma("busy_timeout"), 5000)
+        self.assertEqual(self.pragma("synchronous"), 1)  # NORMAL
+
+    @override_settings(SQLITE_PRAGMAS={"busy_timeout": 1234})
+    def test_applies_the_configured_pragmas(self) -> None:
+        original = self.pragma("busy_timeout")
+        self.addCleanup(self.pragma, f"busy_timeout = {original}")
+        configure_connection(type(connection), connection)
+        self.assertEqual(self.pragma("busy_timeout"), 1234)
+
+
+class ConfigureConnectionValidationTest(SimpleTestCase):
+    @override_settings(SQLITE_PRAGMAS={"user_version": 1})
+    def test_rejects_unknown_pragmas(self) -> None:
+        with self.assertRaisesMessage(ValueError, "Unsupported PRAGMA"):
+            configure_connection(type(connection), connection)
+
+
+class PrimaryReplicaRouterTest(SimpleTestCase):
+    router = PrimaryReplicaRouter()
+
+    @override_settings(DATABASE_REPLICAS=["replica_1"])
+    def test_reads_go_to_the_primary_unless_the_request_opts_in(self) -> None:
+        self.assertEqual(self.router.db_for_read(Recipe), "default")
+        with routing():
+            self.assertEqual(self.router.db_for_read(Recipe), "default")
+            read_from_replicas()
+            self.assertEqual(self.router.db_for_read(Recipe), "replica_1")
+
+    @override_settings(DATABASE_REPLICAS=["replica_1"])
+    def test_pinned_requests_read_from_the_primary(self) -> None:
+        with routing(pinned=True):
+            read_from_replicas()
+            self.assertEqual(self.router.db_for_read(Recipe), "default")
+
+    def test_without_replicas_everything_reads_from_the_primary(self) -> None:
+        with routing():
+            read_from_replicas()
+            self.assertEqual(self.router.db_for_read(Recipe), "default")
+
+    def test_writes_go_to_the_primary_and_mark_the_request(self) -> None:
+        with routing() as state:
+            self.assertEqual(self.router.db_for_write(Recipe), "default")
+            self.assertTrue(state.wrote)
@@ -0,0 +1,95 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from recipes.tests.test_recipe_base import RecipeTestBase
+from utils.instrumentation import (
+    budget_exceeded,
+    clear_recent_requests,
+    recent_requests,
+)
+
+
+class InstrumentationMiddlewareTest(RecipeTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        cache.clear()
+        clear_recent_requests()
+
+    def test_records_what_a_request_costs(self) -> None:
+        self.make_recipe()
+        self.client.get(reverse("recipes:home"))
+
+        [metrics] = recent_requests()
+        self.assertEqual(metrics.view, "recipes:home")
+        self.assertEqual(metrics.status, 200)
+        self.assertEqual(metrics.queries, 2)  # The page and its count
+        self.assertGreater(metrics.db_ms, 0)
+        self.assertGreater(metrics.template_ms, 0)
+        self.assertGreaterEqual(metrics.total_ms, metrics.template_ms)
+        # The page, the count and the one card
+        self.assertEqual(metrics.cache_hits, 0)
+        self.assertEqual(metrics.cache_misses, 3)
+
+    def test_counts_page_cache_hits(self) -> None:
+        self.make_recipe()
+        self.client.get(reverse("recipes:home"))
+        self.client.get(reverse("recipes:home"))
+
+        metrics = recent_requests()[-1]
+        self.assertEqual((metrics.queries, metrics.cache_hits), (0, 1))
+
+    @override_settings(SERVER_TIMING_HEADER=True)
+    def test_adds_server_timing(self) -> None:
+        response = self.client.get(reverse("recipes:home"))
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^total;dur=[\d.]+, db;dur=[\d.]+;desc="1 queries", tpl;dur=[\d.]+',
+        )
+
+    @override_settings(SERVER_TIMING_HEADER=False)
+    def test_server_timing_can_be_turned_off(self) -> None:
+        response = self.client.get(reverse("recipes:home"))
+        self.assertNotIn("Server-Timing", response)
+
+    @pytest.mark.no_budgets
+    @override_settings(PERFORMANCE_BUDGETS={"recipes:home": {"queries": 0}})
+    def test_requests_over_budget_are_logged_and_signalled(self) -> None:
+        received = []
+        budget_exceeded.connect(
+            lambda violations, **kwargs: received.extend(violations), weak=False,
+            dispatch_uid="test_over_budget",
+        )
+        self.addCleanup(budget_exceeded.disconnect, dispatch_uid="test_over_budget")
+
+        with self.assertLogs("utils.instrumentation", "WARNING") as logs:
+            self.client.get(reverse("recipes:home"))
+
+        self.assertEqual([str(violation) for violation in received], ["queries 1 > 0"])
+        self.assertIn("over budget: queries 1 > 0", logs.output[0])
+
+
+class MetricsViewTest(RecipeTestBase):
+    url = reverse("metrics")
+
+    def test_is_for_staff_only(self) -> None:
+        self.client.force_login(self.make_author(username="chef"))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_summarizes_the_recent_requests(self) -> None:
+        clear_recent_requests()
+        self.client.get(reverse("recipes:home"))
+        self.client.get(reverse("recipes:home"))
+        author = self.make_author(username="staff")
+        author.is_staff = True
+        author.save()
+        self.client.force_login(author)
+
+        data = self.client.get(self.url, {"limit": 1}).json()
+
+        self.assertEqual(data["summary"]["recipes:home"]["requests"], 2)
+        self.assertEqual(len(data["recent"]), 1)
+        self.assertEqual(data["recent"][0]["view"], "recipes:home")
+        self.assertIn("recipes:home", data["budgets"])
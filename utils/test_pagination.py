@@ -1,6 +1,14 @@
+from datetime import UTC, datetime
 from unittest import TestCase
 
-from utils.pagination import make_pagination_range
+from utils.pagination import (
+    CURSOR_NEXT,
+    CURSOR_PREVIOUS,
+    CachedCountPaginator,
+    decode_cursor,
+    encode_cursor,
+    make_pagination_range,
+)
 
 
 class PaginationLogicTest(TestCase):
@@ -85,3 +93,37 @@ class PaginationLogicTest(TestCase):
         with self.assertRaises(ValueError) as context:
             make_pagination_range([1, 2, 3], range_size, 1)
         self.assertEqual(str(context.exception), "range_size must be greater than 0")
+
+    def test_make_pagination_range_accepts_a_lazy_range(self) -> None:
+        page_range = range(1, 100_001)
+        result = make_pagination_range(page_range, range_size=4, current_page=50_000)
+        self.assertEqual(result["pagination"], [49_999, 50_000, 50_001, 50_002])
+        self.assertEqual(result["total_pages"], 100_000)
+        self.assertIs(result["page_range"], page_range)
+
+    def test_known_count_replaces_counting_the_object_list(self) -> None:
+        paginator = CachedCountPaginator(list(range(10)), 3, known_count=20)
+        self.assertEqual((paginator.count, paginator.num_pages), (20, 7))
+
+
+class CursorTokenTest(TestCase):
+    def test_cursor_round_trips_values_and_direction(self) -> None:
+        token = encode_cursor(["2025-01-01T10:00:00Z", 42], CURSOR_PREVIOUS)
+        self.assertEqual(
+            decode_cursor(token), (["2025-01-01T10:00:00Z", 42], CURSOR_PREVIOUS),
+        )
+
+    def test_cursor_keeps_datetimes_to_the_microsecond(self) -> None:
+        created_at = datetime(2025, 1, 1, 10, 0, 0, 123456, tzinfo=UTC)
+        values, _ = decode_cursor(encode_cursor([created_at]))
+        [value] = values or []
+        self.assertEqual(datetime.fromisoformat(value), created_at)
+
+    def test_cursor_is_url_safe_without_padding(self) -> None:
+        token = encode_cursor([1])
+        self.assertRegex(token, r"^[A-Za-z0-9_-]+$")
+
+    def test_invalid_cursor_falls_back_to_first_page(self) -> None:
+        for token in [None, "", "%%%", encode_cursor([1], "x"), "eyJ2IjogMX0"]:
+            with self.subTest(token=token):
+                self.assertEqual(decode_cursor(token), (None, CURSOR_NEXT))
@@ -0,0 +1,69 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from recipes.models import Recipe
+from utils.slugs import SlugAllocator, unique_slug
+
+
+def make_recipe(slug: str) -> Recipe:
+    return Recipe.objects.create(
+        title=slug, slug=slug, description="d", preparation_time=1,
+        preparation_time_unit="Minutos", servings=1, servings_unit="Porções",
+        preparation_steps="s",
+    )
+
+
+class SlugAllocatorTest(TestCase):
+    def test_allocate_continues_after_existing_suffixes(self) -> None:
+        make_recipe("bolo")
+        make_recipe("bolo-4")
+        make_recipe("bolo-de-milho")
+        allocator = SlugAllocator(Recipe.objects.all())
+        slugs = allocator.allocate(["Bolo", "Bolo", "Bolo de milho", "Pudim"])
+        self.assertEqual(slugs, ["bolo-5", "bolo-6", "bolo-de-milho-1", "pudim"])
+
+    def test_allocate_queries_once_per_batch_of_new_titles(self) -> None:
+        allocator = SlugAllocator(Recipe.objects.all(), batch_size=200)
+        titles = [f"Recipe {i % 700}" for i in range(2_000)]
+        with self.assertNumQueries(4):
+            slugs = allocator.allocate(titles)
+        self.assertEqual(len(set(slugs)), len(titles))
+        # Bases seen before are served from memory
+        with self.assertNumQueries(0):
+            self.assertEqual(allocator.allocate(["Recipe 1"]), ["recipe-1-3"])
+
+    def test_keep_or_allocate_keeps_free_slugs(self) -> None:
+        make_recipe("bolo")
+        allocator = SlugAllocator(Recipe.objects.all())
+        slugs = allocator.keep_or_allocate(
+            ["bolo-3", "bolo", "", "bolo-3", "Pudim!"],
+            ["Bolo", "Bolo", "Bolo", "Bolo", "Pudim"],
+        )
+        self.assertEqual(slugs, ["bolo-3", "bolo-1", "bolo-2", "bolo-3-1", "pudim"])
+
+    def test_allocate_never_repeats_a_slug_across_title_families(self) -> None:
+        allocator = SlugAllocator(Recipe.objects.all())
+        slugs = allocator.allocate(["Recipe 1", "Recipe", "Recipe", "Recipe"])
+        self.assertEqual(slugs, ["recipe-1", "recipe", "recipe-2", "recipe-3"])
+
+
+class UniqueSlugTest(TestCase):
+    def test_suffixes_past_the_highest_in_use(self) -> None:
+        for slug in ("bolo", "bolo-2", "bolo-10", "bolo-de-milho", "bolonhesa"):
+            make_recipe(slug)
+        self.assertEqual(unique_slug(Recipe.objects.all(), "bolo"), "bolo-11")
+        self.assertEqual(unique_slug(Recipe.objects.all(), "pudim"), "pudim")
+
+    @skipUnless(connection.vendor == "sqlite", "Reads SQLite's query plan")
+    def test_family_lookup_uses_the_slug_index(self) -> None:
+        with CaptureQueriesContext(connection) as queries:
+            unique_slug(Recipe.objects.all(), "bolo")
+        [query] = queries.captured_queries
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+            plan = " ".join(str(row[-1]) for row in cursor.fetchall())
+        self.assertRegex(plan, r"SEARCH recipes_recipe USING (COVERING )?INDEX")
+        self.assertNotIn("SCAN recipes_recipe", plan)
@@ -0,0 +1,158 @@
+import gzip
+import json
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import SimpleTestCase, override_settings
+
+from utils.staticfiles import IMMUTABLE_CACHE_CONTROL, UNHASHED_CACHE_CONTROL
+from utils.vendor import FONT_AWESOME_URL, VENDOR_STYLESHEETS
+
+BUNDLES = {
+    "global/css/site.css": ["global/css/style.css", "global/css/global-style.css"],
+    "global/js/site.js": ["global/js/script.js"],
+}
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "utils.staticfiles.CompressedManifestStaticFilesStorage",
+    },
+}
+
+
+def collectstatic() -> None:
+    call_command(
+        "collectstatic", interactive=False, verbosity=0, ignore_patterns=["admin"],
+    )
+
+
+@override_settings(STATIC_BUNDLES=BUNDLES)
+class StaticBundleTagTest(SimpleTestCase):
+    def render(self) -> str:
+        return Template(
+            "{% load static_bundles %}{% static_bundle 'global/css/site.css' %}",
+        ).render(Context())
+
+    def test_links_the_sources_without_the_bundling_storage(self) -> None:
+        self.assertHTMLEqual(
+            self.render(),
+            '<link rel="stylesheet" href="/static/global/css/style.css">'
+            '<link rel="stylesheet" href="/static/global/css/global-style.css">',
+        )
+
+    def test_links_the_collected_bundle(self) -> None:
+        with (
+            TemporaryDirectory() as root,
+            override_settings(STATIC_ROOT=root, STORAGES=STORAGES),
+        ):
+            collectstatic()
+            html = self.render()
+        self.assertRegex(
+            html,
+            r'^<link rel="stylesheet" href="/static/global/css/site\.\w{12}\.css">$',
+        )
+
+    def test_collectstatic_fails_on_a_missing_bundled_file(self) -> None:
+        bundles = {"global/css/site.css": ["global/css/missing.css"]}
+        with (
+            TemporaryDirectory() as root,
+            override_settings(
+                STATIC_ROOT=root, STORAGES=STORAGES, STATIC_BUNDLES=bundles,
+            ),
+            self.assertRaisesMessage(RuntimeError, "global/css/missing.css"),
+        ):
+            collectstatic()
+
+
+class VendorStylesheetsTagTest(SimpleTestCase):
+    def render(self) -> str:
+        return Template("{% load static_bundles %}{% vendor_stylesheets %}").render(
+            Context(),
+        )
+
+    @override_settings(VENDOR_ASSETS=False)
+    def test_links_the_cdns_until_vendored(self) -> None:
+        html = self.render()
+        self.assertInHTML(
+            f'<link rel="stylesheet" href="{FONT_AWESOME_URL}solid.min.css"'
+            f' integrity="{VENDOR_STYLESHEETS[2].integrity}"'
+            ' crossorigin="anonymous" referrerpolicy="no-referrer">',
+            html,
+        )
+        self.assertEqual(html.count("<link"), len(VENDOR_STYLESHEETS))
+
+    @override_settings(VENDOR_ASSETS=True)
+    def test_links_nothing_once_vendored(self) -> None:
+        self.assertEqual(self.render(), "")
+
+
+@override_settings(STATIC_BUNDLES=BUNDLES, STORAGES=STORAGES, SERVE_STATIC=True)
+class CollectedStaticFilesTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.root = Path(cls.enterClassContext(TemporaryDirectory()))
+        cls.enterClassContext(override_settings(STATIC_ROOT=cls.root))
+        collectstatic()
+        manifest = json.loads((cls.root / "staticfiles.json").read_text())
+        cls.bundle = manifest["paths"]["global/css/site.css"]
+
+    def test_bundle_is_minified_with_its_sources_in_order(self) -> None:
+        css = (self.root / self.bundle).read_text()
+        self.assertNotIn("\n", css)
+        self.assertLess(css.index("--color-primary:"), css.index(".page-wrapper{"))
+
+    def test_text_files_are_precompressed(self) -> None:
+        content = (self.root / self.bundle).read_bytes()
+        compressed = (self.root / f"{self.bundle}.gz").read_bytes()
+        self.assertEqual(gzip.decompress(compressed), content)
+        self.assertTrue((self.root / "global/css/style.css.gz").exists())
+
+    def test_serves_the_variant_the_client_accepts(self) -> None:
+        url = f"/static/{self.bundle}"
+        response = self.client.get(url, headers={"accept-encoding": "gzip, br;q=0"})
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/css")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["Cache-Control"], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)),
+            (self.root / self.bundle).read_bytes(),
+        )
+        plain = self.client.get(url)
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertEqual(
+            b"".join(plain.streaming_content), (self.root / self.bundle).read_bytes(),
+        )
+
+    def test_unhashed_names_are_cached_briefly(self) -> None:
+        response = self.client.get("/static/global/css/style.css")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], UNHASHED_CACHE_CONTROL)
+
+    def test_revalidation_is_a_304(self) -> None:
+        url = f"/static/{self.bundle}"
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_each_encoding_has_its_own_etag(self) -> None:
+        url = f"/static/{self.bundle}"
+        gzip_etag = self.client.get(url, headers={"accept-encoding": "gzip"})["ETag"]
+        identity_etag = self.client.get(url)["ETag"]
+        self.assertEqual(gzip_etag, identity_etag[:-1] + '-gzip"')
+        # A stored gzip response doesn't revalidate an identity request
+        response = self.client.get(url, headers={"if-none-match": gzip_etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Content-Encoding"))
+        response = self.client.get(
+            url, headers={"if-none-match": gzip_etag, "accept-encoding": "gzip"},
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_and_outside_files_fall_through_to_a_404(self) -> None:
+        for url in ("/static/global/css/missing.css", "/static/../manage.py"):
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, 404)
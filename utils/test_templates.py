@@ -0,0 +1,37 @@
+from io import StringIO
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+from utils.templates import warm_templates
+
+
+class WarmTemplatesTest(SimpleTestCase):
+    def test_compiles_the_project_templates(self) -> None:
+        report = warm_templates()
+        self.assertEqual(report.errors, {})
+        self.assertIn("global/base.html", report.compiled)
+        self.assertIn("recipes/pages/home.html", report.compiled)
+
+    def test_leaves_templates_outside_the_project_alone(self) -> None:
+        self.assertNotIn("admin/base.html", warm_templates().compiled)
+
+    def test_command_reports_the_compiled_templates(self) -> None:
+        out = StringIO()
+        call_command("warm_templates", stdout=out)
+        self.assertIn("Compiled", out.getvalue())
+
+    def test_command_fails_on_a_broken_template(self) -> None:
+        with TemporaryDirectory() as directory:
+            Path(directory, "broken.html").write_text("{% if %}")
+            templates = [{
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "DIRS": [directory],
+            }]
+            with override_settings(TEMPLATES=templates, BASE_DIR=directory):
+                report = warm_templates()
+                self.assertIn("broken.html", report.errors)
+                with self.assertRaises(CommandError):
+                    call_command("warm_templates", stdout=StringIO(), stderr=StringIO())
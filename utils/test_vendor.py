@@ -0,0 +1,66 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from django.test import SimpleTestCase
+
+from utils.vendor import IntegrityMismatchError, VendorStylesheet, vendor_stylesheet
+
+FILES = {
+    "https://cdn.test/fa/css/solid.css": (
+        b'@font-face{src:url("../webfonts/solid.woff2") format("woff2"),'
+        b"url(../webfonts/solid.ttf?v=1)}"
+    ),
+    "https://cdn.test/fa/webfonts/solid.woff2": b"woff2",
+    "https://cdn.test/fa/webfonts/solid.ttf?v=1": b"ttf",
+    "https://fonts.test/css": b"@font-face{src:url(https://static.test/s/slab.woff2)}",
+    "https://static.test/s/slab.woff2": b"slab",
+}
+
+
+class VendorStylesheetTest(SimpleTestCase):
+    def vendor(self, stylesheet: VendorStylesheet, root: Path) -> list[str]:
+        return vendor_stylesheet(stylesheet, root, fetch=FILES.__getitem__)
+
+    def test_relative_urls_keep_their_layout(self) -> None:
+        with TemporaryDirectory() as directory:
+            root = Path(directory)
+            names = self.vendor(
+                VendorStylesheet(
+                    "https://cdn.test/fa/css/solid.css", "vendor/fa/css/solid.css",
+                ),
+                root,
+            )
+            self.assertEqual(names, [
+                "vendor/fa/css/solid.css",
+                "vendor/fa/webfonts/solid.woff2",
+                "vendor/fa/webfonts/solid.ttf",
+            ])
+            self.assertEqual(
+                (root / "vendor/fa/webfonts/solid.ttf").read_bytes(), b"ttf",
+            )
+            self.assertIn(
+                "url(../webfonts/solid.ttf)",
+                (root / "vendor/fa/css/solid.css").read_text(),
+            )
+
+    def test_absolute_urls_are_stored_next_to_the_stylesheet(self) -> None:
+        with TemporaryDirectory() as directory:
+            root = Path(directory)
+            self.vendor(
+                VendorStylesheet("https://fonts.test/css", "vendor/fonts/slab.css"),
+                root,
+            )
+            self.assertEqual(
+                (root / "vendor/fonts/slab.css").read_text(),
+                "@font-face{src:url(slab.woff2)}",
+            )
+            self.assertEqual((root / "vendor/fonts/slab.woff2").read_bytes(), b"slab")
+
+    def test_a_changed_stylesheet_is_refused(self) -> None:
+        stylesheet = VendorStylesheet(
+            "https://fonts.test/css", "vendor/fonts/slab.css", "sha256-AAAA",
+        )
+        with TemporaryDirectory() as directory:
+            with self.assertRaises(IntegrityMismatchError):
+                self.vendor(stylesheet, Path(directory))
+            self.assertFalse(Path(directory, "vendor").exists())
@@ -0,0 +1,127 @@
+"""
+Copies the third party stylesheets the pages use, and the fonts they load,
+into ``base_static/vendor`` so they are served, hashed and bundled with the
+project's own files instead of from a CDN on every page.
+
+``manage.py vendor_assets`` downloads ``VENDOR_STYLESHEETS`` and the files
+their ``url()``s point to, checking the subresource integrity where it is
+pinned. Rerun it after changing a pinned version and commit the result.
+"""
+import base64
+import hashlib
+import posixpath
+import re
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Final
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, urlopen
+
+from utils.staticfiles import CSS_URL
+
+FONT_AWESOME_URL: Final[str] = (
+    "https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.7.2/css/"
+)
+# Google Fonts only serves woff2 to browsers it knows support it
+USER_AGENT: Final[str] = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/126.0 Safari/537.36"
+)
+FETCH_TIMEOUT: Final[int] = 30
+
+
+class IntegrityMismatchError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class VendorStylesheet:
+    url: str
+    # Static file name, its fonts are stored relative to it
+    name: str
+    integrity: str | None = None
+
+
+VENDOR_STYLESHEETS: Final[tuple[VendorStylesheet, ...]] = (
+    VendorStylesheet(
+        FONT_AWESOME_URL + "fontawesome.min.css",
+        "vendor/fontawesome/css/fontawesome.min.css",
+        "sha512-v8QQ0YQ3H4K6Ic3PJkym91KoeNT5S3PnDKvqnwqFD1oiqIl653crGZplPdU5KKtHjO0QKcQ2aUlQZYjHczkmGw==",
+    ),
+    VendorStylesheet(
+        FONT_AWESOME_URL + "brands.min.css",
+        "vendor/fontawesome/css/brands.min.css",
+        "sha512-58P9Hy7II0YeXLv+iFiLCv1rtLW47xmiRpC1oFafeKNShp8V5bKV/ciVtYqbk2YfxXQMt58DjNfkXFOn62xE+g==",
+    ),
+    VendorStylesheet(
+        FONT_AWESOME_URL + "solid.min.css",
+        "vendor/fontawesome/css/solid.min.css",
+        "sha512-DzC7h7+bDlpXPDQsX/0fShhf1dLxXlHuhPBkBo/5wJWRoTU6YL7moeiNoej6q3wh5ti78C57Tu1JwTNlcgHSjg==",
+    ),
+    VendorStylesheet(
+        "https://fonts.googleapis.com/css2?family=Roboto+Slab:wght@900&display=swap",
+        "vendor/fonts/roboto-slab.css",
+    ),
+)
+
+
+def fetch(url: str) -> bytes:
+    request = Request(url, headers={"User-Agent": USER_AGENT})  # noqa: S310
+    with urlopen(request, timeout=FETCH_TIMEOUT) as response:  # noqa: S310
+        return response.read()
+
+
+def check_integrity(content: bytes, integrity: str) -> None:
+    """
+    >>> check_integrity(b"", "sha256-47DEQpj8HBSa+/TImW+5JCeuQeRkm5NMpJWZG3hSuFU=")
+    """
+    algorithm, _, expected = integrity.partition("-")
+    digest = base64.b64encode(hashlib.new(algorithm, content).digest()).decode()
+    if digest != expected:
+        msg = f"Expected {integrity}, got {algorithm}-{digest}."
+        raise IntegrityMismatchError(msg)
+
+
+def vendor_stylesheet(
+    stylesheet: VendorStylesheet, root: Path,
+    fetch: Callable[[str], bytes] = fetch,
+) -> list[str]:
+    """
+    Stores ``stylesheet`` and what it loads under ``root``, returning the
+    names written. Relative ``url()``s keep their layout, absolute ones are
+    stored next to the stylesheet and pointed to there.
+    """
+    content = fetch(stylesheet.url)
+    if stylesheet.integrity:
+        check_integrity(content, stylesheet.integrity)
+    directory = posixpath.dirname(stylesheet.name)
+    files: dict[str, str] = {}
+
+    def localize(match: re.Match[str]) -> str:
+        quote, url = match[1], match[2].strip()
+        if url.startswith(("data:", "#")):
+            return match[0]
+        absolute = urljoin(stylesheet.url, url)
+        if urlsplit(url).scheme or url.startswith("/"):
+            url = posixpath.basename(urlsplit(absolute).path)
+        else:
+            # Drops the ?v= and #iefix suffixes, the files are ours now
+            url = urlsplit(url).path
+        name = posixpath.normpath(posixpath.join(directory, url))
+        if not name.startswith("vendor/"):
+            msg = f"{stylesheet.url} loads {absolute} from outside vendor/."
+            raise ValueError(msg)
+        files[name] = absolute
+        return f"url({quote}{url}{quote})"
+
+    css = CSS_URL.sub(localize, content.decode())
+    write(root / stylesheet.name, css.encode())
+    for name, url in files.items():
+        write(root / name, fetch(url))
+    return [stylesheet.name, *files]
+
+
+def write(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)